@@ -0,0 +1,124 @@
+"""
+Content-addressed artifact store for job run outputs, HTML and logs
+
+Artifacts are stored on local disk keyed by their sha256 digest and sharded
+into two levels of directories (ab/cd/abcd...). Identical content is stored once.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Store run text outside SQLite (JobRun keeps only the digest)
+ARTIFACT_STORE_ENABLED = os.getenv("ARTIFACT_STORE_ENABLED", "false").lower() == "true"
+ARTIFACT_STORE_DIR = Path(os.getenv(
+    "ARTIFACT_STORE_DIR",
+    str(Path(__file__).parent.parent.absolute() / "data" / "artifacts")
+))
+
+# Artifact kind -> (inline JobRun column, reference JobRun column, media type)
+RUN_ARTIFACT_FIELDS = {
+    "output": ("output_content", "output_ref", "text/markdown; charset=utf-8"),
+    "html": ("html_output_content", "html_output_ref", "text/html; charset=utf-8"),
+    "log": ("log_content", "log_ref", "text/plain; charset=utf-8"),
+    "profile": ("profile_content", "profile_ref", "text/plain; charset=utf-8"),
+}
+
+
+def artifact_path(digest: str) -> Path:
+    """Return the on-disk path of an artifact"""
+    return ARTIFACT_STORE_DIR / digest[:2] / digest[2:4] / digest
+
+
+def put_text(content: str) -> str:
+    """Store text content and return its sha256 digest"""
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = artifact_path(digest)
+    if path.exists():
+        # Refresh mtime so garbage collection doesn't race with the new reference
+        os.utime(path)
+        return digest
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file in the same directory and rename so readers never see partial files
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return digest
+
+
+def read_text(digest: str) -> Optional[str]:
+    """Read an artifact, returning None if it is missing"""
+    try:
+        return artifact_path(digest).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.warning(f"Artifact {digest} not found in store")
+        return None
+
+
+def run_text_values(kind: str, content: Optional[str]) -> dict:
+    """JobRun column values for a text field (an artifact reference when the store is enabled)"""
+    inline_field, ref_field, _ = RUN_ARTIFACT_FIELDS[kind]
+    if ARTIFACT_STORE_ENABLED and content is not None:
+        return {inline_field: None, ref_field: put_text(content)}
+    return {inline_field: content, ref_field: None}
+
+
+def save_run_text(run, kind: str, content: Optional[str]) -> None:
+    """Set a JobRun text field, storing it as an artifact reference when the store is enabled"""
+    for field, value in run_text_values(kind, content).items():
+        setattr(run, field, value)
+
+
+def load_run_text(run, kind: str) -> Optional[str]:
+    """Get a JobRun text field from the row or from the artifact store"""
+    inline_field, ref_field, _ = RUN_ARTIFACT_FIELDS[kind]
+    content = getattr(run, inline_field)
+    if content is not None:
+        return content
+    digest = getattr(run, ref_field)
+    if digest:
+        return read_text(digest)
+    return None
+
+
+def has_run_text(run, kind: str) -> bool:
+    """Check whether a JobRun field has content without reading the artifact"""
+    inline_field, ref_field, _ = RUN_ARTIFACT_FIELDS[kind]
+    return bool(getattr(run, inline_field) or getattr(run, ref_field))
+
+
+def collect_garbage(referenced: set, min_age_seconds: int = 3600) -> int:
+    """
+    Delete artifacts that are no longer referenced by any run.
+    Recent files are kept so content written just before its row is committed isn't lost.
+    Returns the number of artifacts deleted.
+    """
+    if not ARTIFACT_STORE_DIR.exists():
+        return 0
+
+    deleted = 0
+    cutoff = time.time() - min_age_seconds
+    for path in ARTIFACT_STORE_DIR.glob("*/*/*"):
+        if path.name in referenced or path.name.startswith(".tmp-"):
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    return deleted
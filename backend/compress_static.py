@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Pre-compress frontend build assets into .br and .gz siblings.
+Run at image build time so the server never compresses static files per request.
+
+Usage:
+  python compress_static.py [STATIC_DIR]
+"""
+
+import gzip
+import sys
+from pathlib import Path
+import brotli
+
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".json", ".map", ".svg", ".txt", ".ico"}
+MINIMUM_SIZE = 1024
+
+
+def compress_directory(static_dir: Path) -> int:
+    """Write .br and .gz files next to each compressible asset"""
+    count = 0
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        if len(data) < MINIMUM_SIZE:
+            continue
+        # mtime=0 keeps the output reproducible between builds
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+        count += 1
+    return count
+
+
+def main():
+    static_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / "static"
+    count = compress_directory(static_dir)
+    print(f"Pre-compressed {count} file(s) in {static_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Response compression and pre-compressed static file serving
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+import anyio
+import brotli
+from fastapi.staticfiles import StaticFiles
+from starlette.staticfiles import NotModifiedResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Only responses at least this large are compressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# Bodies larger than this are compressed in a worker thread to keep the event loop free
+COMPRESSION_THREAD_MINIMUM_SIZE = 256 * 1024
+
+# Build output with a content hash in the name (e.g. main.c2b6dec0.js) never changes
+HASHED_FILENAME = re.compile(r"\.[0-9a-f]{8,}\.")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# Encodings we can produce, in our order of preference
+ENCODINGS = ("br", "gzip")
+
+
+def _quality(params: list[str]) -> float:
+    """q-value of an Accept-Encoding entry (1 when absent, 0 when malformed)"""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def _accepted_encodings(scope: Scope) -> list[str]:
+    """Encodings we can produce that the client accepts, the client's preferred first, then ours"""
+    accept = Headers(scope=scope).get("accept-encoding", "")
+    qualities = {}
+    for part in accept.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if coding:
+            qualities[coding] = _quality(params)
+    # "*" covers codings not listed; q=0 means not acceptable (RFC 9110)
+    wildcard = qualities.get("*", 0.0)
+    accepted = [(qualities.get(encoding, wildcard), encoding) for encoding in ENCODINGS]
+    return [encoding for quality, encoding in sorted(accepted, key=lambda item: -item[0]) if quality > 0]
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        # Low quality keeps per-request CPU cost close to gzip while still compressing better
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """
+    Compress buffered API responses with brotli or gzip above a size threshold.
+    Streaming and already-encoded responses are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE, path_prefix: str = "/api"):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        encodings = _accepted_encodings(scope)
+        start_message: Message = {}
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                if "content-encoding" in Headers(raw=message["headers"]):
+                    passthrough = True
+                    await send(start_message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming response: send as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            # Uncompressed bodies are a variant too, or a shared cache could serve them a br copy
+            headers.add_vary_header("Accept-Encoding")
+            if encodings and len(body) >= self.minimum_size:
+                encoding = encodings[0]
+                if len(body) >= COMPRESSION_THREAD_MINIMUM_SIZE:
+                    body = await anyio.to_thread.run_sync(_compress, body, encoding)
+                else:
+                    body = _compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves .br/.gz siblings built at image build time when the client accepts them,
+    and marks content-hashed filenames as immutable.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        for encoding in _accepted_encodings(scope):
+            suffix = ".br" if encoding == "br" else ".gz"
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None:
+                continue
+            # Content type comes from the original filename, not the .br/.gz suffix
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+            )
+            if self.is_not_modified(response.headers, Headers(scope=scope)):
+                response = NotModifiedResponse(response.headers)
+            break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+            response.headers.add_vary_header("Accept-Encoding")
+
+        if HASHED_FILENAME.search(os.path.basename(path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
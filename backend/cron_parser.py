@@ -1,215 +1,486 @@
 """
 Cron expression parser with human-readable descriptions
+
+Expressions are tokenized once into a CronExpression (five parsed fields) that is
+shared by validation, descriptions and APScheduler trigger construction.
+Supported: numbers, names (JAN-DEC, SUN-SAT), ranges, lists, steps, ? in the day
+fields, L (last day of month), weekday L and # (e.g. 5L, 1#2) and the @hourly,
+@daily/@midnight, @weekly, @monthly and @yearly/@annually macros.
 """
 
-from croniter import croniter
-from datetime import datetime, timedelta
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.combining import OrTrigger
+from apscheduler.triggers.cron import CronTrigger
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from itertools import islice, takewhile
+from typing import Iterable, Iterator, NamedTuple, Optional
+import heapq
+import os
+from tzlocal import get_localzone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import re
 
+# Number of distinct expression/timezone pairs kept compiled
+CRON_CACHE_SIZE = 256
+
+# Timezone for jobs without their own (IANA name, default: the server's local zone)
+SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE") or None
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: Optional[str] = None):
+    """Resolve a job timezone name, falling back to SCHEDULER_TIMEZONE and then the server zone"""
+    name = name or SCHEDULER_TIMEZONE
+    if not name:
+        return get_localzone()
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def is_repeated_wall_time(moment: datetime) -> bool:
+    """True if moment is the second occurrence of a local time repeated when clocks go back"""
+    wall = moment.replace(tzinfo=None)
+    first = wall.replace(tzinfo=moment.tzinfo, fold=0).utcoffset()
+    second = wall.replace(tzinfo=moment.tzinfo, fold=1).utcoffset()
+    return first > second and moment.utcoffset() == second
+
+
+def resolve_skipped_wall_time(moment: datetime) -> datetime:
+    """Move a local time skipped when clocks go forward to the instant the clocks jump"""
+    tz = moment.tzinfo
+    if moment.astimezone(dt_timezone.utc).astimezone(tz).replace(tzinfo=None) == moment.replace(tzinfo=None):
+        return moment
+    # Zone transitions happen on whole minutes between the two possible readings of the wall time
+    instant = moment.replace(fold=1).astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+    target_offset = moment.replace(fold=1).utcoffset()
+    while instant.astimezone(tz).utcoffset() != target_offset:
+        instant += timedelta(minutes=1)
+    return instant.astimezone(tz)
+
+
+def repeats_every_hour(hour_field: str) -> bool:
+    """Schedules with a wildcard hour run in both copies of a repeated hour, like cron"""
+    return hour_field.startswith("*")
+
+
+class DSTSafeCronTrigger(CronTrigger):
+    """
+    CronTrigger that fires once for each local time across DST transitions.
+    A fixed-hour schedule runs only the first time a repeated hour occurs, and a time
+    skipped by the clocks going forward runs when the clocks jump instead of being lost.
+    """
+    
+    def _apply_jitter(self, fire_time, jitter, now):
+        # Jitter is added in get_next_fire_time once the nominal time is DST-adjusted
+        return fire_time
+    
+    def get_next_fire_time(self, previous_fire_time, now):
+        fire_time = super().get_next_fire_time(previous_fire_time, now)
+        skip_repeats = not repeats_every_hour(str(self.fields[self.FIELD_NAMES.index("hour")]))
+        while fire_time is not None and skip_repeats and is_repeated_wall_time(fire_time):
+            fire_time = super().get_next_fire_time(fire_time, fire_time)
+        if fire_time is None:
+            return None
+        return BaseTrigger._apply_jitter(self, resolve_skipped_wall_time(fire_time), self.jitter, now)
+
+
+MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+WEEKDAY_NAMES = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Field name, lowest value, highest value, names (value = index + lowest)
+FIELD_SPECS = (
+    ("minute", 0, 59, ()),
+    ("hour", 0, 23, ()),
+    ("day", 1, 31, ()),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day_of_week", 0, 7, WEEKDAY_NAMES),  # 0 and 7 are both Sunday
+)
+
+# Words used in descriptions and errors
+WEEKDAY_NAME_LABELS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+FIELD_UNITS = {"minute": "minute", "hour": "hour", "day": "day", "month": "month", "day_of_week": "day of the week"}
+ORDINALS = ("first", "second", "third", "fourth", "fifth")
+# APScheduler's spelling of ORDINALS in day expressions such as "2nd fri"
+APSCHEDULER_ORDINALS = ("1st", "2nd", "3rd", "4th", "5th")
+
+
+class CronTerm(NamedTuple):
+    """One comma-separated item of a cron field"""
+    kind: str  # "any", "range", "last_day", "last_weekday" or "nth_weekday"
+    start: Optional[int] = None
+    end: Optional[int] = None
+    step: int = 1
+    nth: Optional[int] = None  # Occurrence in the month for "nth_weekday"
+
+
+class CronField(NamedTuple):
+    """A parsed cron field"""
+    name: str
+    text: str
+    terms: tuple
+    
+    @property
+    def is_any(self) -> bool:
+        """True if the field matches every value"""
+        return any(term.kind == "any" and term.step == 1 for term in self.terms)
+    
+    @property
+    def restricted(self) -> bool:
+        """Cron ORs the day fields when both are restricted, i.e. don't start with * or ?"""
+        return not self.text.startswith(("*", "?"))
+    
+    def values(self) -> list[int]:
+        """Sorted values matched by the plain (any/range) terms"""
+        _, low, high, _ = _field_spec(self.name)
+        values = set()
+        for term in self.terms:
+            if term.kind == "any":
+                values.update(range(low, high + 1, term.step))
+            elif term.kind == "range":
+                values.update(range(term.start, term.end + 1, term.step))
+        if self.name == "day_of_week":
+            values = {value % 7 for value in values}
+        return sorted(values)
+
+
+class CronExpression(NamedTuple):
+    """A tokenized cron expression"""
+    expression: str
+    macro: Optional[str]
+    minute: CronField
+    hour: CronField
+    day: CronField
+    month: CronField
+    day_of_week: CronField
+
+
+def _field_spec(name: str) -> tuple:
+    return next(spec for spec in FIELD_SPECS if spec[0] == name)
+
+
+def _parse_value(token: str, spec: tuple) -> int:
+    """Parse a number or name within a field's bounds"""
+    name, low, high, names = spec
+    if token.isdigit():
+        value = int(token)
+    elif token in names:
+        value = names.index(token) + low
+    else:
+        raise ValueError(f"Invalid value '{token}' in {FIELD_UNITS[name]} field")
+    if not low <= value <= high:
+        raise ValueError(f"Value {value} out of range {low}-{high} in {FIELD_UNITS[name]} field")
+    return value
+
+
+def _parse_term(token: str, spec: tuple) -> CronTerm:
+    """Parse one list item of a field"""
+    name, low, high, _ = spec
+    if name == "day":
+        if token == "l":
+            return CronTerm("last_day")
+        if "w" in token:
+            raise ValueError("'W' (nearest weekday) is not supported by the scheduler")
+    if name == "day_of_week":
+        match = re.fullmatch(r"(\w+)#(\d)", token)
+        if match:
+            nth = int(match.group(2))
+            if not 1 <= nth <= len(ORDINALS):
+                raise ValueError(f"'#{nth}' in {FIELD_UNITS[name]} field must be between #1 and #{len(ORDINALS)}")
+            return CronTerm("nth_weekday", start=_parse_value(match.group(1), spec) % 7, nth=nth)
+        match = re.fullmatch(r"(\w+)l", token)
+        if match:
+            return CronTerm("last_weekday", start=_parse_value(match.group(1), spec) % 7)
+    
+    base, has_step, step_text = token.partition("/")
+    step = 1
+    if has_step:
+        if not step_text.isdigit() or int(step_text) == 0:
+            raise ValueError(f"Invalid step '{step_text}' in {FIELD_UNITS[name]} field")
+        step = int(step_text)
+    
+    if base == "*" or (base == "?" and name in ("day", "day_of_week")):
+        return CronTerm("any", step=step)
+    start_text, is_range, end_text = base.partition("-")
+    start = _parse_value(start_text, spec)
+    if is_range:
+        end = _parse_value(end_text, spec)
+    else:
+        # "5/15" runs from 5 to the end of the field
+        end = high if has_step else start
+    if start > end:
+        raise ValueError(f"Range '{base}' in {FIELD_UNITS[name]} field must go from low to high")
+    return CronTerm("range", start=start, end=end, step=step)
+
 
-# Helper functions for parsing cron fields
-def _is_wildcard(s: str) -> bool:
-    return s == "*"
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def parse_cron(cron_expr: str) -> CronExpression:
+    """Tokenize and validate a cron expression or macro; raises ValueError"""
+    text = cron_expr.strip().lower()
+    macro = None
+    if text.startswith("@"):
+        if text not in MACROS:
+            raise ValueError(f"Unknown macro '{cron_expr.strip()}' (supported: {', '.join(MACROS)})")
+        macro, text = text, MACROS[text]
+    
+    parts = text.split()
+    if len(parts) != 5:
+        raise ValueError("Cron expression must have 5 fields (minute hour day month weekday) or be a macro such as @daily")
+    
+    fields = [
+        CronField(spec[0], part, tuple(_parse_term(token, spec) for token in part.split(",")))
+        for spec, part in zip(FIELD_SPECS, parts)
+    ]
+    return CronExpression(cron_expr, macro, *fields)
 
 
-def _is_number(s: str) -> bool:
-    return s.isdigit()
+def _apscheduler_expression(field: CronField) -> str:
+    """APScheduler expression for the plain terms of a minute, hour, day or month field"""
+    if field.is_any:
+        return "*"
+    items = []
+    for term in field.terms:
+        if term.kind == "any":
+            items.append(f"*/{term.step}")
+        elif term.kind == "range":
+            item = str(term.start) if term.start == term.end else f"{term.start}-{term.end}"
+            items.append(item if term.step == 1 else f"{term.start}-{term.end}/{term.step}")
+        elif term.kind == "last_day":
+            items.append("last")
+    return ",".join(items)
 
 
-def _is_range(s: str) -> bool:
-    return "-" in s
+def build_cron_trigger(cron_expr: str, timezone: Optional[str] = None, jitter: Optional[int] = None) -> BaseTrigger:
+    """Build the APScheduler trigger that fires on a cron expression's schedule"""
+    parsed = parse_cron(cron_expr)
+    day, day_of_week = parsed.day, parsed.day_of_week
+    
+    # APScheduler numbers weekdays from Monday, so weekdays are passed by name.
+    # Weekday L/# terms become APScheduler day expressions ("last fri", "2nd mon").
+    weekdays = "*" if day_of_week.is_any else ",".join(WEEKDAY_NAMES[value] for value in day_of_week.values())
+    has_plain_weekdays = any(term.kind in ("any", "range") for term in day_of_week.terms)
+    weekday_positions = ",".join(
+        f"last {WEEKDAY_NAMES[term.start]}" if term.kind == "last_weekday"
+        else f"{APSCHEDULER_ORDINALS[term.nth - 1]} {WEEKDAY_NAMES[term.start]}"
+        for term in day_of_week.terms if term.kind in ("last_weekday", "nth_weekday")
+    )
+    
+    # (day, day_of_week) pairs; the trigger fires when any of them matches
+    alternatives = []
+    if not day_of_week.restricted:
+        alternatives.append((_apscheduler_expression(day), weekdays))
+    elif not day.restricted:
+        if has_plain_weekdays:
+            alternatives.append((_apscheduler_expression(day), weekdays))
+        if weekday_positions:
+            if not day.is_any:
+                raise ValueError("Weekday 'L' and '#' can't be combined with a day of month step")
+            alternatives.append((weekday_positions, "*"))
+    else:
+        # Both day fields restricted: cron runs when either one matches
+        day_expressions = [_apscheduler_expression(day)] + ([weekday_positions] if weekday_positions else [])
+        alternatives.append((",".join(day_expressions), "*"))
+        if has_plain_weekdays:
+            alternatives.append(("*", weekdays))
+    
+    triggers = [
+        DSTSafeCronTrigger(
+            minute=_apscheduler_expression(parsed.minute),
+            hour=_apscheduler_expression(parsed.hour),
+            day=day_expression,
+            month=_apscheduler_expression(parsed.month),
+            day_of_week=weekday_expression,
+            timezone=get_timezone(timezone),
+            jitter=None if len(alternatives) > 1 else jitter or None
+        )
+        for day_expression, weekday_expression in alternatives
+    ]
+    if len(triggers) == 1:
+        return triggers[0]
+    return OrTrigger(triggers, jitter=jitter or None)
 
 
-def _is_list(s: str) -> bool:
-    return "," in s
+class CompiledCron:
+    """A validated cron expression with its description, reused across requests"""
+    
+    def __init__(self, expression: str, timezone: Optional[str] = None):
+        self.expression = expression
+        self.timezone = timezone
+        self.tzinfo = get_timezone(timezone)
+        # Validate once; raises on invalid expressions
+        self.parsed = parse_cron(expression)
+        # Run times come from the same trigger the scheduler uses, so previews match real firings
+        self.trigger = build_cron_trigger(expression, timezone)
+        # Valid fields can still describe an impossible date (e.g. 0 0 30 2 *)
+        if self.trigger.get_next_fire_time(None, self.now()) is None:
+            raise ValueError("expression never fires")
+        self.description = describe_cron(self.parsed)
+    
+    def now(self) -> datetime:
+        """Current time in the schedule's timezone"""
+        return datetime.now(self.tzinfo)
+    
+    def iter_runs(self, start: datetime) -> Iterator[datetime]:
+        """Iterate over run times strictly after start"""
+        run_at = self.trigger.get_next_fire_time(None, start.astimezone(self.tzinfo) + timedelta(microseconds=1))
+        while run_at is not None:
+            yield run_at
+            run_at = self.trigger.get_next_fire_time(run_at, run_at)
+    
+    def next_runs(self, count: int = 5, start: Optional[datetime] = None) -> list[datetime]:
+        """Return the next count run times after start (default: now)"""
+        return list(islice(self.iter_runs(start or self.now()), count))
+
 
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def compile_cron(cron_expr: str, timezone: Optional[str] = None) -> CompiledCron:
+    """Parse and validate a cron expression once per expression/timezone"""
+    return CompiledCron(cron_expr, timezone)
 
-def _is_step(s: str) -> bool:
-    return "/" in s
 
+@lru_cache(maxsize=CRON_CACHE_SIZE)
+def _next_runs_for_minute(cron_expr: str, timezone: Optional[str], minute: datetime, count: int) -> tuple[str, ...]:
+    """Next run times as local time strings, memoised per wall-clock minute (cron's resolution)"""
+    compiled = compile_cron(cron_expr, timezone)
+    # The zone abbreviation tells the two copies of a repeated hour apart
+    return tuple(t.strftime("%Y-%m-%d %H:%M:%S %Z") for t in compiled.next_runs(count, start=minute))
 
-def parse_cron_expression(cron_expr: str) -> dict:
+
+def parse_cron_expression(cron_expr: str, timezone: Optional[str] = None) -> dict:
     """
     Parse cron expression and return human-readable description.
     Similar to crontab.guru style descriptions.
+    Next runs are given in the timezone (default SCHEDULER_TIMEZONE or the server zone).
     """
+    tzinfo = get_timezone(timezone)
     try:
-        # Validate and parse cron expression
-        cron = croniter(cron_expr, datetime.now())
-        
-        # Get next 5 run times
-        next_runs = []
-        base_time = datetime.now()
-        for _ in range(5):
-            next_time = cron.get_next(datetime)
-            next_runs.append(next_time.strftime("%Y-%m-%d %H:%M:%S"))
-            base_time = next_time
+        # Validate and parse cron expression (cached)
+        compiled = compile_cron(cron_expr, timezone)
         
-        # Generate human-readable description
-        description = _generate_description(cron_expr)
+        # Get next 5 run times (recomputed at most once per minute)
+        minute = compiled.now().replace(second=0, microsecond=0)
+        next_runs = list(_next_runs_for_minute(cron_expr, timezone, minute, 5))
         
         return {
             "cron_expression": cron_expr,
-            "description": description,
-            "next_runs": next_runs
+            "description": compiled.description,
+            "next_runs": next_runs,
+            "timezone": str(tzinfo)
         }
-    except Exception as e:
+    except ValueError as e:
+        # Only the parser's own errors are user errors; anything else is a bug and propagates
         raise ValueError(f"Invalid cron expression: {str(e)}")
 
 
-def _generate_description(cron_expr: str) -> str:
-    """Generate human-readable description from cron expression"""
-    parts = cron_expr.strip().split()
-    if len(parts) != 5:
-        return "Invalid cron expression (must have 5 fields)"
-    
-    minute, hour, day, month, weekday = parts
-    
-    # Parse minute
-    minute_desc = _parse_minute(minute)
-    
-    # Parse hour
-    hour_desc = _parse_hour(hour)
-    
-    # Parse day of month
-    day_desc = _parse_day(day)
-    
-    # Parse month
-    month_desc = _parse_month(month)
-    
-    # Parse weekday
-    weekday_desc = _parse_weekday(weekday)
-    
-    # Combine descriptions
-    parts_desc = [p for p in [minute_desc, hour_desc, day_desc, month_desc, weekday_desc] if p]
-    
-    if not parts_desc:
-        return "Every minute"
-    
-    return ", ".join(parts_desc)
-
-
-def _parse_minute(minute: str) -> str:
-    """Parse minute field"""
-    if _is_wildcard(minute):
-        return None  # Will be handled by hour
-    elif _is_number(minute):
-        return f"at minute {minute}"
-    elif _is_range(minute):
-        start, end = minute.split("-")
-        return f"minutes {start} through {end}"
-    elif _is_list(minute):
-        return f"at minutes {minute.replace(',', ', ')}"
-    elif _is_step(minute):
-        step = minute.split("/")[1]
-        return f"every {step} minutes"
-    return None
-
-
-def _parse_hour(hour: str) -> str:
-    """Parse hour field"""
-    if _is_wildcard(hour):
-        return "every hour"
-    elif _is_number(hour):
-        h = int(hour)
-        am_pm = "AM" if h < 12 else "PM"
-        h12 = h if h <= 12 else h - 12
-        if h == 0:
-            h12 = 12
-        return f"at {h12}:00 {am_pm}"
-    elif _is_range(hour):
-        start, end = hour.split("-")
-        start_h = int(start)
-        end_h = int(end)
-        start_ampm = "AM" if start_h < 12 else "PM"
-        end_ampm = "AM" if end_h < 12 else "PM"
-        start_h12 = start_h if start_h <= 12 else start_h - 12
-        end_h12 = end_h if end_h <= 12 else end_h - 12
-        if start_h == 0:
-            start_h12 = 12
-        if end_h == 0:
-            end_h12 = 12
-        return f"from {start_h12}:00 {start_ampm} to {end_h12}:00 {end_ampm}"
-    elif _is_list(hour):
-        hours = [int(h) for h in hour.split(",")]
-        hour_strs = []
-        for h in hours:
-            am_pm = "AM" if h < 12 else "PM"
-            h12 = h if h <= 12 else h - 12
-            if h == 0:
-                h12 = 12
-            hour_strs.append(f"{h12}:00 {am_pm}")
-        return f"at {', '.join(hour_strs)}"
-    elif _is_step(hour):
-        step = hour.split("/")[1]
-        return f"every {step} hours"
-    return None
-
-
-def _parse_day(day: str) -> str:
-    """Parse day of month field"""
-    if _is_wildcard(day):
-        return None
-    elif _is_number(day):
-        return f"on day {day} of the month"
-    elif _is_range(day):
-        start, end = day.split("-")
-        return f"from day {start} to {end} of the month"
-    elif _is_list(day):
-        return f"on days {day.replace(',', ', ')} of the month"
-    elif _is_step(day):
-        step = day.split("/")[1]
-        return f"every {step} days"
-    return None
-
-
-def _parse_month(month: str) -> str:
-    """Parse month field"""
-    month_names = {
-        "1": "January", "2": "February", "3": "March", "4": "April",
-        "5": "May", "6": "June", "7": "July", "8": "August",
-        "9": "September", "10": "October", "11": "November", "12": "December"
-    }
-    
-    if _is_wildcard(month):
-        return None
-    elif _is_number(month):
-        return f"in {month_names.get(month, month)}"
-    elif _is_range(month):
-        start, end = month.split("-")
-        start_name = month_names.get(start, start)
-        end_name = month_names.get(end, end)
-        return f"from {start_name} to {end_name}"
-    elif _is_list(month):
-        months = [month_names.get(m, m) for m in month.split(",")]
-        return f"in {', '.join(months)}"
-    elif _is_step(month):
-        step = month.split("/")[1]
-        return f"every {step} months"
-    return None
-
-
-def _parse_weekday(weekday: str) -> str:
-    """Parse weekday field"""
-    day_names = {
-        "0": "Sunday", "1": "Monday", "2": "Tuesday", "3": "Wednesday",
-        "4": "Thursday", "5": "Friday", "6": "Saturday",
-        "7": "Sunday"  # Some systems use 7 for Sunday
-    }
-    
-    if _is_wildcard(weekday):
+def forecast_runs(schedules: Iterable[tuple], start: datetime, end: datetime) -> Iterator[tuple[datetime, object]]:
+    """
+    Merge upcoming run times of many schedules in time order.
+    schedules yields (key, cron_expression, timezone); produces (run_at, key) for start < run_at <= end.
+    start and end must be timezone-aware; run times are in each schedule's own zone.
+    """
+    def runs_for(key, cron_expr, timezone):
+        compiled = compile_cron(cron_expr, timezone)
+        return ((run_at, key) for run_at in takewhile(lambda t: t <= end, compiled.iter_runs(start)))
+    
+    # Each per-job iterator is already sorted, so a heap merge yields one global timeline lazily
+    return heapq.merge(*(runs_for(*schedule) for schedule in schedules), key=lambda item: item[0])
+
+
+def _join(items: list[str]) -> str:
+    """Join phrases as: a, b and c"""
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def _format_hour(hour: int, minute: Optional[int] = None) -> str:
+    """12-hour clock time, e.g. 9 AM or 9:30 AM"""
+    h12 = hour % 12 or 12
+    suffix = "AM" if hour < 12 else "PM"
+    return f"{h12} {suffix}" if minute is None else f"{h12}:{minute:02d} {suffix}"
+
+
+def _format_value(field: CronField, value: int) -> str:
+    if field.name == "hour":
+        return _format_hour(value)
+    if field.name == "month":
+        return datetime(2000, value, 1).strftime("%B")
+    if field.name == "day_of_week":
+        return WEEKDAY_NAME_LABELS[value % 7]
+    return str(value)
+
+
+
+def _describe_term(field: CronField, term: CronTerm) -> str:
+    """Phrase for one term, e.g. every 2 hours from 9 AM through 5 PM"""
+    unit = FIELD_UNITS[field.name]
+    if term.kind == "any":
+        return f"every {unit}" if term.step == 1 else f"every {term.step} {unit}s"
+    if term.kind == "last_day":
+        return "on the last day of the month"
+    if term.kind == "last_weekday":
+        return f"on the last {WEEKDAY_NAME_LABELS[term.start]} of the month"
+    if term.kind == "nth_weekday":
+        return f"on the {ORDINALS[term.nth - 1]} {WEEKDAY_NAME_LABELS[term.start]} of the month"
+    if term.start == term.end:
+        return _format_value(field, term.start)
+    span = f"{_format_value(field, term.start)} through {_format_value(field, term.end)}"
+    return span if term.step == 1 else f"every {term.step} {unit}s from {span}"
+
+
+def _describe_field(field: CronField, prefix: str, suffix: str = "") -> Optional[str]:
+    """Describe a field, putting prefix/suffix around its listed values and ranges"""
+    if field.is_any:
         return None
-    elif _is_number(weekday):
-        return f"on {day_names.get(weekday, weekday)}"
-    elif _is_range(weekday):
-        start, end = weekday.split("-")
-        start_name = day_names.get(start, start)
-        end_name = day_names.get(end, end)
-        return f"from {start_name} to {end_name}"
-    elif _is_list(weekday):
-        days = [day_names.get(d, d) for d in weekday.split(",")]
-        return f"on {', '.join(days)}"
-    elif _is_step(weekday):
-        step = weekday.split("/")[1]
-        return f"every {step} weekdays"
-    return None
+    listed = [_describe_term(field, term) for term in field.terms if term.kind == "range" and term.step == 1]
+    others = [_describe_term(field, term) for term in field.terms if not (term.kind == "range" and term.step == 1)]
+    phrases = [f"{prefix} {_join(listed)}{suffix}"] if listed else []
+    return _join(phrases + others)
+
+
+def describe_cron(parsed: CronExpression) -> str:
+    """Generate human-readable description from a parsed cron expression"""
+    minute, hour = parsed.minute, parsed.hour
+    single_minute = len(minute.values()) == 1 and minute.terms[0].kind == "range"
+    plain_hours = all(term.kind == "range" and term.start == term.end for term in hour.terms)
+    
+    parts = []
+    if single_minute and plain_hours:
+        # "0 9,17 * * *" -> "at 9:00 AM and 5:00 PM"
+        parts.append(f"at {_join([_format_hour(h, minute.terms[0].start) for h in hour.values()])}")
+    else:
+        if minute.is_any:
+            parts.append("every minute")
+        else:
+            parts.append(_describe_field(minute, "at minute" if len(minute.values()) == 1 else "at minutes"))
+        if hour.is_any and all(term.kind == "range" and term.step == 1 for term in minute.terms):
+            parts.append("every hour")
+        elif not hour.is_any:
+            if len(hour.values()) == 1:
+                parts.append(_describe_field(hour, "during the", " hour"))
+            else:
+                parts.append(_describe_field(hour, "during hours"))
+    
+    day_desc = _describe_field(parsed.day, "on day" if len(parsed.day.values()) == 1 else "on days", " of the month")
+    weekday_desc = _describe_field(parsed.day_of_week, "on")
+    if day_desc and weekday_desc and parsed.day.restricted and parsed.day_of_week.restricted:
+        parts.append(f"{day_desc} or {weekday_desc}")
+    else:
+        parts.extend(desc for desc in (day_desc, weekday_desc) if desc)
+    
+    month_desc = _describe_field(parsed.month, "in")
+    if month_desc:
+        parts.append(month_desc)
+    
+    description = ", ".join(parts)
+    return "Every minute" if description == "every minute" else description
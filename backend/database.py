@@ -2,21 +2,47 @@
 Database models and connection for SQLite
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, Boolean, Text, DateTime, Float, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
+import sys
+import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.metrics_utils import DB_QUERY_SECONDS
+
 # Get database path from environment variable or use default
 DB_PATH = os.getenv("DATABASE_PATH", "/app/backend/scheduler.db")
 
+# Persist rendered HTML next to the markdown output (otherwise HTML is rendered on demand)
+STORE_HTML_OUTPUT = os.getenv("STORE_HTML_OUTPUT", "false").lower() == "true"
+
 # Create database engine
 engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Statement kinds reported in sqlite_query_duration_seconds (anything else is OTHER)
+QUERY_KINDS = {"SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "BEGIN", "COMMIT", "CREATE", "ALTER"}
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is not None:
+        words = statement.split(None, 1)
+        kind = words[0].upper() if words else "OTHER"
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, statement=kind if kind in QUERY_KINDS else "OTHER")
+
 
 class Job(Base):
     """Scheduled job configuration"""
@@ -31,6 +57,18 @@ class Job(Base):
     email_recipients = Column(Text, nullable=True)  # JSON array of email addresses
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Retention policy (NULL falls back to the RETENTION_* environment defaults)
+    retention_keep_runs = Column(Integer, nullable=True)
+    retention_log_days = Column(Integer, nullable=True)
+    retention_delete_days = Column(Integer, nullable=True)
+    # Random start delay in seconds (NULL falls back to SCHEDULER_JITTER_SECONDS)
+    jitter_seconds = Column(Integer, nullable=True)
+    # IANA timezone the cron expression is evaluated in (NULL falls back to SCHEDULER_TIMEZONE)
+    timezone = Column(String(64), nullable=True)
+    # Profile each run: "timers", "cprofile" or "pyinstrument" (NULL disables profiling)
+    profile_mode = Column(String(16), nullable=True)
+    # Maximum run time of the script in seconds (NULL falls back to JOB_TIMEOUT_SECONDS)
+    timeout_seconds = Column(Integer, nullable=True)
     
     # Relationship to job runs
     runs = relationship("JobRun", back_populates="job", cascade="all, delete-orphan")
@@ -42,21 +80,104 @@ class JobRun(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    status = Column(String, nullable=False)  # "running", "success", "failed"
+    status = Column(String, nullable=False)  # "queued", "running", "success", "failed", "cancelled"
     output_content = Column(Text, nullable=True)  # Markdown output
-    html_output_content = Column(Text, nullable=True)  # HTML formatted output
+    html_output_content = Column(Text, nullable=True)  # HTML formatted output (only when STORE_HTML_OUTPUT)
     log_content = Column(Text, nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # sha256 references into the artifact store (used instead of the text columns when enabled)
+    output_ref = Column(String(64), nullable=True)
+    html_output_ref = Column(String(64), nullable=True)
+    log_ref = Column(String(64), nullable=True)
+    # Profile report of runs of jobs with a profile_mode
+    profile_content = Column(Text, nullable=True)
+    profile_ref = Column(String(64), nullable=True)
+    # Worker queue (EXECUTION_MODE=worker): runs wait as "queued" until a worker claims them under a lease
+    queued_at = Column(DateTime, nullable=True)
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)  # Renewed by the worker's heartbeat while running
+    attempts = Column(Integer, default=0)
+    # Set by POST /api/job-runs/{id}/cancel; the process executing the run stops it and marks it cancelled
+    cancel_requested_at = Column(DateTime, nullable=True)
+    # Dedupe key of the submission that created the run (one run per scheduled firing or Idempotency-Key)
+    idempotency_key = Column(String(255), nullable=True)
     
     # Relationship to job
     job = relationship("Job", back_populates="runs")
+    stages = relationship("RunStage", back_populates="run", cascade="all, delete-orphan", order_by="RunStage.position")
+    
+    __table_args__ = (
+        Index("ix_job_runs_status_queued_at", "status", "queued_at"),
+        Index("ux_job_runs_idempotency_key", "idempotency_key", unique=True),
+    )
+
+
+class RunStage(Base):
+    """Duration of one stage of a job run (queue wait, process start, model call, ...)"""
+    __tablename__ = "run_stages"
+    
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("job_runs.id"), nullable=False, index=True)
+    job_id = Column(Integer, nullable=False)  # Copied from the run for per-job aggregation
+    stage = Column(String(32), nullable=False)
+    position = Column(Integer, nullable=False)  # Order within the run
+    seconds = Column(Float, nullable=False)
+    
+    run = relationship("JobRun", back_populates="stages")
+    
+    __table_args__ = (Index("ix_run_stages_job_stage", "job_id", "stage"),)
+
+
+class SchedulerLease(Base):
+    """Lease a node holds while it is the leader for a task (e.g. firing schedules)"""
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(64), primary_key=True)
+    holder = Column(String, nullable=True)  # Node id of the leader (NULL when released)
+    expires_at = Column(DateTime, nullable=False)
+
+
+def _migrate_schema():
+    """Add columns and indexes introduced after a database was created"""
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                # Backfill existing rows with the column's scalar default
+                if column.default is not None and column.default.is_scalar:
+                    value = column.default.arg
+                    ddl += f" DEFAULT '{value}'" if isinstance(value, str) else f" DEFAULT {int(value) if isinstance(value, bool) else value}"
+                conn.execute(text(ddl))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _enable_incremental_vacuum():
+    """
+    Create new databases with incremental auto-vacuum so freed pages can be reclaimed in steps.
+    Existing ones need a full VACUUM to switch: see `python migrations.py enable-incremental-vacuum`.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # The pragma takes effect without a VACUUM only before the first table is created
+        if conn.execute(text("PRAGMA page_count")).scalar() == 0:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
 
 
 def init_db():
     """Initialize database tables"""
+    _enable_incremental_vacuum()
     Base.metadata.create_all(bind=engine)
+    _migrate_schema()
 
 
 def get_db():
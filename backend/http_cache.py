@@ -0,0 +1,76 @@
+"""
+HTTP caching helpers (ETag / Last-Modified and 304 responses)
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import Job, JobRun
+
+# Clients must revalidate before reusing a cached copy
+REVALIDATE = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values that determine a response"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def jobs_watermark(db: Session) -> tuple:
+    """Cheap change marker for the jobs table"""
+    return db.query(func.count(Job.id), func.max(Job.updated_at)).one()
+
+
+def runs_watermark(db: Session) -> tuple:
+    """Cheap change marker for the job_runs table (inserts, updates and deletes)"""
+    return db.query(func.count(JobRun.id), func.max(JobRun.id), func.max(JobRun.updated_at)).one()
+
+
+def _is_fresh(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Check the request's conditional headers against the current version"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Dates with a -0000 zone parse as naive but are UTC too
+        since = since.replace(tzinfo=timezone.utc) if since.tzinfo is None else since.astimezone(timezone.utc)
+        return last_modified.replace(microsecond=0) <= since.replace(tzinfo=None)
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = REVALIDATE
+) -> Optional[Response]:
+    """
+    Set caching headers on the response.
+    Returns a 304 response when the client's copy is current, otherwise None.
+    Collections must not pass last_modified: deletes don't advance a max(updated_at).
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        # Timestamps are stored as naive UTC
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if _is_fresh(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,133 @@
+"""
+Leader election through a lease row in the shared database
+
+Every replica serves the API, but only the holder of the scheduler lease fires
+schedules. The lease is taken with a single conditional UPDATE (atomic in SQLite),
+renewed in a background thread and taken over by another node once it expires.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert
+
+from database import SessionLocal, SchedulerLease
+
+# Seconds a lease stays valid without renewal (another node takes over after this)
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+# Identity of this process in the lease table
+SCHEDULER_NODE_ID = os.getenv("SCHEDULER_NODE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+logger = logging.getLogger(__name__)
+
+
+def acquire_lease(name: str, holder: str, seconds: int) -> bool:
+    """Take or renew a lease unless another holder's lease is still valid"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.execute(insert(SchedulerLease).values(name=name, holder=None, expires_at=now).on_conflict_do_nothing())
+        result = db.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == name,
+                or_(SchedulerLease.holder == holder, SchedulerLease.holder.is_(None), SchedulerLease.expires_at < now)
+            )
+            .values(holder=holder, expires_at=now + timedelta(seconds=seconds))
+        )
+        db.commit()
+        return result.rowcount == 1
+    finally:
+        db.close()
+
+
+def release_lease(name: str, holder: str) -> None:
+    """Give up a lease held by this holder so another node can take it at once"""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+            .values(holder=None, expires_at=datetime.utcnow())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+class LeaderElection:
+    """Competes for a named lease in the background, calling back when leadership changes"""
+
+    def __init__(self, name: str, on_elected: Callable[[], None], on_lost: Callable[[], None],
+                 on_renewed: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.node_id = SCHEDULER_NODE_ID
+        self._on_elected = on_elected
+        self._on_lost = on_lost
+        self._on_renewed = on_renewed
+        self._leader = False
+        # Monotonic time the current lease is known to be valid until
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this node holds an unexpired lease"""
+        return self._leader and time.monotonic() < self._valid_until
+
+    def _attempt(self) -> None:
+        attempted_at = time.monotonic()
+        try:
+            acquired = acquire_lease(self.name, self.node_id, SCHEDULER_LEASE_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to renew the {self.name} lease: {e}")
+            # Keep leading while the lease we hold is still valid; retry on the next round
+            acquired = self.is_leader
+        else:
+            if acquired:
+                self._valid_until = attempted_at + SCHEDULER_LEASE_SECONDS
+
+        if acquired and not self._leader:
+            self._leader = True
+            logger.info(f"Node {self.node_id} acquired the {self.name} lease")
+            self._on_elected()
+        elif not acquired and self._leader:
+            self._leader = False
+            logger.warning(f"Node {self.node_id} lost the {self.name} lease")
+            self._on_lost()
+        elif acquired and self._on_renewed is not None:
+            self._on_renewed()
+
+    def _run(self) -> None:
+        # Renew well before expiry so a slow round doesn't hand the lease over
+        while not self._stop.wait(SCHEDULER_LEASE_SECONDS / 3):
+            self._attempt()
+
+    def start(self) -> None:
+        """Make a first attempt now, then keep competing in a background thread"""
+        self._stop.clear()
+        self._attempt()
+        if not self._leader:
+            logger.info(f"Node {self.node_id} is a follower; another node holds the {self.name} lease")
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-lease", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop competing and release the lease if held"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._leader:
+            self._leader = False
+            try:
+                release_lease(self.name, self.node_id)
+            except Exception as e:
+                logger.warning(f"Failed to release the {self.name} lease: {e}")
+            logger.info(f"Node {self.node_id} released the {self.name} lease")
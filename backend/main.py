@@ -2,35 +2,78 @@
 FastAPI main application
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
 import logging
 import re
 import json
+import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from database import init_db, get_db, Job, JobRun
 from schemas import (
     JobCreate, JobUpdate, JobResponse, JobRunResponse,
-    CronParseRequest, CronParseResponse, StatusResponse
+    CronParseRequest, CronParseResponse, StatusResponse,
+    ScheduleForecastResponse, ForecastFiring, ForecastHotspot,
+    RunStageResponse, JobStageStatsResponse, StageStats
 )
 from scheduler import (
     add_job_to_scheduler, remove_job_from_scheduler,
     update_job_in_scheduler, start_scheduler, stop_scheduler,
-    get_scheduler_status, execute_job
+    get_scheduler_status, run_job_now, SCHEDULER_JITTER_SECONDS
 )
-from cron_parser import parse_cron_expression
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from cron_parser import parse_cron_expression, forecast_runs, get_timezone
+from artifact_store import RUN_ARTIFACT_FIELDS, artifact_path, has_run_text, load_run_text
+from compression import CompressionMiddleware, PrecompressedStaticFiles
+from metrics import MetricsMiddleware, metrics_response
+from run_stages import stage_percentiles
+from run_queue import EXECUTION_MODE
+from run_cancellation import request_cancel
+from http_cache import conditional_response, jobs_watermark, make_etag, runs_watermark
+
+# Import markdown to HTML converter
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.markdown_utils import render_html_cached
+from utils.logging_utils import LOG_DIR, configure_logging, log_context, remove_run_logs
+from utils.tracing_utils import configure_tracing, span
+
+# Setup logging (JSON lines to the console and logs/backend.log, written off the request path)
+configure_logging(LOG_DIR / "backend.log")
+configure_tracing("backend")
+# Route uvicorn's own loggers through the same handlers
+for uvicorn_logger in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+    logging.getLogger(uvicorn_logger).handlers.clear()
+    logging.getLogger(uvicorn_logger).propagate = True
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the database and scheduler with the app, and stop the scheduler on shutdown"""
+    init_db()
+    logger.info("Database initialized")
+    
+    # Start scheduler with database session (on the app's event loop in asyncio mode)
+    db = next(get_db())
+    try:
+        start_scheduler(db)
+    finally:
+        db.close()
+    
+    yield
+    
+    stop_scheduler()
+    logger.info("Scheduler stopped")
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Cob's AI Scripts API")
+app = FastAPI(title="Cob's AI Scripts API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -41,24 +84,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    init_db()
-    logger.info("Database initialized")
-    
-    # Start scheduler with database session
-    db = next(get_db())
-    try:
-        start_scheduler(db)
-    finally:
-        db.close()
+# Compress API responses (static assets are served pre-compressed)
+app.add_middleware(CompressionMiddleware)
 
+# Request latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    stop_scheduler()
-    logger.info("Scheduler stopped")
+
+# Optional per-job settings copied as-is between the API schemas and the Job model
+JOB_SETTING_FIELDS = (
+    "retention_keep_runs",
+    "retention_log_days",
+    "retention_delete_days",
+    "jitter_seconds",
+    "timezone",
+    "profile_mode",
+    "timeout_seconds",
+)
 
 
 # Helper function to generate prompt filename from job name
@@ -71,8 +113,54 @@ def generate_prompt_filename(job_name: str) -> str:
     return f"{filename}.md"
 
 
+def job_to_dict(job: Job, is_running: bool) -> dict:
+    """Build the JobResponse fields for a job"""
+    # Parse email_recipients from JSON string
+    email_recipients = None
+    if job.email_recipients:
+        try:
+            email_recipients = json.loads(job.email_recipients)
+        except (json.JSONDecodeError, TypeError):
+            email_recipients = []
+    
+    return {
+        "id": job.id,
+        "name": job.name,
+        "prompt_filename": job.prompt_filename,
+        "prompt_content": job.prompt_content,
+        "cron_expression": job.cron_expression,
+        "enabled": job.enabled,
+        "email_recipients": email_recipients,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "is_running": is_running,
+        **{field: getattr(job, field) for field in JOB_SETTING_FIELDS}
+    }
+
+
+def get_run_html(run: JobRun) -> Optional[str]:
+    """Return the HTML output for a run, rendering it from markdown if it wasn't stored"""
+    html_content = load_run_text(run, "html")
+    if html_content:
+        return html_content
+    output_content = load_run_text(run, "output")
+    if not output_content:
+        return None
+    try:
+        return render_html_cached(output_content)
+    except Exception as e:
+        logger.warning(f"Failed to render HTML for job run {run.id}: {e}")
+        return None
+
+
 # API Routes
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics for the scheduler, job runs and API"""
+    return metrics_response()
+
+
 @app.get("/api/status", response_model=StatusResponse)
 async def get_status(db: Session = Depends(get_db)):
     """Get scheduler status"""
@@ -83,7 +171,11 @@ async def get_status(db: Session = Depends(get_db)):
     return StatusResponse(
         scheduler_running=status_info["running"],
         active_jobs_count=active_jobs,
-        total_jobs_count=total_jobs
+        total_jobs_count=total_jobs,
+        running_jobs_count=status_info["running_executions"],
+        peak_concurrency=status_info["peak_concurrency"],
+        scheduler_leader=status_info["leader"],
+        scheduler_node=status_info["node_id"]
     )
 
 
@@ -91,15 +183,81 @@ async def get_status(db: Session = Depends(get_db)):
 async def parse_cron(request: CronParseRequest):
     """Parse cron expression and return human-readable description"""
     try:
-        result = parse_cron_expression(request.cron_expression)
+        result = parse_cron_expression(request.cron_expression, request.timezone)
         return CronParseResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# Upper bounds for /api/schedule/forecast
+FORECAST_MAX_HOURS = 24 * 31
+FORECAST_MAX_FIRINGS = 10000
+FORECAST_HOTSPOT_COUNT = 10
+
+
+@app.get("/api/schedule/forecast", response_model=ScheduleForecastResponse)
+async def get_schedule_forecast(hours: int = 24, db: Session = Depends(get_db)):
+    """Every upcoming firing of all enabled jobs within the next N hours"""
+    if hours < 1 or hours > FORECAST_MAX_HOURS:
+        raise HTTPException(status_code=400, detail=f"hours must be between 1 and {FORECAST_MAX_HOURS}")
+    
+    jobs = db.query(Job).filter(Job.enabled == True).all()
+    job_names = {job.id: job.name for job in jobs}
+    job_jitter = {
+        job.id: job.jitter_seconds if job.jitter_seconds is not None else SCHEDULER_JITTER_SECONDS
+        for job in jobs
+    }
+    start = datetime.now(dt_timezone.utc).replace(second=0, microsecond=0)
+    end = start + timedelta(hours=hours)
+    
+    firings = []
+    per_minute = defaultdict(list)
+    truncated = False
+    # Invalid expressions are skipped rather than failing the whole forecast
+    schedules = []
+    for job in jobs:
+        try:
+            parse_cron_expression(job.cron_expression, job.timezone)
+            schedules.append((job.id, job.cron_expression, job.timezone))
+        except ValueError:
+            logger.warning(f"Skipping job {job.id} in forecast: invalid cron expression or timezone")
+    
+    for run_at, job_id in forecast_runs(schedules, start, end):
+        if len(firings) >= FORECAST_MAX_FIRINGS:
+            truncated = True
+            break
+        firings.append(ForecastFiring(
+            job_id=job_id, job_name=job_names[job_id], run_at=run_at, jitter_seconds=job_jitter[job_id]
+        ))
+        per_minute[run_at].append(job_id)
+    
+    busiest = sorted(
+        (slot for slot in per_minute.items() if len(slot[1]) > 1),
+        key=lambda slot: (-len(slot[1]), slot[0])
+    )[:FORECAST_HOTSPOT_COUNT]
+    
+    return ScheduleForecastResponse(
+        start=start,
+        end=end,
+        firings=firings,
+        hotspots=[ForecastHotspot(run_at=run_at, job_count=len(ids), job_ids=ids) for run_at, ids in busiest],
+        peak_concurrency=max((len(ids) for ids in per_minute.values()), default=0),
+        truncated=truncated
+    )
+
+
 @app.get("/api/jobs", response_model=List[JobResponse])
-async def list_jobs(db: Session = Depends(get_db)):
+async def list_jobs(request: Request, response: Response, db: Session = Depends(get_db)):
     """List all jobs"""
+    # Job list changes with job edits and with run state (is_running)
+    jobs_version = jobs_watermark(db)
+    runs_version = runs_watermark(db)
+    not_modified = conditional_response(
+        request, response, etag=make_etag("jobs", tuple(jobs_version), tuple(runs_version))
+    )
+    if not_modified:
+        return not_modified
+    
     jobs = db.query(Job).all()
     result = []
     for job in jobs:
@@ -110,26 +268,7 @@ async def list_jobs(db: Session = Depends(get_db)):
             JobRun.completed_at.is_(None)
         ).first()
         
-        # Parse email_recipients from JSON string
-        email_recipients = None
-        if job.email_recipients:
-            try:
-                email_recipients = json.loads(job.email_recipients)
-            except (json.JSONDecodeError, TypeError):
-                email_recipients = []
-        
-        job_dict = {
-            "id": job.id,
-            "name": job.name,
-            "prompt_filename": job.prompt_filename,
-            "prompt_content": job.prompt_content,
-            "cron_expression": job.cron_expression,
-            "enabled": job.enabled,
-            "email_recipients": email_recipients,
-            "created_at": job.created_at,
-            "updated_at": job.updated_at,
-            "is_running": running_run is not None
-        }
+        job_dict = job_to_dict(job, is_running=running_run is not None)
         result.append(JobResponse(**job_dict))
     return result
 
@@ -148,35 +287,39 @@ async def get_job(job_id: int, db: Session = Depends(get_db)):
         JobRun.completed_at.is_(None)
     ).first()
     
-    # Parse email_recipients from JSON string
-    email_recipients = None
-    if job.email_recipients:
-        try:
-            email_recipients = json.loads(job.email_recipients)
-        except (json.JSONDecodeError, TypeError):
-            email_recipients = []
-    
-    job_dict = {
-        "id": job.id,
-        "name": job.name,
-        "prompt_filename": job.prompt_filename,
-        "prompt_content": job.prompt_content,
-        "cron_expression": job.cron_expression,
-        "enabled": job.enabled,
-        "email_recipients": email_recipients,
-        "created_at": job.created_at,
-        "updated_at": job.updated_at,
-        "is_running": running_run is not None
-    }
+    job_dict = job_to_dict(job, is_running=running_run is not None)
     return JobResponse(**job_dict)
 
 
+# Upper bound of the runs covered by /api/jobs/{id}/stages
+STAGE_STATS_MAX_RUNS = 1000
+
+
+@app.get("/api/jobs/{job_id}/stages", response_model=JobStageStatsResponse)
+async def get_job_stage_stats(job_id: int, runs: int = 100, db: Session = Depends(get_db)):
+    """Duration percentiles of each run stage over a job's most recent runs"""
+    if runs < 1 or runs > STAGE_STATS_MAX_RUNS:
+        raise HTTPException(status_code=400, detail=f"runs must be between 1 and {STAGE_STATS_MAX_RUNS}")
+    if not db.query(Job.id).filter(Job.id == job_id).first():
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobStageStatsResponse(
+        job_id=job_id,
+        runs=runs,
+        stages=[StageStats(**stats) for stats in stage_percentiles(db, job_id, runs)]
+    )
+
+
 @app.post("/api/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     """Create a new job"""
-    # Validate cron expression
+    # Validate timezone and cron expression
+    try:
+        get_timezone(job_data.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        parse_cron_expression(job_data.cron_expression)
+        parse_cron_expression(job_data.cron_expression, job_data.timezone)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid cron expression: {str(e)}")
     
@@ -205,7 +348,8 @@ async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
         prompt_content=job_data.prompt_content,
         cron_expression=job_data.cron_expression,
         enabled=job_data.enabled,
-        email_recipients=email_recipients_json
+        email_recipients=email_recipients_json,
+        **{field: getattr(job_data, field) for field in JOB_SETTING_FIELDS}
     )
     
     db.add(job)
@@ -221,27 +365,7 @@ async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     
     logger.info(f"Created job {job.id}: {job.name}")
     
-    # Parse email_recipients from JSON string
-    email_recipients = None
-    if job.email_recipients:
-        try:
-            email_recipients = json.loads(job.email_recipients)
-        except (json.JSONDecodeError, TypeError):
-            email_recipients = []
-    
-    # Return with is_running status
-    job_dict = {
-        "id": job.id,
-        "name": job.name,
-        "prompt_filename": job.prompt_filename,
-        "prompt_content": job.prompt_content,
-        "cron_expression": job.cron_expression,
-        "enabled": job.enabled,
-        "email_recipients": email_recipients,
-        "created_at": job.created_at,
-        "updated_at": job.updated_at,
-        "is_running": False  # New jobs are not running
-    }
+    job_dict = job_to_dict(job, is_running=False)  # New jobs are not running
     return JobResponse(**job_dict)
 
 
@@ -265,10 +389,17 @@ async def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get
     if job_data.prompt_content is not None:
         job.prompt_content = job_data.prompt_content
     
+    if "timezone" in job_data.model_fields_set:
+        try:
+            get_timezone(job_data.timezone)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
     if job_data.cron_expression is not None:
-        # Validate cron expression
+        # Validate cron expression in the zone the job will run in after this update
+        timezone = job_data.timezone if "timezone" in job_data.model_fields_set else job.timezone
         try:
-            parse_cron_expression(job_data.cron_expression)
+            parse_cron_expression(job_data.cron_expression, timezone)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Invalid cron expression: {str(e)}")
         job.cron_expression = job_data.cron_expression
@@ -285,6 +416,11 @@ async def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get
             recipients = [DEFAULT_EMAIL] + recipients
         job.email_recipients = json.dumps(recipients)
     
+    # Settings explicitly sent as null are cleared (falling back to global defaults)
+    for field in JOB_SETTING_FIELDS:
+        if field in job_data.model_fields_set:
+            setattr(job, field, getattr(job_data, field))
+    
     db.commit()
     db.refresh(job)
     
@@ -304,27 +440,7 @@ async def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get
         JobRun.completed_at.is_(None)
     ).first()
     
-    # Parse email_recipients from JSON string
-    email_recipients = None
-    if job.email_recipients:
-        try:
-            email_recipients = json.loads(job.email_recipients)
-        except (json.JSONDecodeError, TypeError):
-            email_recipients = []
-    
-    # Return with is_running status
-    job_dict = {
-        "id": job.id,
-        "name": job.name,
-        "prompt_filename": job.prompt_filename,
-        "prompt_content": job.prompt_content,
-        "cron_expression": job.cron_expression,
-        "enabled": job.enabled,
-        "email_recipients": email_recipients,
-        "created_at": job.created_at,
-        "updated_at": job.updated_at,
-        "is_running": running_run is not None
-    }
+    job_dict = job_to_dict(job, is_running=running_run is not None)
     return JobResponse(**job_dict)
 
 
@@ -346,24 +462,41 @@ async def delete_job(job_id: int, db: Session = Depends(get_db)):
     # Delete job (cascade will delete runs)
     db.delete(job)
     db.commit()
+    # The runs' script log files go with them
+    remove_run_logs(LOG_DIR, job_id)
     
     logger.info(f"Deleted job {job_id}: {job.name}")
 
 
+# Longest Idempotency-Key accepted for manual runs (stored on the run with a job prefix)
+IDEMPOTENCY_KEY_MAX_LENGTH = 200
+
+
 @app.post("/api/jobs/{job_id}/run", response_model=JobRunResponse)
-async def run_job_manual(job_id: int, db: Session = Depends(get_db)):
-    """Manually trigger a job"""
+async def run_job_manual(
+    job_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Manually trigger a job (in worker mode the run is returned queued); a repeated Idempotency-Key returns its run"""
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Execute job in background (in production, use background tasks)
-    # Note: execute_job gets its own DB session, so we don't pass db
-    execute_job(job_id)
-    
-    # Refresh to get the latest run
-    db.refresh(job)
-    job_run = db.query(JobRun).filter(JobRun.job_id == job_id).order_by(JobRun.started_at.desc()).first()
+    if idempotency_key is not None and not 1 <= len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400, detail=f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+        )
+    
+    # Runs off the event loop (thread or asyncio subprocess) so other requests aren't blocked
+    started = time.perf_counter()
+    with log_context(job_id=job_id), span("run_job_manual", {"job.id": job_id}):
+        run_id = await run_job_now(job_id, idempotency_key)
+        logger.info(
+            f"Manual run of job {job_id} {'queued' if EXECUTION_MODE == 'worker' else 'finished'}",
+            extra={"run_id": run_id, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+        )
+    
+    job_run = db.query(JobRun).filter(JobRun.id == run_id).first() if run_id else None
     if not job_run:
         raise HTTPException(status_code=500, detail="Job execution failed to create run record")
     
@@ -373,20 +506,34 @@ async def run_job_manual(job_id: int, db: Session = Depends(get_db)):
         job_id=job_run.job_id,
         job_name=job.name,
         status=job_run.status,
-        output_content=job_run.output_content,
-        html_output_content=job_run.html_output_content,
-        log_content=job_run.log_content,
+        output_content=load_run_text(job_run, "output"),
+        html_output_content=get_run_html(job_run),
+        log_content=load_run_text(job_run, "log"),
         started_at=job_run.started_at,
         completed_at=job_run.completed_at,
-        error_message=job_run.error_message
+        error_message=job_run.error_message,
+        has_profile=has_run_text(job_run, "profile"),
+        cancel_requested=job_run.cancel_requested_at is not None
     )
     
     return response
 
 
-@app.get("/api/job-runs", response_model=List[JobRunResponse])
-async def list_job_runs(limit: int = 50, db: Session = Depends(get_db)):
+# The list leaves out the HTML, which is rendered on demand for a single run
+@app.get(
+    "/api/job-runs", response_model=List[JobRunResponse], response_model_exclude={"__all__": {"html_output_content"}}
+)
+async def list_job_runs(request: Request, response: Response, limit: int = 50, db: Session = Depends(get_db)):
     """List recent job runs"""
+    # Job names are part of the response, so job edits also change the version
+    jobs_version = jobs_watermark(db)
+    runs_version = runs_watermark(db)
+    not_modified = conditional_response(
+        request, response, etag=make_etag("job-runs", limit, tuple(jobs_version), tuple(runs_version))
+    )
+    if not_modified:
+        return not_modified
+    
     runs = db.query(JobRun).join(Job).order_by(JobRun.started_at.desc()).limit(limit).all()
     
     # Add job names to responses
@@ -397,38 +544,95 @@ async def list_job_runs(limit: int = 50, db: Session = Depends(get_db)):
             job_id=run.job_id,
             job_name=run.job.name,
             status=run.status,
-            output_content=run.output_content,
-            html_output_content=run.html_output_content,
-            log_content=run.log_content,
+            output_content=load_run_text(run, "output"),
+            log_content=load_run_text(run, "log"),
             started_at=run.started_at,
             completed_at=run.completed_at,
-            error_message=run.error_message
+            error_message=run.error_message,
+            has_profile=has_run_text(run, "profile"),
+            cancel_requested=run.cancel_requested_at is not None
         ))
     
     return responses
 
 
 @app.get("/api/job-runs/{run_id}", response_model=JobRunResponse)
-async def get_job_run(run_id: int, db: Session = Depends(get_db)):
+async def get_job_run(run_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get job run details"""
     run = db.query(JobRun).filter(JobRun.id == run_id).first()
     if not run:
         raise HTTPException(status_code=404, detail="Job run not found")
     
+    # Completed runs still change (retention, migrations, job renames), so clients always revalidate
+    not_modified = conditional_response(
+        request, response,
+        etag=make_etag("job-run", run.id, run.updated_at, run.job.name),
+        last_modified=max(filter(None, [run.updated_at or run.started_at, run.job.updated_at]))
+    )
+    if not_modified:
+        return not_modified
+    
     return JobRunResponse(
         id=run.id,
         job_id=run.job_id,
         job_name=run.job.name,
         status=run.status,
-        output_content=run.output_content,
-        html_output_content=run.html_output_content,
-        log_content=run.log_content,
+        output_content=load_run_text(run, "output"),
+        html_output_content=get_run_html(run),
+        log_content=load_run_text(run, "log"),
         started_at=run.started_at,
         completed_at=run.completed_at,
-        error_message=run.error_message
+        error_message=run.error_message,
+        has_profile=has_run_text(run, "profile"),
+        cancel_requested=run.cancel_requested_at is not None,
+        stages=[RunStageResponse(stage=stage.stage, seconds=stage.seconds) for stage in run.stages]
     )
 
 
+@app.post("/api/job-runs/{run_id}/cancel", response_model=JobRunResponse, status_code=status.HTTP_202_ACCEPTED)
+async def cancel_job_run(run_id: int, db: Session = Depends(get_db)):
+    """Cancel a run: queued runs at once, running ones are stopped by the process executing them"""
+    run_status = request_cancel(run_id)
+    if run_status is None:
+        raise HTTPException(status_code=404, detail="Job run not found")
+    if run_status not in ("running", "cancelled"):
+        raise HTTPException(status_code=409, detail=f"Job run already finished ({run_status})")
+    
+    run = db.query(JobRun).filter(JobRun.id == run_id).first()
+    return JobRunResponse(
+        id=run.id,
+        job_id=run.job_id,
+        job_name=run.job.name,
+        status=run.status,
+        started_at=run.started_at,
+        completed_at=run.completed_at,
+        error_message=run.error_message,
+        cancel_requested=run.cancel_requested_at is not None
+    )
+
+
+@app.get("/api/job-runs/{run_id}/artifacts/{kind}")
+async def get_job_run_artifact(run_id: int, kind: str, db: Session = Depends(get_db)):
+    """Download a job run's output, HTML, log or profile"""
+    if kind not in RUN_ARTIFACT_FIELDS:
+        raise HTTPException(status_code=404, detail="Unknown artifact kind")
+    
+    run = db.query(JobRun).filter(JobRun.id == run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Job run not found")
+    
+    inline_field, ref_field, media_type = RUN_ARTIFACT_FIELDS[kind]
+    digest = getattr(run, ref_field)
+    if digest and artifact_path(digest).exists():
+        # Served straight from disk (uses sendfile where the server supports it)
+        return FileResponse(str(artifact_path(digest)), media_type=media_type)
+    
+    content = get_run_html(run) if kind == "html" else getattr(run, inline_field)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return Response(content=content, media_type=media_type)
+
+
 # Serve frontend static files
 try:
     static_path = Path(__file__).parent / "static"
@@ -437,10 +641,10 @@ try:
         # Mount the inner static folder at /static to serve JS/CSS correctly
         inner_static = static_path / "static"
         if inner_static.exists():
-            app.mount("/static", StaticFiles(directory=str(inner_static)), name="static")
+            app.mount("/static", PrecompressedStaticFiles(directory=str(inner_static)), name="static")
         else:
             # Fallback for legacy structure
-            app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+            app.mount("/static", PrecompressedStaticFiles(directory=str(static_path)), name="static")
         
         # Serve favicon from root path (browsers request /favicon.ico by default)
         @app.get("/favicon.ico")
@@ -461,9 +665,9 @@ try:
                 return FileResponse(str(favicon_path), media_type="image/png")
             raise HTTPException(status_code=404, detail="Favicon not found")
         
-        # Serve index.html at root
+        # Serve index.html at root (always revalidated so new builds are picked up)
         @app.get("/")
         async def read_root():
-            return FileResponse(str(static_path / "index.html"))
+            return FileResponse(str(static_path / "index.html"), headers={"Cache-Control": "no-cache"})
 except Exception as e:
     logger.warning(f"Could not mount frontend static files: {e}")
@@ -0,0 +1,54 @@
+"""
+API request metrics and the Prometheus scrape response
+"""
+
+import sys
+import time
+from pathlib import Path
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.metrics_utils import REGISTRY, CONTENT_TYPE
+
+API_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "API request latency", ("method", "route", "status")
+)
+
+
+class MetricsMiddleware:
+    """Record the latency of each HTTP request by route template (not raw path, to bound label values)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router sets the matched route on the scope
+            route = scope.get("route")
+            API_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code
+            )
+
+
+def metrics_response() -> Response:
+    """Current metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
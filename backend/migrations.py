@@ -0,0 +1,144 @@
+"""
+Data migrations for the SQLite database
+
+Usage:
+  python migrations.py drop-stored-html [--batch-size N] [--no-vacuum]
+  python migrations.py move-to-artifact-store [--batch-size N] [--no-vacuum]
+  python migrations.py enable-incremental-vacuum
+"""
+
+import argparse
+import logging
+from datetime import datetime
+from sqlalchemy import DateTime, bindparam, text
+
+from database import engine, init_db, SessionLocal, JobRun
+from artifact_store import RUN_ARTIFACT_FIELDS, save_run_text
+import artifact_store
+
+logger = logging.getLogger(__name__)
+
+
+def drop_stored_html(batch_size: int = 500, vacuum: bool = True) -> int:
+    """
+    Clear persisted html_output_content for existing runs.
+    HTML is rendered on demand from output_content, so the stored copy is redundant.
+    Returns the number of runs updated.
+    """
+    total = 0
+    while True:
+        # Small batches keep the write lock short so the API and scheduler aren't blocked
+        with engine.begin() as conn:
+            # updated_at is the runs' cache validator, and raw SQL doesn't apply its onupdate
+            result = conn.execute(text(
+                "UPDATE job_runs SET html_output_content = NULL, html_output_ref = NULL, updated_at = :now WHERE id IN ("
+                "SELECT id FROM job_runs WHERE html_output_content IS NOT NULL OR html_output_ref IS NOT NULL "
+                "LIMIT :batch_size)"
+            ).bindparams(bindparam("now", type_=DateTime)), {"batch_size": batch_size, "now": datetime.utcnow()})
+        if result.rowcount <= 0:
+            break
+        total += result.rowcount
+        logger.info(f"Dropped stored HTML for {total} job run(s) so far")
+
+    if vacuum and total:
+        vacuum_database()
+
+    return total
+
+
+def move_to_artifact_store(batch_size: int = 100, vacuum: bool = True) -> int:
+    """
+    Move inline output, HTML and log text of existing runs into the artifact store.
+    Returns the number of runs moved.
+    """
+    # Force artifact references even if the store isn't enabled for new runs yet
+    artifact_store.ARTIFACT_STORE_ENABLED = True
+    inline_fields = [getattr(JobRun, inline) for inline, _, _ in RUN_ARTIFACT_FIELDS.values()]
+
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            condition = inline_fields[0].isnot(None)
+            for field in inline_fields[1:]:
+                condition = condition | field.isnot(None)
+            runs = db.query(JobRun).filter(condition).limit(batch_size).all()
+            if not runs:
+                break
+            for run in runs:
+                for kind, (inline_field, _, _) in RUN_ARTIFACT_FIELDS.items():
+                    content = getattr(run, inline_field)
+                    if content is not None:
+                        save_run_text(run, kind, content)
+            db.commit()
+            total += len(runs)
+            logger.info(f"Moved {total} job run(s) to the artifact store so far")
+        finally:
+            db.close()
+
+    if vacuum and total:
+        vacuum_database()
+
+    return total
+
+
+def enable_incremental_vacuum() -> bool:
+    """
+    Switch an existing database to incremental auto-vacuum, so the retention compactor returns freed pages.
+    Rewrites the whole file with VACUUM, holding the database lock meanwhile; returns False if already enabled.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            return False
+        conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        # Changing auto_vacuum on an existing database only takes effect after a VACUUM
+        conn.execute(text("VACUUM"))
+    return True
+
+
+def vacuum_database():
+    """Return free pages to the filesystem"""
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    logger.info("Database vacuumed")
+
+
+def main():
+    """Run a migration from the command line."""
+    parser = argparse.ArgumentParser(description="Database data migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    drop_html = subparsers.add_parser("drop-stored-html", help="Remove persisted HTML output from old runs")
+    drop_html.add_argument("--batch-size", type=int, default=500, help="Rows updated per transaction")
+    drop_html.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after dropping HTML")
+
+    move_artifacts = subparsers.add_parser("move-to-artifact-store", help="Move run text from SQLite into the artifact store")
+    move_artifacts.add_argument("--batch-size", type=int, default=100, help="Runs moved per transaction")
+    move_artifacts.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after moving runs")
+
+    subparsers.add_parser(
+        "enable-incremental-vacuum", help="Let the retention compactor return freed pages (one-time full VACUUM)"
+    )
+
+    args = parser.parse_args()
+
+    # Make sure the schema is current before touching data
+    init_db()
+
+    if args.command == "drop-stored-html":
+        count = drop_stored_html(batch_size=args.batch_size, vacuum=not args.no_vacuum)
+        logger.info(f"Dropped stored HTML for {count} job run(s)")
+    elif args.command == "move-to-artifact-store":
+        count = move_to_artifact_store(batch_size=args.batch_size, vacuum=not args.no_vacuum)
+        logger.info(f"Moved {count} job run(s) to the artifact store")
+    elif args.command == "enable-incremental-vacuum":
+        if enable_incremental_vacuum():
+            logger.info("Incremental auto-vacuum enabled")
+        else:
+            logger.info("Incremental auto-vacuum was already enabled")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,126 @@
+"""
+Recovery of runs whose executing process died
+
+A running JobRun whose lease has expired (or that was started before runs had
+leases) has no process left to finish it. Runs from the worker queue are re-queued
+until RUN_MAX_ATTEMPTS, runs with a pending cancel request are marked cancelled and
+anything else is marked failed. The reaper runs periodically
+on the scheduler leader, and once at startup, when runs held by dead processes on
+this host are recovered immediately instead of waiting for their leases to expire.
+"""
+
+import logging
+import os
+import socket
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+from sqlalchemy import or_, update
+
+from database import SessionLocal, JobRun
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.metrics_utils import REGISTRY
+
+# Attempts a queued run gets before a lost worker fails it instead of re-queueing it
+RUN_MAX_ATTEMPTS = int(os.getenv("RUN_MAX_ATTEMPTS", "3"))
+# How often the scheduler leader looks for runs with expired leases
+RUN_REAPER_INTERVAL_SECONDS = int(os.getenv("RUN_REAPER_INTERVAL_SECONDS", "30"))
+
+RUNS_REAPED = REGISTRY.counter(
+    "job_runs_reaped_total", "Running runs recovered after their process stopped heartbeating", ("outcome",)
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _is_dead_local_holder(holder: str) -> bool:
+    """Whether a lease holder named host:pid:token is a process of this host that no longer runs"""
+    parts = holder.split(":")
+    if len(parts) != 3 or parts[0] != socket.gethostname() or not parts[1].isdigit():
+        return False
+    pid = int(parts[1])
+    if pid == os.getpid():
+        # Our pid with another token: an earlier process, e.g. a restarted container's PID 1
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def reap_stale_runs(dead_holders: Iterable[str] = ()) -> dict:
+    """Re-queue, cancel or fail running runs with expired (or no) leases, and those held by the given dead holders"""
+    dead_holders = list(dead_holders)
+    stats = {"requeued": 0, "cancelled": 0, "failed": 0}
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        stale = or_(
+            JobRun.lease_expires_at < now,
+            JobRun.lease_expires_at.is_(None),
+            JobRun.worker_id.in_(dead_holders)
+        )
+        for run in db.query(JobRun).filter(JobRun.status == "running", stale).all():
+            holder = run.worker_id or "an earlier process"
+            if run.cancel_requested_at is not None:
+                outcome = "cancelled"
+                values = {"status": "cancelled", "completed_at": now, "error_message": "Run cancelled"}
+            elif run.queued_at is not None and (run.attempts or 0) < RUN_MAX_ATTEMPTS:
+                outcome = "requeued"
+                # Queue wait starts again now; the dead worker's execution time isn't time in the queue
+                values = {"status": "queued", "worker_id": None, "lease_expires_at": None, "queued_at": now}
+            else:
+                outcome = "failed"
+                values = {
+                    "status": "failed",
+                    "completed_at": now,
+                    "error_message": f"Run abandoned: {holder} stopped before finishing it"
+                    + (f" ({run.attempts} attempts)" if run.queued_at is not None else "")
+                }
+            # Conditional on the lease the run was found with, so a heartbeat that renewed it in between wins
+            result = db.execute(
+                update(JobRun)
+                .where(
+                    JobRun.id == run.id,
+                    JobRun.status == "running",
+                    JobRun.worker_id.is_not_distinct_from(run.worker_id),
+                    JobRun.lease_expires_at.is_not_distinct_from(run.lease_expires_at)
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                continue
+            stats[outcome] += 1
+            RUNS_REAPED.inc(outcome=outcome)
+            logger.warning(f"Run {run.id} of job {run.job_id} held by {holder} was {outcome}")
+        db.commit()
+    except Exception as e:
+        logger.error(f"Reaping stale runs failed: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+    return stats
+
+
+def recover_runs(extra_dead_holders: Iterable[str] = ()) -> dict:
+    """Startup recovery: reap expired runs and, at once, those held by dead processes of this host"""
+    db = SessionLocal()
+    try:
+        holders = {
+            holder for (holder,) in db.query(JobRun.worker_id).filter(
+                JobRun.status == "running", JobRun.worker_id.isnot(None)
+            ).distinct()
+        }
+    finally:
+        db.close()
+    dead = {holder for holder in holders if _is_dead_local_holder(holder)} | set(extra_dead_holders)
+    stats = reap_stale_runs(dead)
+    if any(stats.values()):
+        logger.info(f"Recovered runs left by stopped processes: {stats}")
+    return stats
@@ -0,0 +1,135 @@
+"""
+Retention and compaction of job run history
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, engine, Job, JobRun, RunStage
+import artifact_store
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.logging_utils import LOG_DIR, remove_run_logs
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+# Global defaults, overridden per job (unset means keep forever)
+RETENTION_KEEP_RUNS = _env_int("RETENTION_KEEP_RUNS")
+RETENTION_LOG_DAYS = _env_int("RETENTION_LOG_DAYS")
+RETENTION_DELETE_DAYS = _env_int("RETENTION_DELETE_DAYS")
+
+# How often the compactor runs and how many rows it touches per transaction
+RETENTION_INTERVAL_MINUTES = int(os.getenv("RETENTION_INTERVAL_MINUTES", "60"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "200"))
+
+logger = logging.getLogger(__name__)
+
+# Columns cleared when a run's bodies are stripped
+BODY_VALUES = {
+    JobRun.output_content: None, JobRun.output_ref: None,
+    JobRun.html_output_content: None, JobRun.html_output_ref: None,
+    JobRun.log_content: None, JobRun.log_ref: None,
+    JobRun.profile_content: None, JobRun.profile_ref: None,
+}
+LOG_VALUES = {JobRun.log_content: None, JobRun.log_ref: None}
+
+
+def _policy(job: Job) -> tuple[Optional[int], Optional[int], Optional[int]]:
+    """Return (keep_runs, log_days, delete_days) for a job"""
+    keep_runs = job.retention_keep_runs if job.retention_keep_runs is not None else RETENTION_KEEP_RUNS
+    log_days = job.retention_log_days if job.retention_log_days is not None else RETENTION_LOG_DAYS
+    delete_days = job.retention_delete_days if job.retention_delete_days is not None else RETENTION_DELETE_DAYS
+    return keep_runs, log_days, delete_days
+
+
+def _apply_in_batches(db: Session, filters: list, values: Optional[dict] = None, stats: Optional[dict] = None) -> int:
+    """Update (or delete when values is None) matching runs in small transactions"""
+    total = 0
+    while True:
+        rows = db.query(JobRun.id, JobRun.job_id).filter(*filters).limit(RETENTION_BATCH_SIZE).all()
+        ids = [row.id for row in rows]
+        if not ids:
+            return total
+        query = db.query(JobRun).filter(JobRun.id.in_(ids))
+        if values is None:
+            # Bulk deletes skip the ORM cascade, so remove the runs' stage timings explicitly
+            db.query(RunStage).filter(RunStage.run_id.in_(ids)).delete(synchronize_session=False)
+            query.delete(synchronize_session=False)
+        else:
+            query.update(values, synchronize_session=False)
+        db.commit()
+        total += len(ids)
+        # The script's own log file of a run goes with the run or its stored log
+        if values is None or JobRun.log_content in values:
+            for row in rows:
+                removed = remove_run_logs(LOG_DIR, row.job_id, row.id)
+                if stats is not None:
+                    stats["log_files_deleted"] += removed
+
+
+def compact_job_runs() -> dict:
+    """Apply each job's retention policy, then reclaim freed space"""
+    db = SessionLocal()
+    stats = {"deleted": 0, "bodies_stripped": 0, "logs_stripped": 0, "artifacts_deleted": 0, "log_files_deleted": 0}
+    try:
+        now = datetime.utcnow()
+        # Never touch runs that are still in progress
+        finished = JobRun.completed_at.isnot(None)
+        has_body = (
+            JobRun.output_content.isnot(None) | JobRun.output_ref.isnot(None)
+            | JobRun.html_output_content.isnot(None) | JobRun.html_output_ref.isnot(None)
+            | JobRun.log_content.isnot(None) | JobRun.log_ref.isnot(None)
+            | JobRun.profile_content.isnot(None) | JobRun.profile_ref.isnot(None)
+        )
+        has_log = JobRun.log_content.isnot(None) | JobRun.log_ref.isnot(None)
+
+        for job in db.query(Job).all():
+            keep_runs, log_days, delete_days = _policy(job)
+            same_job = JobRun.job_id == job.id
+
+            if delete_days is not None:
+                cutoff = now - timedelta(days=delete_days)
+                stats["deleted"] += _apply_in_batches(db, [same_job, finished, JobRun.started_at < cutoff], stats=stats)
+
+            if keep_runs is not None:
+                newest = db.query(JobRun.id).filter(same_job).order_by(JobRun.started_at.desc()).limit(keep_runs)
+                stats["bodies_stripped"] += _apply_in_batches(
+                    db, [same_job, finished, has_body, JobRun.id.notin_(newest.scalar_subquery())], BODY_VALUES, stats
+                )
+
+            if log_days is not None:
+                cutoff = now - timedelta(days=log_days)
+                stats["logs_stripped"] += _apply_in_batches(
+                    db, [same_job, finished, has_log, JobRun.started_at < cutoff], LOG_VALUES, stats
+                )
+
+        # Drop artifacts no run refers to any more
+        referenced = set()
+        for row in db.query(JobRun.output_ref, JobRun.html_output_ref, JobRun.log_ref, JobRun.profile_ref).all():
+            referenced.update(ref for ref in row if ref)
+        stats["artifacts_deleted"] = artifact_store.collect_garbage(referenced)
+    except Exception as e:
+        logger.error(f"Job run compaction failed: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+    if stats["deleted"] or stats["bodies_stripped"] or stats["logs_stripped"]:
+        # sqlite3's execute() only steps the pragma once (freeing a single page); executescript runs it to completion
+        raw_conn = engine.raw_connection()
+        try:
+            raw_conn.driver_connection.executescript("PRAGMA incremental_vacuum;")
+        finally:
+            raw_conn.close()
+        logger.info(f"Compacted job runs: {stats}")
+
+    return stats
@@ -0,0 +1,62 @@
+"""
+Cancellation of job runs
+
+A queued run is cancelled at once. A running one is flagged with cancel_requested_at
+and the process executing it (the API process, or a worker in EXECUTION_MODE=worker)
+notices the flag within RUN_CANCEL_POLL_SECONDS, stops the script (SIGTERM, then
+SIGKILL after RUN_STOP_GRACE_SECONDS) and marks the run cancelled. Going through the
+database lets any API node cancel runs executing on any other process.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+
+from database import SessionLocal, JobRun
+
+# Seconds between checks of a running script for a cancel request or an exceeded timeout
+RUN_CANCEL_POLL_SECONDS = float(os.getenv("RUN_CANCEL_POLL_SECONDS", "1"))
+# Seconds a stopped script gets to exit after SIGTERM before it is killed
+RUN_STOP_GRACE_SECONDS = float(os.getenv("RUN_STOP_GRACE_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+def request_cancel(run_id: int) -> Optional[str]:
+    """Cancel a queued run or flag a running one for its process to stop, returning the run status (None if missing)"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        queued = db.execute(
+            update(JobRun)
+            .where(JobRun.id == run_id, JobRun.status == "queued")
+            .values(status="cancelled", completed_at=now, error_message="Run cancelled before it started")
+            .execution_options(synchronize_session=False)
+        )
+        if queued.rowcount == 1:
+            db.commit()
+            logger.info(f"Cancelled queued run {run_id}")
+            return "cancelled"
+        flagged = db.execute(
+            update(JobRun)
+            .where(JobRun.id == run_id, JobRun.status == "running", JobRun.cancel_requested_at.is_(None))
+            .values(cancel_requested_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if flagged.rowcount == 1:
+            logger.info(f"Requested cancellation of running run {run_id}")
+        return db.query(JobRun.status).filter(JobRun.id == run_id).scalar()
+    finally:
+        db.close()
+
+
+def cancel_requested(run_id: int) -> bool:
+    """Whether cancellation of a run has been requested"""
+    db = SessionLocal()
+    try:
+        return db.query(JobRun.cancel_requested_at).filter(JobRun.id == run_id).scalar() is not None
+    finally:
+        db.close()
@@ -0,0 +1,210 @@
+"""
+Run leases and the database-backed queue of job runs for worker processes
+
+Every running JobRun is leased by the process executing it (the API process, or a
+worker in EXECUTION_MODE=worker), which renews the lease with a heartbeat. A run
+whose lease expires has lost its process and is re-queued or failed by the reaper.
+Writes to a run are fenced on the holder and attempt it was started under, so a
+process that lost its lease can't overwrite the attempt that replaced it; the
+heartbeat notices the loss and the script is stopped.
+
+In worker mode, firings and manual triggers insert "queued" runs and workers claim
+them with a single UPDATE ... RETURNING.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, JobRun, RunStage
+
+# "local" runs jobs in the API process, "worker" queues them for worker.py processes
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "local").lower()
+# Runs a worker process executes at once
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+# Seconds an idle worker waits between looking for queued runs
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "1"))
+# Seconds a run stays leased to its process without a heartbeat
+RUN_LEASE_SECONDS = int(os.getenv("RUN_LEASE_SECONDS", "60"))
+
+# Lease holder name of this process, unique even when a restarted container reuses the pid
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+logger = logging.getLogger(__name__)
+
+
+def lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=RUN_LEASE_SECONDS)
+
+
+class RunLease:
+    """The holder and attempt a run is executed under; writes to the run are fenced on both"""
+
+    def __init__(self, run_id: int, holder: Optional[str], attempt: int = 0):
+        self.run_id = run_id
+        self.holder = holder
+        self.attempt = attempt
+        # Set by the heartbeat once the run may belong to another process
+        self.lost = threading.Event()
+
+    def conditions(self) -> tuple:
+        """Conditions matching the run only while it is still this attempt of this holder (unfenced without a holder)"""
+        if self.holder is None:
+            return (JobRun.id == self.run_id,)
+        return (
+            JobRun.id == self.run_id,
+            JobRun.status == "running",
+            JobRun.worker_id == self.holder,
+            func.coalesce(JobRun.attempts, 0) == self.attempt
+        )
+
+    def hold(self, db: Session) -> bool:
+        """
+        Renew the lease in the caller's transaction, returning whether it is still held.
+        The UPDATE takes SQLite's write lock, so the caller's writes that follow can't race the reaper.
+        """
+        if self.holder is None:
+            return True
+        result = db.execute(
+            update(JobRun)
+            .where(*self.conditions())
+            .values(lease_expires_at=lease_expiry(), updated_at=JobRun.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+
+def claim_run(worker_id: str) -> Optional[tuple[RunLease, int, float]]:
+    """
+    Atomically take the oldest queued run, recording how long it waited as its queue_wait
+    stage. Returns (lease, job id, seconds waited), or None when the queue is empty.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        oldest = (
+            select(JobRun.id).where(JobRun.status == "queued")
+            .order_by(JobRun.queued_at).limit(1).scalar_subquery()
+        )
+        row = db.execute(
+            update(JobRun)
+            .where(JobRun.id == oldest, JobRun.status == "queued")
+            .values(
+                status="running",
+                worker_id=worker_id,
+                lease_expires_at=lease_expiry(),
+                started_at=now,
+                attempts=func.coalesce(JobRun.attempts, 0) + 1
+            )
+            .returning(JobRun.id, JobRun.job_id, JobRun.queued_at, JobRun.attempts)
+        ).first()
+        if row is None:
+            db.commit()
+            return None
+        run_id, job_id, queued_at, attempts = row
+        if attempts > 1:
+            # Timings of the attempt whose worker died are superseded by this one
+            db.query(RunStage).filter(RunStage.run_id == run_id).delete(synchronize_session=False)
+        queue_wait = max((now - (queued_at or now)).total_seconds(), 0.0)
+        db.add(RunStage(run_id=run_id, job_id=job_id, stage="queue_wait", position=0, seconds=queue_wait))
+        db.commit()
+        return RunLease(run_id, worker_id, attempts), job_id, queue_wait
+    finally:
+        db.close()
+
+
+def renew_leases(holder: str) -> dict[int, int]:
+    """Extend the leases of every run this holder is executing, returning the attempt of each renewed run by id"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            update(JobRun)
+            .where(JobRun.worker_id == holder, JobRun.status == "running")
+            # Heartbeats aren't changes to the run, so updated_at (the API's ETag watermark) is kept
+            .values(lease_expires_at=lease_expiry(), updated_at=JobRun.updated_at)
+            .returning(JobRun.id, JobRun.attempts)
+        ).all()
+        db.commit()
+        return {run_id: attempts or 0 for run_id, attempts in rows}
+    finally:
+        db.close()
+
+
+def queued_run_count() -> int:
+    """Runs waiting for a worker"""
+    db = SessionLocal()
+    try:
+        return db.query(func.count(JobRun.id)).filter(JobRun.status == "queued").scalar()
+    finally:
+        db.close()
+
+
+class RunHeartbeat:
+    """Background thread renewing the leases of the runs a process is executing, and flagging the ones it lost"""
+
+    def __init__(self, holder: str):
+        self.holder = holder
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._leases: dict[int, RunLease] = {}
+        self._renewed_at = time.monotonic()
+
+    @contextmanager
+    def holding(self, lease: RunLease):
+        """Watch a run's lease while the block executes the run"""
+        with self._lock:
+            self._leases[lease.run_id] = lease
+        try:
+            yield lease
+        finally:
+            with self._lock:
+                self._leases.pop(lease.run_id, None)
+
+    def _lose(self, lease: RunLease, reason: str) -> None:
+        if not lease.lost.is_set():
+            logger.warning(f"Lost the lease of run {lease.run_id} ({reason}), stopping it")
+            lease.lost.set()
+
+    def _renew(self) -> None:
+        started = time.monotonic()
+        # Runs tracked before the renewal were committed under this holder, so each must be renewed
+        with self._lock:
+            leases = list(self._leases.values())
+        try:
+            renewed = renew_leases(self.holder)
+        except Exception as e:
+            logger.warning(f"Failed to renew run leases: {e}")
+            # Stop before the reaper can give the runs away, while a third of the lease is left
+            if started - self._renewed_at >= RUN_LEASE_SECONDS * 2 / 3:
+                for lease in leases:
+                    self._lose(lease, "renewals failed")
+            return
+        self._renewed_at = started
+        for lease in leases:
+            if renewed.get(lease.run_id) != lease.attempt:
+                self._lose(lease, "reaped or claimed again")
+
+    def _run(self) -> None:
+        while not self._stop.wait(RUN_LEASE_SECONDS / 3):
+            self._renew()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._renewed_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="run-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,61 @@
+"""
+Per-stage timings of job runs and their percentiles per job
+"""
+
+import math
+import statistics
+from sqlalchemy.orm import Session
+
+from database import JobRun, RunStage
+
+# Percentiles reported for each stage
+STAGE_PERCENTILES = (50, 90, 99)
+# Position of the first stage the script records (0 is the queue wait recorded before it starts)
+SCRIPT_STAGES_POSITION = 1
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def add_run_stages(run: JobRun, stages: list[tuple[str, float]], first_position: int = 0) -> None:
+    """Attach (stage, seconds) timings to a run, in order (commit is left to the caller)"""
+    for position, (stage, seconds) in enumerate(stages, start=first_position):
+        run.stages.append(RunStage(job_id=run.job_id, stage=stage, position=position, seconds=seconds))
+
+
+def insert_run_stages(db: Session, run_id: int, job_id: int, stages: list[tuple[str, float]],
+                      first_position: int = SCRIPT_STAGES_POSITION) -> None:
+    """Insert (stage, seconds) timings of a run by id, without loading the run (commit is left to the caller)"""
+    db.add_all(
+        RunStage(run_id=run_id, job_id=job_id, stage=stage, position=position, seconds=seconds)
+        for position, (stage, seconds) in enumerate(stages, start=first_position)
+    )
+
+
+def stage_percentiles(db: Session, job_id: int, runs: int) -> list[dict]:
+    """Duration percentiles of each stage over a job's most recent runs, in run order"""
+    recent = (
+        db.query(JobRun.id).filter(JobRun.job_id == job_id)
+        .order_by(JobRun.started_at.desc()).limit(runs).scalar_subquery()
+    )
+    samples = {}
+    positions = {}
+    for stage, position, seconds in db.query(RunStage.stage, RunStage.position, RunStage.seconds).filter(
+        RunStage.job_id == job_id, RunStage.run_id.in_(recent)
+    ):
+        samples.setdefault(stage, []).append(seconds)
+        positions[stage] = min(position, positions.get(stage, position))
+
+    results = []
+    for stage in sorted(samples, key=lambda name: positions[name]):
+        ordered = sorted(samples[stage])
+        results.append({
+            "stage": stage,
+            "count": len(ordered),
+            **{f"p{pct}_ms": round(_percentile(ordered, pct) * 1000, 1) for pct in STAGE_PERCENTILES},
+            "mean_ms": round(statistics.mean(ordered) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        })
+    return results
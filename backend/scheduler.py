@@ -2,15 +2,36 @@
 APScheduler wrapper for executing scheduled jobs
 """
 
+import asyncio
+import os
 import subprocess
 import sys
 import logging
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database import Job, JobRun, get_db
+from database import Job, JobRun, get_db, engine, STORE_HTML_OUTPUT
+from run_stages import add_run_stages
+from artifact_store import save_run_text, has_run_text
+from retention import compact_job_runs, RETENTION_INTERVAL_MINUTES
+from cron_parser import build_cron_trigger, get_timezone
+from leader_election import LeaderElection
+from run_queue import EXECUTION_MODE, PROCESS_ID, RunHeartbeat, RunLease, lease_expiry, queued_run_count
+from reaper import RUN_REAPER_INTERVAL_SECONDS, reap_stale_runs, recover_runs
+from run_cancellation import RUN_CANCEL_POLL_SECONDS, RUN_STOP_GRACE_SECONDS, cancel_requested
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent.parent.absolute()
@@ -19,13 +40,157 @@ RUN_SCRIPT = SCRIPT_DIR / "run_ai_script.py"
 # Import markdown to HTML converter
 sys.path.insert(0, str(SCRIPT_DIR))
 from utils.markdown_utils import markdown_to_html
+from utils.logging_utils import log_context
+from utils.metrics_utils import REGISTRY, SLOW_BUCKETS, METRICS_FILE_ENV, merge_metrics_file
+from utils.profiling_utils import SPAWNED_AT_ENV
+from utils.process_utils import PARENT_PID_ENV
+from utils.tracing_utils import TRACE_SPANS_FILE_ENV, merge_trace_spans_file, set_span_attributes, set_span_error, span, trace_env
+
+# "background" runs jobs in a thread pool, "asyncio" runs them on the FastAPI event loop
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "background").lower()
+# Default maximum run time of a job script (seconds); jobs can set their own timeout_seconds
+JOB_TIMEOUT_SECONDS = int(os.getenv("JOB_TIMEOUT_SECONDS", "3600"))
+
+# Default random delay (seconds) added to each firing to spread jobs sharing a start time
+SCHEDULER_JITTER_SECONDS = int(os.getenv("SCHEDULER_JITTER_SECONDS", "0"))
+
+# Firings missed while the server was down still run if they are at most this late (seconds)
+SCHEDULER_MISFIRE_GRACE_TIME = int(os.getenv("SCHEDULER_MISFIRE_GRACE_TIME", "3600"))
+# Collapse several missed firings of a job into a single run
+SCHEDULER_COALESCE = os.getenv("SCHEDULER_COALESCE", "true").lower() == "true"
 
 logger = logging.getLogger(__name__)
-scheduler = BackgroundScheduler()
+
+JOB_RUN_SECONDS = REGISTRY.histogram(
+    "job_run_duration_seconds", "Job script run time", ("job_id", "status"), SLOW_BUCKETS
+)
+JOB_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "job_queue_wait_seconds", "Delay between a scheduled firing and the start of its run", ("job_id",),
+    (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+JOB_RUNS_DEDUPLICATED = REGISTRY.counter(
+    "job_runs_deduplicated_total", "Submissions answered with the existing run of their idempotency key"
+)
+
+
+class _ScheduledJob:
+    """Job proxy that also passes the firing's scheduled time to the job function"""
+
+    def __init__(self, job, scheduled_time: datetime):
+        self._job = job
+        self.kwargs = {**job.kwargs, "scheduled_time": scheduled_time}
+
+    def __getattr__(self, name):
+        return getattr(self._job, name)
+
+    def __str__(self):
+        return str(self._job)
+
+
+class _QueueWaitMixin:
+    """Executor mixin handing job functions their scheduled time, so queue wait can be measured"""
+
+    def _do_submit_job(self, job, run_times):
+        if job.id.startswith("job_"):
+            job = _ScheduledJob(job, run_times[-1])
+        super()._do_submit_job(job, run_times)
+
+
+class QueueWaitThreadPoolExecutor(_QueueWaitMixin, ThreadPoolExecutor):
+    pass
+
+
+class QueueWaitAsyncIOExecutor(_QueueWaitMixin, AsyncIOExecutor):
+    pass
+
+
+def _create_scheduler():
+    """Create the scheduler for the configured SCHEDULER_MODE"""
+    options = {
+        # Scheduled triggers are persisted in the application database so missed firings survive restarts
+        "jobstores": {"default": SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs")},
+        "job_defaults": {
+            "misfire_grace_time": SCHEDULER_MISFIRE_GRACE_TIME,
+            "coalesce": SCHEDULER_COALESCE,
+            "max_instances": 1
+        }
+    }
+    if SCHEDULER_MODE == "asyncio":
+        # Binds to the running loop when started from the FastAPI lifespan
+        return AsyncIOScheduler(executors={"default": QueueWaitAsyncIOExecutor()}, **options)
+    return BackgroundScheduler(executors={"default": QueueWaitThreadPoolExecutor()}, **options)
+
+
+scheduler = _create_scheduler()
+
+
+def _on_elected():
+    """Fire schedules (including firings missed during the handover) once this node leads"""
+    scheduler.resume()
+
+
+def _on_lost():
+    scheduler.pause()
+
+
+# Every node keeps its scheduler paused and only the lease holder fires schedules.
+# Renewals wake the leader so jobs added through other nodes' APIs are picked up.
+election = LeaderElection("scheduler", on_elected=_on_elected, on_lost=_on_lost, on_renewed=lambda: scheduler.wakeup())
+
+# Keeps the leases of runs executing in this process alive, so the reaper can tell them from orphans
+run_heartbeat = RunHeartbeat(PROCESS_ID)
+
+# Concurrent executions in this process, to show the effect of jitter on start-time spikes
+_executions_lock = threading.Lock()
+_running_executions = 0
+_peak_running_executions = 0
+
+
+@contextmanager
+def _track_execution():
+    """Count a job execution as running for the duration of the block"""
+    global _running_executions, _peak_running_executions
+    with _executions_lock:
+        _running_executions += 1
+        _peak_running_executions = max(_peak_running_executions, _running_executions)
+    try:
+        yield
+    finally:
+        with _executions_lock:
+            _running_executions -= 1
+
+
+REGISTRY.gauge_function("scheduler_running_executions", "Job scripts currently running", lambda: _running_executions)
+REGISTRY.gauge_function("scheduler_peak_concurrency", "Most job scripts running at once", lambda: _peak_running_executions)
+REGISTRY.gauge_function("scheduler_jobs", "Jobs in the scheduler", lambda: len(scheduler.get_jobs()))
+REGISTRY.gauge_function("scheduler_is_leader", "Whether this node fires schedules", lambda: int(election.is_leader))
+REGISTRY.gauge_function("job_queue_depth", "Runs waiting for a worker", queued_run_count)
+
+
+def firing_key(job_id: int, scheduled_time: datetime) -> str:
+    """Idempotency key of a scheduled firing, the same on every node and on replays of the firing"""
+    return f"schedule:{job_id}:{scheduled_time.astimezone(timezone.utc).isoformat()}"
+
+
+def request_key(job_id: int, key: str) -> str:
+    """Idempotency key of a manual run submitted with an Idempotency-Key header"""
+    return f"api:{job_id}:{key}"
 
 
-def execute_job(job_id: int):
-    """Execute a job by running run_ai_script.py"""
+def _existing_run(db: Session, idempotency_key: str) -> Optional[int]:
+    run_id = db.query(JobRun.id).filter(JobRun.idempotency_key == idempotency_key).scalar()
+    if run_id is not None:
+        JOB_RUNS_DEDUPLICATED.inc()
+        logger.info(f"Run {run_id} already exists for submission {idempotency_key}, not starting another")
+    return run_id
+
+
+def _create_run(job_id: int, queue_wait: Optional[float] = None, status: str = "running",
+                idempotency_key: Optional[str] = None) -> tuple[Optional[int], bool]:
+    """
+    Create the JobRun record for a job (with its queue wait stage, if scheduled).
+    Returns (run id, whether it was created); a key that was already submitted returns its existing run.
+    """
     # Get a new database session for this job execution
     db = next(get_db())
     
@@ -33,90 +198,445 @@ def execute_job(job_id: int):
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
             logger.error(f"Job {job_id} not found")
-            return
+            return None, False
+        if idempotency_key is not None:
+            existing = _existing_run(db, idempotency_key)
+            if existing is not None:
+                return existing, False
         
         # Create job run record
+        now = datetime.utcnow()
         job_run = JobRun(
             job_id=job_id,
-            status="running",
-            started_at=datetime.utcnow()
+            status=status,
+            started_at=now,
+            queued_at=now if status == "queued" else None,
+            idempotency_key=idempotency_key
         )
+        if status == "running":
+            job_run.worker_id = PROCESS_ID
+            job_run.lease_expires_at = lease_expiry()
+        if queue_wait is not None:
+            add_run_stages(job_run, [("queue_wait", queue_wait)])
         db.add(job_run)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # The same submission was inserted concurrently (by another request or node); the unique key kept one
+            db.rollback()
+            existing = _existing_run(db, idempotency_key) if idempotency_key is not None else None
+            if existing is None:
+                raise
+            return existing, False
         db.refresh(job_run)
         
-        logger.info(f"Starting execution of job {job_id} ({job.name})")
+        if status == "queued":
+            logger.info(f"Queued run {job_run.id} of job {job_id} ({job.name}) for a worker")
+        else:
+            logger.info(f"Starting execution of job {job_id} ({job.name})")
+        return job_run.id, True
+    finally:
+        db.close()
+
+
+def _script_command(job_id: int, lease: RunLease) -> list[str]:
+    """Command line that runs a job and records it on the given JobRun, fenced on its lease (no file system operations needed)"""
+    return [
+        sys.executable, str(RUN_SCRIPT), "--job-id", str(job_id), "--run-id", str(lease.run_id),
+        "--lease-holder", lease.holder, "--attempt", str(lease.attempt)
+    ]
+
+
+def _telemetry_file(run_id: int, kind: str) -> str:
+    """File the script process writes its metrics or trace spans to"""
+    return os.path.join(tempfile.gettempdir(), f"job-run-{run_id}-{kind}.json")
+
+
+def _script_env(run_id: int) -> dict:
+    """Environment for the script process: trace context, telemetry files and the pid it must not outlive"""
+    return {
+        **os.environ,
+        **trace_env(),
+        METRICS_FILE_ENV: _telemetry_file(run_id, "metrics"),
+        TRACE_SPANS_FILE_ENV: _telemetry_file(run_id, "spans"),
+        # Lets the script time its own start-up
+        SPAWNED_AT_ENV: repr(time.time()),
+        PARENT_PID_ENV: str(os.getpid()),
+    }
+
+
+def _collect_script_telemetry(run_id: int):
+    """Merge the metrics and spans recorded by a finished script process"""
+    merge_metrics_file(_telemetry_file(run_id, "metrics"))
+    merge_trace_spans_file(_telemetry_file(run_id, "spans"))
+
+
+def _observe_queue_wait(job_id: int, scheduled_time: Optional[datetime]) -> Optional[float]:
+    """Record how late a scheduled firing started, returning the wait in seconds"""
+    if scheduled_time is None:
+        return None
+    wait = max((datetime.now(timezone.utc) - scheduled_time).total_seconds(), 0.0)
+    JOB_QUEUE_WAIT_SECONDS.observe(wait, job_id=job_id)
+    return wait
+
+
+def _may_fire(job_id: int, scheduled_time: Optional[datetime]) -> bool:
+    """Scheduled firings only run while this node's lease is valid (manual runs always do)"""
+    if scheduled_time is None or election.is_leader:
+        return True
+    logger.warning(f"Skipping firing of job {job_id}: node {election.node_id} no longer holds the scheduler lease")
+    return False
+
+
+def _lost_run(lease: RunLease, job_id: int) -> None:
+    logger.warning(f"Run {lease.run_id} of job {job_id} is no longer held by {lease.holder}, discarding its result")
+
+
+def _complete_run(lease: RunLease, job_id: int, returncode: int, stdout: str, stderr: str) -> bool:
+    """Record the result of the script process on its JobRun, returning False if the run's lease was lost"""
+    db = next(get_db())
+    
+    try:
+        # Writes only while this attempt holds the run; the reaper may have re-queued or failed it
+        if not lease.hold(db):
+            db.rollback()
+            _lost_run(lease, job_id)
+            return False
+        # Fresh session, so this includes the output that was saved by the script
+        job_run = db.query(JobRun).filter(JobRun.id == lease.run_id).first()
         
-        try:
-            # Execute the script with job_id (no file system operations needed)
-            result = subprocess.run(
-                [sys.executable, str(RUN_SCRIPT), "--job-id", str(job_id)],
-                capture_output=True,
-                text=True,
-                cwd=str(SCRIPT_DIR),
-                timeout=3600  # 1 hour timeout
-            )
-            
-            # Capture logs (stdout contains log messages)
-            log_content = result.stderr + "\n" + result.stdout
-            
-            # Read output from database (script saves it there)
-            output_content = None
-            html_output_content = None
-            
-            if result.returncode == 0:
-                # Refresh job_run to get the output that was saved by the script
-                db.refresh(job_run)
-                output_content = job_run.output_content
-                html_output_content = job_run.html_output_content
-                
-                if output_content:
-                    logger.info(f"Retrieved output from database ({len(output_content)} characters)")
-                else:
-                    logger.warning("No output content found in database, using stdout as fallback")
-                    output_content = result.stdout
+        # Capture logs (stdout contains log messages)
+        log_content = stderr + "\n" + stdout
+        
+        # Read output from database (script saves it there)
+        output_content = None
+        
+        if returncode == 0:
+            if has_run_text(job_run, "output"):
+                logger.info("Retrieved output saved by the script")
             else:
-                # On failure, use stdout as output
-                output_content = result.stdout
-            
-            # Update job run (output_content and html_output_content already saved by script)
-            job_run.status = "success" if result.returncode == 0 else "failed"
-            # Only update output if script didn't save it (for error cases)
-            if not job_run.output_content:
-                job_run.output_content = output_content
-            if not job_run.html_output_content and output_content:
+                logger.warning("No output content found in database, using stdout as fallback")
+                output_content = stdout
+        else:
+            # On failure, use stdout as output
+            output_content = stdout
+        
+        # Update job run (output already saved by script)
+        job_run.status = "success" if returncode == 0 else "failed"
+        # Only update output if script didn't save it (for error cases)
+        if not has_run_text(job_run, "output"):
+            save_run_text(job_run, "output", output_content)
+            if STORE_HTML_OUTPUT and output_content:
                 # Try to convert if HTML wasn't saved
                 try:
-                    job_run.html_output_content = markdown_to_html(output_content)
+                    save_run_text(job_run, "html", markdown_to_html(output_content))
                 except Exception as e:
                     logger.warning(f"Failed to convert output to HTML: {e}")
-            job_run.log_content = log_content
-            job_run.completed_at = datetime.utcnow()
-            
-            if result.returncode != 0:
-                job_run.error_message = f"Script exited with code {result.returncode}"
-                logger.error(f"Job {job_id} failed: {job_run.error_message}")
-            else:
-                logger.info(f"Job {job_id} completed successfully")
-            
-        except subprocess.TimeoutExpired:
-            job_run.status = "failed"
-            job_run.error_message = "Job execution timed out after 1 hour"
-            job_run.completed_at = datetime.utcnow()
-            logger.error(f"Job {job_id} timed out")
+        save_run_text(job_run, "log", log_content)
+        job_run.completed_at = datetime.utcnow()
         
-        except Exception as e:
-            job_run.status = "failed"
-            job_run.error_message = str(e)
-            job_run.completed_at = datetime.utcnow()
-            logger.error(f"Job {job_id} failed with exception: {e}", exc_info=True)
+        if returncode != 0:
+            job_run.error_message = f"Script exited with code {returncode}"
+            logger.error(f"Job {job_id} failed: {job_run.error_message}")
+        else:
+            logger.info(f"Job {job_id} completed successfully")
         
-        finally:
-            db.commit()
+        db.commit()
+        return True
     finally:
         db.close()
 
 
+def _fail_run(lease: RunLease, job_id: int, error_message: str, status: str = "failed",
+              log_content: Optional[str] = None) -> bool:
+    """Mark a JobRun as failed (or cancelled), keeping the log of a script that was stopped; False if its lease was lost"""
+    db = next(get_db())
+    
+    try:
+        if not lease.hold(db):
+            db.rollback()
+            _lost_run(lease, job_id)
+            return False
+        job_run = db.query(JobRun).filter(JobRun.id == lease.run_id).first()
+        job_run.status = status
+        job_run.error_message = error_message
+        job_run.completed_at = datetime.utcnow()
+        if log_content is not None:
+            save_run_text(job_run, "log", log_content)
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def _job_timeout(job_id: int) -> int:
+    """Maximum run time of a job's script in seconds"""
+    db = next(get_db())
+    try:
+        timeout = db.query(Job.timeout_seconds).filter(Job.id == job_id).scalar()
+        return timeout if timeout is not None else JOB_TIMEOUT_SECONDS
+    finally:
+        db.close()
+
+
+def _stop_reason(lease: RunLease, deadline: float) -> Optional[str]:
+    """Why a running script must be stopped now ("lost", "timeout" or "cancelled"), if at all"""
+    if lease.lost.is_set():
+        return "lost"
+    if time.monotonic() >= deadline:
+        return "timeout"
+    if cancel_requested(lease.run_id):
+        return "cancelled"
+    return None
+
+
+def _record_stopped_run(lease: RunLease, job_id: int, reason: str, timeout: int, log_content: str) -> str:
+    """Record a script stopped for a lost lease, a timeout or a cancel request, returning the run status"""
+    if reason == "lost":
+        # The run now belongs to the reaper or another attempt, which records it
+        _lost_run(lease, job_id)
+        return "lost"
+    if reason == "cancelled":
+        if not _fail_run(lease, job_id, "Run cancelled", status="cancelled", log_content=log_content):
+            return "lost"
+        logger.info(f"Job {job_id} run {lease.run_id} cancelled")
+        return "cancelled"
+    if not _fail_run(lease, job_id, f"Job execution timed out after {timeout} seconds", log_content=log_content):
+        return "lost"
+    logger.error(f"Job {job_id} timed out")
+    return "timeout"
+
+
+def _submission_key(job_id: int, scheduled_time: Optional[datetime], idempotency_key: Optional[str]) -> Optional[str]:
+    """Dedupe key of a submission: the caller's key, else the firing's key for scheduled runs"""
+    if idempotency_key is None and scheduled_time is not None:
+        return firing_key(job_id, scheduled_time)
+    return idempotency_key
+
+
+def execute_job(job_id: int, scheduled_time: Optional[datetime] = None,
+                idempotency_key: Optional[str] = None) -> Optional[int]:
+    """Execute a job by running run_ai_script.py, returning the JobRun id (the existing one for a duplicate submission)"""
+    if not _may_fire(job_id, scheduled_time):
+        return None
+    queue_wait = _observe_queue_wait(job_id, scheduled_time)
+    with log_context(job_id=job_id), span("execute_job", {"job.id": job_id}):
+        with span("create_run"):
+            run_id, created = _create_run(
+                job_id, queue_wait, idempotency_key=_submission_key(job_id, scheduled_time, idempotency_key)
+            )
+        if run_id is None or not created:
+            return run_id
+        set_span_attributes({"job.run_id": run_id})
+        started = time.perf_counter()
+        lease = RunLease(run_id, PROCESS_ID)
+        with log_context(run_id=run_id), run_heartbeat.holding(lease):
+            status = _run_script(job_id, lease)
+        set_span_attributes({"job.status": status})
+        if status != "success":
+            set_span_error(f"Job run {status}")
+        JOB_RUN_SECONDS.observe(time.perf_counter() - started, job_id=job_id, status=status)
+        return run_id
+
+
+def _stop_process(process: subprocess.Popen) -> tuple[str, str]:
+    """Ask a script process to stop, killing it after the grace period, and return its output"""
+    process.terminate()
+    try:
+        return process.communicate(timeout=RUN_STOP_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return process.communicate()
+
+
+def _run_script(job_id: int, lease: RunLease) -> str:
+    """Run the script process for a JobRun and record the result, returning the run status"""
+    run_id = lease.run_id
+    process = None
+    try:
+        timeout = _job_timeout(job_id)
+        deadline = time.monotonic() + timeout
+        stopped = None
+        with _track_execution(), span("script_process"):
+            process = subprocess.Popen(
+                _script_command(job_id, lease),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=str(SCRIPT_DIR),
+                env=_script_env(run_id)
+            )
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=RUN_CANCEL_POLL_SECONDS)
+                    break
+                except subprocess.TimeoutExpired:
+                    stopped = _stop_reason(lease, deadline)
+                    if stopped:
+                        stdout, stderr = _stop_process(process)
+                        break
+        if stopped:
+            return _record_stopped_run(lease, job_id, stopped, timeout, stderr + "\n" + stdout)
+        with span("complete_run"):
+            if not _complete_run(lease, job_id, process.returncode, stdout, stderr):
+                return "lost"
+        return "success" if process.returncode == 0 else "failed"
+    
+    except Exception as e:
+        if process is not None and process.poll() is None:
+            process.kill()
+        _fail_run(lease, job_id, str(e))
+        logger.error(f"Job {job_id} failed with exception: {e}", exc_info=True)
+        return "error"
+    
+    finally:
+        _collect_script_telemetry(run_id)
+
+
+async def execute_job_async(job_id: int, scheduled_time: Optional[datetime] = None,
+                            idempotency_key: Optional[str] = None) -> Optional[int]:
+    """
+    Execute a job on the event loop, returning the JobRun id (the existing one for a duplicate submission).
+    The script process is awaited without holding a thread; only the short DB writes use one.
+    """
+    if not _may_fire(job_id, scheduled_time):
+        return None
+    queue_wait = _observe_queue_wait(job_id, scheduled_time)
+    with log_context(job_id=job_id), span("execute_job", {"job.id": job_id}):
+        with span("create_run"):
+            run_id, created = await asyncio.to_thread(
+                _create_run, job_id, queue_wait, idempotency_key=_submission_key(job_id, scheduled_time, idempotency_key)
+            )
+        if run_id is None or not created:
+            return run_id
+        set_span_attributes({"job.run_id": run_id})
+        started = time.perf_counter()
+        lease = RunLease(run_id, PROCESS_ID)
+        with log_context(run_id=run_id), run_heartbeat.holding(lease):
+            status = await _run_script_async(job_id, lease)
+        set_span_attributes({"job.status": status})
+        if status != "success":
+            set_span_error(f"Job run {status}")
+        JOB_RUN_SECONDS.observe(time.perf_counter() - started, job_id=job_id, status=status)
+        return run_id
+
+
+async def _stop_process_async(process: asyncio.subprocess.Process, communicate: asyncio.Future):
+    """Ask a script process to stop, killing it after the grace period"""
+    process.terminate()
+    try:
+        await asyncio.wait_for(asyncio.shield(communicate), timeout=RUN_STOP_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await communicate
+
+
+async def _run_script_async(job_id: int, lease: RunLease) -> str:
+    """Run the script process for a JobRun on the event loop and record the result, returning the run status"""
+    run_id = lease.run_id
+    process = None
+    try:
+        timeout = await asyncio.to_thread(_job_timeout, job_id)
+        deadline = time.monotonic() + timeout
+        stopped = None
+        with _track_execution(), span("script_process"):
+            process = await asyncio.create_subprocess_exec(
+                *_script_command(job_id, lease),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(SCRIPT_DIR),
+                env=_script_env(run_id)
+            )
+            communicate = asyncio.ensure_future(process.communicate())
+            while not (await asyncio.wait({communicate}, timeout=RUN_CANCEL_POLL_SECONDS))[0]:
+                stopped = await asyncio.to_thread(_stop_reason, lease, deadline)
+                if stopped:
+                    await _stop_process_async(process, communicate)
+                    break
+            stdout, stderr = (data.decode("utf-8", errors="replace") for data in communicate.result())
+        if stopped:
+            return await asyncio.to_thread(_record_stopped_run, lease, job_id, stopped, timeout, stderr + "\n" + stdout)
+        with span("complete_run"):
+            if not await asyncio.to_thread(_complete_run, lease, job_id, process.returncode, stdout, stderr):
+                return "lost"
+        return "success" if process.returncode == 0 else "failed"
+    
+    except asyncio.CancelledError:
+        # The task was cancelled (e.g. on shutdown): don't leave the script running without a supervisor
+        if process is not None and process.returncode is None:
+            process.kill()
+        raise
+    
+    except Exception as e:
+        if process is not None and process.returncode is None:
+            process.kill()
+        await asyncio.to_thread(_fail_run, lease, job_id, str(e))
+        logger.error(f"Job {job_id} failed with exception: {e}", exc_info=True)
+        return "error"
+    
+    finally:
+        _collect_script_telemetry(run_id)
+
+
+def enqueue_job(job_id: int, scheduled_time: Optional[datetime] = None,
+                idempotency_key: Optional[str] = None) -> Optional[int]:
+    """Queue a run of a job for a worker process (EXECUTION_MODE=worker), returning the JobRun id"""
+    if not _may_fire(job_id, scheduled_time):
+        return None
+    _observe_queue_wait(job_id, scheduled_time)
+    with log_context(job_id=job_id), span("enqueue_job", {"job.id": job_id}):
+        run_id, _ = _create_run(
+            job_id, status="queued", idempotency_key=_submission_key(job_id, scheduled_time, idempotency_key)
+        )
+        return run_id
+
+
+def execute_claimed_run(job_id: int, lease: RunLease, queue_wait: float) -> str:
+    """Execute a run a worker claimed from the queue, returning the run status"""
+    run_id = lease.run_id
+    with log_context(job_id=job_id, run_id=run_id), span("execute_job", {"job.id": job_id, "job.run_id": run_id}):
+        logger.info(f"Starting execution of job {job_id} (run {run_id}) after {queue_wait:.1f}s in the queue")
+        
+        started = time.perf_counter()
+        status = _run_script(job_id, lease)
+        set_span_attributes({"job.status": status})
+        if status != "success":
+            set_span_error(f"Job run {status}")
+        JOB_RUN_SECONDS.observe(time.perf_counter() - started, job_id=job_id, status=status)
+        return status
+
+
+async def run_job_now(job_id: int, idempotency_key: Optional[str] = None) -> Optional[int]:
+    """
+    Run (or in worker mode, queue) a job without blocking the event loop, returning the JobRun id.
+    A repeated idempotency key returns the run it created instead of starting another.
+    """
+    key = request_key(job_id, idempotency_key) if idempotency_key else None
+    if EXECUTION_MODE == "worker":
+        return await asyncio.to_thread(enqueue_job, job_id, idempotency_key=key)
+    if SCHEDULER_MODE == "asyncio":
+        return await execute_job_async(job_id, idempotency_key=key)
+    return await asyncio.to_thread(execute_job, job_id, idempotency_key=key)
+
+
+# Function the scheduler invokes for each firing
+if EXECUTION_MODE == "worker":
+    JOB_FUNCTION = enqueue_job
+else:
+    JOB_FUNCTION = execute_job_async if SCHEDULER_MODE == "asyncio" else execute_job
+
+
+def build_trigger(job: Job) -> CronTrigger:
+    """Build the APScheduler trigger for a job's cron expression in the job's timezone"""
+    jitter = job.jitter_seconds if job.jitter_seconds is not None else SCHEDULER_JITTER_SECONDS
+    return build_cron_trigger(job.cron_expression, job.timezone, jitter)
+
+
+def _trigger_fingerprint(trigger) -> str:
+    """Comparable description of a trigger (fields, timezone and jitter)"""
+    return f"{trigger!r} jitter={getattr(trigger, 'jitter', None)}"
+
+
 def add_job_to_scheduler(job: Job, db: Session):
     """Add a job to the scheduler"""
     if not job.enabled:
@@ -124,28 +644,15 @@ def add_job_to_scheduler(job: Job, db: Session):
         return
     
     try:
-        # Parse cron expression
-        parts = job.cron_expression.strip().split()
-        if len(parts) != 5:
-            raise ValueError(f"Invalid cron expression: {job.cron_expression}")
-        
-        minute, hour, day, month, day_of_week = parts
-        
         # Add job to scheduler
         scheduler.add_job(
-            execute_job,
-            trigger=CronTrigger(
-                minute=minute,
-                hour=hour,
-                day=day,
-                month=month,
-                day_of_week=day_of_week
-            ),
+            JOB_FUNCTION,
+            trigger=build_trigger(job),
             id=f"job_{job.id}",
             args=[job.id],
             replace_existing=True
         )
-        logger.info(f"Added job {job.id} ({job.name}) to scheduler with cron: {job.cron_expression}")
+        logger.info(f"Added job {job.id} ({job.name}) to scheduler with cron: {job.cron_expression} ({get_timezone(job.timezone)})")
     
     except Exception as e:
         logger.error(f"Failed to add job {job.id} to scheduler: {e}", exc_info=True)
@@ -167,25 +674,72 @@ def update_job_in_scheduler(job: Job, db: Session):
         add_job_to_scheduler(job, db)
 
 
+def sync_scheduler_jobs(db: Session):
+    """
+    Reconcile the persistent scheduler store with the jobs table.
+    Unchanged jobs are left alone so their pending (possibly missed) firings are kept.
+    """
+    expected = {f"job_{job.id}": job for job in db.query(Job).filter(Job.enabled == True).all()}
+    added = removed = 0
+    
+    for scheduled_job in scheduler.get_jobs():
+        if scheduled_job.id.startswith("job_") and scheduled_job.id not in expected:
+            scheduler.remove_job(scheduled_job.id)
+            removed += 1
+    
+    for scheduled_id, job in expected.items():
+        scheduled_job = scheduler.get_job(scheduled_id)
+        if scheduled_job is not None and scheduled_job.func is JOB_FUNCTION:
+            try:
+                if _trigger_fingerprint(scheduled_job.trigger) == _trigger_fingerprint(build_trigger(job)):
+                    continue
+            except ValueError:
+                pass
+        add_job_to_scheduler(job, db)
+        added += 1
+    
+    logger.info(f"Scheduler store reconciled: {len(expected)} enabled job(s), {added} added or updated, {removed} removed")
+
+
 def start_scheduler(db: Session):
-    """Start the scheduler and load all enabled jobs"""
+    """Start the scheduler and reconcile it with all enabled jobs"""
     if scheduler.running:
         logger.warning("Scheduler is already running")
         return
     
-    scheduler.start()
-    logger.info("Scheduler started")
+    # Runs left "running" by a previous process are failed (or re-queued) before anything new starts
+    recover_runs()
+    run_heartbeat.start()
     
-    # Load all enabled jobs
-    jobs = db.query(Job).filter(Job.enabled == True).all()
-    for job in jobs:
-        add_job_to_scheduler(job, db)
+    # Start paused so stale entries can't fire before reconciliation; the elected leader resumes it
+    scheduler.start(paused=True)
+    sync_scheduler_jobs(db)
+    election.start()
+    logger.info(f"Scheduler started ({'leader' if election.is_leader else 'follower'})")
+    
+    # Periodically apply run retention policies in the background
+    scheduler.add_job(
+        compact_job_runs,
+        trigger=IntervalTrigger(minutes=RETENTION_INTERVAL_MINUTES),
+        id="retention_compactor",
+        replace_existing=True
+    )
+    
+    # Recover runs whose process stopped heartbeating (on the leader only, like every scheduled task)
+    scheduler.add_job(
+        reap_stale_runs,
+        trigger=IntervalTrigger(seconds=RUN_REAPER_INTERVAL_SECONDS),
+        id="run_reaper",
+        replace_existing=True
+    )
 
 
 def stop_scheduler():
     """Stop the scheduler"""
     if scheduler.running:
+        election.stop()
         scheduler.shutdown()
+        run_heartbeat.stop()
         logger.info("Scheduler stopped")
     else:
         logger.warning("Scheduler is not running")
@@ -195,5 +749,9 @@ def get_scheduler_status():
     """Get scheduler status"""
     return {
         "running": scheduler.running,
-        "jobs_count": len(scheduler.get_jobs())
+        "leader": election.is_leader,
+        "node_id": election.node_id,
+        "jobs_count": len(scheduler.get_jobs()),
+        "running_executions": _running_executions,
+        "peak_concurrency": _peak_running_executions
     }
@@ -2,7 +2,7 @@
 Pydantic schemas for API requests and responses
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 
@@ -13,6 +13,14 @@ class JobCreate(BaseModel):
     cron_expression: str
     enabled: bool = True
     email_recipients: Optional[List[str]] = None
+    # Retention (None falls back to the global RETENTION_* defaults)
+    retention_keep_runs: Optional[int] = Field(None, ge=0)  # Newest runs keeping full output and logs
+    retention_log_days: Optional[int] = Field(None, ge=0)  # Strip logs from runs older than this
+    retention_delete_days: Optional[int] = Field(None, ge=0)  # Delete runs older than this
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=3600)  # Random start delay (None uses the global default)
+    timezone: Optional[str] = Field(None, max_length=64)  # IANA zone such as "Europe/London" (None uses the global default)
+    profile_mode: Optional[str] = Field(None, pattern=r"^(timers|cprofile|pyinstrument)$")  # Profile runs (None disables profiling)
+    timeout_seconds: Optional[int] = Field(None, ge=1, le=86400)  # Maximum run time (None uses JOB_TIMEOUT_SECONDS)
 
 
 class JobUpdate(BaseModel):
@@ -21,6 +29,14 @@ class JobUpdate(BaseModel):
     cron_expression: Optional[str] = None
     enabled: Optional[bool] = None
     email_recipients: Optional[List[str]] = None
+    # Retention (None falls back to the global RETENTION_* defaults)
+    retention_keep_runs: Optional[int] = Field(None, ge=0)  # Newest runs keeping full output and logs
+    retention_log_days: Optional[int] = Field(None, ge=0)  # Strip logs from runs older than this
+    retention_delete_days: Optional[int] = Field(None, ge=0)  # Delete runs older than this
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=3600)  # Random start delay (None uses the global default)
+    timezone: Optional[str] = Field(None, max_length=64)  # IANA zone such as "Europe/London" (None uses the global default)
+    profile_mode: Optional[str] = Field(None, pattern=r"^(timers|cprofile|pyinstrument)$")  # Profile runs (None disables profiling)
+    timeout_seconds: Optional[int] = Field(None, ge=1, le=86400)  # Maximum run time (None uses JOB_TIMEOUT_SECONDS)
 
 
 class JobResponse(BaseModel):
@@ -34,11 +50,23 @@ class JobResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     is_running: Optional[bool] = False  # Whether job is currently running
+    retention_keep_runs: Optional[int] = None
+    retention_log_days: Optional[int] = None
+    retention_delete_days: Optional[int] = None
+    jitter_seconds: Optional[int] = None
+    timezone: Optional[str] = None
+    profile_mode: Optional[str] = None
+    timeout_seconds: Optional[int] = None
     
     class Config:
         from_attributes = True
 
 
+class RunStageResponse(BaseModel):
+    stage: str
+    seconds: float
+
+
 class JobRunResponse(BaseModel):
     id: int
     job_id: int
@@ -50,6 +78,9 @@ class JobRunResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    has_profile: bool = False  # Profile report available at /api/job-runs/{id}/artifacts/profile
+    cancel_requested: bool = False  # Cancellation requested, the run stops shortly
+    stages: Optional[List[RunStageResponse]] = None  # Stage timings in run order (run details only)
     
     class Config:
         from_attributes = True
@@ -57,15 +88,59 @@ class JobRunResponse(BaseModel):
 
 class CronParseRequest(BaseModel):
     cron_expression: str
+    timezone: Optional[str] = None  # Zone to show next runs in (None uses the global default)
 
 
 class CronParseResponse(BaseModel):
     cron_expression: str
     description: str
-    next_runs: list[str]  # List of next 5 run times as strings
+    next_runs: list[str]  # List of next 5 run times as local time strings
+    timezone: str  # Zone the next runs are given in
+
+
+class ForecastFiring(BaseModel):
+    job_id: int
+    job_name: str
+    run_at: datetime  # Nominal start; jitter may delay it by up to jitter_seconds
+    jitter_seconds: int = 0
+
+
+class ForecastHotspot(BaseModel):
+    run_at: datetime
+    job_count: int
+    job_ids: List[int]
+
+
+class ScheduleForecastResponse(BaseModel):
+    start: datetime
+    end: datetime
+    firings: List[ForecastFiring]  # Every firing in the window, in time order
+    hotspots: List[ForecastHotspot]  # Minutes where several jobs fire together, busiest first
+    peak_concurrency: int  # Most jobs starting in the same minute
+    truncated: bool = False  # True if the window had more firings than are returned
+
+
+class StageStats(BaseModel):
+    stage: str
+    count: int  # Samples (a stage such as send_email can occur several times per run)
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+
+
+class JobStageStatsResponse(BaseModel):
+    job_id: int
+    runs: int  # Most recent runs the percentiles cover
+    stages: List[StageStats]  # In the order stages occur in a run
 
 
 class StatusResponse(BaseModel):
     scheduler_running: bool
     active_jobs_count: int
     total_jobs_count: int
+    running_jobs_count: int = 0  # Executions in progress in this process
+    peak_concurrency: int = 0  # Most executions running at once since startup
+    scheduler_leader: bool = False  # Whether this node fires schedules (one node per shared database)
+    scheduler_node: Optional[str] = None  # Id of this node in the scheduler lease
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Worker process executing queued job runs (EXECUTION_MODE=worker)
+
+Claims runs from the database queue, runs them with the same script execution as the
+API process and heartbeats their leases. Start as many workers as needed against the
+same database. When a worker dies, the reaper on the scheduler leader re-queues its
+runs once their leases expire, and any worker can claim them again.
+
+SIGTERM/SIGINT stop claiming and let in-flight runs finish.
+
+Usage:
+  python worker.py [--concurrency 2] [--worker-id NAME]
+"""
+
+import argparse
+import logging
+import re
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from database import init_db
+from reaper import recover_runs
+from run_queue import PROCESS_ID, WORKER_CONCURRENCY, WORKER_POLL_SECONDS, RunHeartbeat, claim_run
+from scheduler import execute_claimed_run
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+from utils.logging_utils import LOG_DIR, configure_logging
+from utils.tracing_utils import configure_tracing
+
+logger = logging.getLogger("worker")
+
+
+def _work(worker_id: str, heartbeat: RunHeartbeat, stop: threading.Event):
+    """Claim and execute runs one at a time until stopped"""
+    while not stop.is_set():
+        try:
+            claimed = claim_run(worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to claim a queued run: {e}")
+            claimed = None
+        if claimed is None:
+            stop.wait(WORKER_POLL_SECONDS)
+            continue
+        lease, job_id, queue_wait = claimed
+        try:
+            with heartbeat.holding(lease):
+                execute_claimed_run(job_id, lease, queue_wait)
+        except Exception as e:
+            logger.error(f"Run {lease.run_id} of job {job_id} failed in the worker: {e}", exc_info=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Execute queued job runs")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="Runs executed at once")
+    parser.add_argument(
+        "--worker-id", type=str, default=None,
+        help="Name of this worker in run leases (default: unique per process; a fixed name lets a restarted worker recover its runs at once)"
+    )
+    args = parser.parse_args()
+    worker_id = args.worker_id or PROCESS_ID
+
+    # Workers often share LOG_DIR, and a rotating log file must have a single writer
+    configure_logging(LOG_DIR / f"worker-{re.sub(r'[^A-Za-z0-9_.-]', '-', worker_id)}.log")
+    configure_tracing("worker")
+    init_db()
+    # Runs of dead processes on this host are recovered at once. Only a fixed --worker-id can also
+    # match runs of a previous incarnation of this worker; the default id is new for every process.
+    recover_runs([args.worker_id] if args.worker_id else [])
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"Worker {worker_id} stopping, waiting for runs in progress")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    # Leases are renewed until the runs in progress have finished, not just until stop is requested
+    heartbeat = RunHeartbeat(worker_id)
+    heartbeat.start()
+    workers = [
+        threading.Thread(target=_work, args=(worker_id, heartbeat, stop), name=f"worker-{i + 1}")
+        for i in range(args.concurrency)
+    ]
+    for thread in workers:
+        thread.start()
+    logger.info(f"Worker {worker_id} started with {args.concurrency} slot(s)")
+
+    stop.wait()
+    for thread in workers:
+        thread.join()
+    heartbeat.stop()
+    logger.info(f"Worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()
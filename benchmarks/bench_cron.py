@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for cron parsing and next-run computation.
+
+Usage:
+  python benchmarks/bench_cron.py [--iterations 2000] [--next 100] [--output results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from cron_parser import compile_cron, parse_cron, parse_cron_expression, _next_runs_for_minute
+
+EXPRESSIONS = [
+    "0 9 * * 1",
+    "*/5 * * * *",
+    "30 8 1 * *",
+    "0 9-17 * * 1-5",
+    "15,45 */2 * * *",
+    "0 0 1 1 *",
+    "@daily",
+    "0 12 * * FRI#2",
+]
+
+
+def _throughput(func, iterations: int) -> float:
+    """Calls per second"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return round(iterations / (time.perf_counter() - start), 1)
+
+
+def _clear_caches():
+    parse_cron.cache_clear()
+    compile_cron.cache_clear()
+    _next_runs_for_minute.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cron parsing and next-run computation")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--next", type=int, default=100, help="Run times computed per next-N call")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    def parse_cold(i):
+        _clear_caches()
+        parse_cron_expression(EXPRESSIONS[i % len(EXPRESSIONS)])
+
+    def parse_warm(i):
+        parse_cron_expression(EXPRESSIONS[i % len(EXPRESSIONS)])
+
+    def next_n(i):
+        compile_cron(EXPRESSIONS[i % len(EXPRESSIONS)]).next_runs(args.next)
+
+    results = {
+        "iterations": args.iterations,
+        "parse_uncached_per_sec": _throughput(parse_cold, args.iterations),
+        "parse_cached_per_sec": _throughput(parse_warm, args.iterations),
+        f"next_{args.next}_per_sec": _throughput(next_n, max(1, args.iterations // 10)),
+        "compile_cache": compile_cron.cache_info()._asdict(),
+    }
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Load test modelling open dashboard tabs, to find how many one instance can serve.
+
+Each simulated tab loads /api/jobs, /api/status and /api/job-runs on open, then polls
+/api/status every 5 seconds and /api/job-runs every 10 seconds (as useStatus and
+useJobRuns do), over keep-alive connections and revalidating with If-None-Match like
+a browser. Meanwhile writer threads keep job runs executing against a fake OpenAI API.
+
+Latency is measured from each poll's scheduled time, so a slow server can't hide
+queueing by delaying the next request. The report gives p50/p99 per tab count and the
+largest tab count whose p99 stays within the target.
+
+Usage:
+  python benchmarks/bench_dashboard_load.py [--tabs 25,50,100,200] [--duration 30]
+      [--p99-target-ms 250] [--writers 2] [--no-etag] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from harness import FakeOpenAI, create_jobs, http_json, running_backend, summary
+
+STATUS_INTERVAL = 5
+RUNS_INTERVAL = 10
+RUNS_PATH = "/api/job-runs?limit=50"
+
+
+class Connection:
+    """Keep-alive HTTP/1.1 connection, reconnecting when the server closes an idle one"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def _exchange(self, path: str, headers: dict) -> tuple[int, dict]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Accept: application/json",
+                 "Accept-Encoding: br, gzip"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            await self.reader.readexactly(int(response_headers["content-length"]))
+        elif response_headers.get("transfer-encoding") == "chunked":
+            while size := int((await self.reader.readline()).strip(), 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        if response_headers.get("connection") == "close":
+            self.close()
+        return status, response_headers
+
+    async def get(self, path: str, headers: dict) -> tuple[int, dict]:
+        reused = self.writer is not None
+        try:
+            return await self._exchange(path, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            # Idle keep-alive connection timed out on the server; a browser retries on a new one
+            return await self._exchange(path, headers)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.not_modified = 0
+        self.errors = 0
+        self.recording = False
+
+    def record(self, path: str, seconds: float, status: int):
+        if not self.recording:
+            return
+        self.latencies.setdefault(path.split("?")[0], []).append(seconds)
+        if status == 304:
+            self.not_modified += 1
+        elif status != 200:
+            self.errors += 1
+
+
+async def _poll(host: str, port: int, paths: list[str], interval: float, stats: Stats, use_etag: bool,
+                stop: asyncio.Event, first_delay: float):
+    """One tab's polling loop: requests at a fixed schedule, latency measured from the scheduled time"""
+    connection = Connection(host, port)
+    etags = {}
+    scheduled = time.perf_counter() + first_delay
+    try:
+        while not stop.is_set():
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            for path in paths:
+                headers = {"If-None-Match": etags[path]} if use_etag and path in etags else {}
+                try:
+                    status, response_headers = await connection.get(path, headers)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    connection.close()
+                    if stats.recording:
+                        stats.errors += 1
+                    continue
+                stats.record(path, time.perf_counter() - scheduled, status)
+                if "etag" in response_headers:
+                    etags[path] = response_headers["etag"]
+            scheduled += interval
+            paths = paths[-1:]  # Only the tab-open burst requests more than the polled endpoint
+    finally:
+        connection.close()
+
+
+async def _run_level(base_url: str, tabs: int, duration: float, use_etag: bool) -> dict:
+    """Open tabs spread over the first poll interval, then record for the given duration"""
+    url = urlsplit(base_url)
+    stats = Stats()
+    stop = asyncio.Event()
+    tasks = []
+    for _ in range(tabs):
+        offset = random.uniform(0, STATUS_INTERVAL)
+        tasks.append(asyncio.create_task(_poll(
+            url.hostname, url.port, ["/api/jobs", "/api/status"], STATUS_INTERVAL, stats, use_etag, stop, offset
+        )))
+        tasks.append(asyncio.create_task(_poll(
+            url.hostname, url.port, [RUNS_PATH], RUNS_INTERVAL, stats, use_etag, stop, offset
+        )))
+
+    # Warm up until every tab is open, then measure
+    await asyncio.sleep(STATUS_INTERVAL)
+    stats.recording = True
+    await asyncio.sleep(duration)
+    stats.recording = False
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    all_samples = [seconds for samples in stats.latencies.values() for seconds in samples]
+    return {
+        "tabs": tabs,
+        "requests_per_second": round(len(all_samples) / duration, 1),
+        "overall": summary(all_samples),
+        "endpoints": {path: summary(samples) for path, samples in stats.latencies.items()},
+        "not_modified": stats.not_modified,
+        "errors": stats.errors,
+    }
+
+
+def _keep_runs_going(base_url: str, job_ids: list[int], stop: threading.Event, completed: list):
+    """Run jobs back to back so the API is read while runs are being written"""
+    while not stop.is_set():
+        status, _, _ = http_json("POST", f"{base_url}/api/jobs/{random.choice(job_ids)}/run")
+        completed.append(status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test simulating open dashboard tabs")
+    parser.add_argument("--tabs", type=str, default="25,50,100,200", help="Comma-separated tab counts to test")
+    parser.add_argument("--duration", type=float, default=30, help="Measurement time per tab count (seconds)")
+    parser.add_argument("--p99-target-ms", type=float, default=250, help="p99 latency a tab count must stay within")
+    parser.add_argument("--writers", type=int, default=2, help="Job runs kept executing during the test")
+    parser.add_argument("--seed-runs", type=int, default=50, help="Completed runs to create before measuring")
+    parser.add_argument("--openai-latency", type=float, default=1.0, help="Fake OpenAI response delay (seconds)")
+    parser.add_argument("--no-etag", action="store_true", help="Don't revalidate with If-None-Match")
+    parser.add_argument("--scheduler-mode", choices=("background", "asyncio"), default="background")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+    tab_counts = [int(count) for count in args.tabs.split(",")]
+
+    openai = FakeOpenAI(latency=args.openai_latency, payload_bytes=20 * 1024)
+    env = {
+        "OPENAI_BASE_URL": openai.start(),
+        "OPENAI_API_KEY": "bench",
+        "WEB_SEARCH": "false",
+        "EMAIL_USER": "",
+        "SCHEDULER_MODE": args.scheduler_mode,
+    }
+
+    levels = []
+    completed_runs = []
+    try:
+        with running_backend(env) as (base_url, _, _):
+            job_ids = create_jobs(base_url, 5)
+            for i in range(args.seed_runs):
+                http_json("POST", f"{base_url}/api/jobs/{job_ids[i % len(job_ids)]}/run")
+
+            stop = threading.Event()
+            writers = [
+                threading.Thread(target=_keep_runs_going, args=(base_url, job_ids, stop, completed_runs), daemon=True)
+                for _ in range(args.writers)
+            ]
+            for writer in writers:
+                writer.start()
+            try:
+                for tabs in tab_counts:
+                    level = asyncio.run(_run_level(base_url, tabs, args.duration, not args.no_etag))
+                    levels.append(level)
+                    print(f"{tabs} tabs: p99 {level['overall'].get('p99_ms')} ms, "
+                          f"{level['requests_per_second']} req/s, {level['errors']} errors", flush=True)
+            finally:
+                stop.set()
+                for writer in writers:
+                    writer.join()
+    finally:
+        openai.stop()
+
+    sustainable = [
+        level["tabs"] for level in levels
+        if level["errors"] == 0 and level["overall"].get("p99_ms", float("inf")) <= args.p99_target_ms
+    ]
+    results = {
+        "config": vars(args),
+        "levels": levels,
+        "runs_completed_during_test": len(completed_runs),
+        "sustainable_tabs": max(sustainable, default=0),
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark: the backend, real script runs, a fake OpenAI API and an SMTP sink.
+
+Starts the app under uvicorn against a temp SQLite DB, triggers manual runs with a
+fixed concurrency while dashboard-style pollers hit the API, and reports jobs per
+minute, run-completion latency, API p50/p99 under load and memory per concurrent run.
+
+Usage:
+  python benchmarks/bench_e2e.py [--runs 20] [--concurrency 4] [--pollers 4]
+      [--openai-latency 0.5] [--payload-kb 20] [--web-search] [--output results.json]
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import FakeOpenAI, SMTPSink, create_jobs, http_json, process_tree_rss_mb, running_backend, summary
+
+POLLED_ENDPOINTS = ("/api/status", "/api/jobs", "/api/job-runs")
+
+
+def _poll(base_url: str, stop: threading.Event, latencies: dict, errors: list):
+    """Hit the dashboard endpoints back to back until stopped"""
+    for path in itertools.cycle(POLLED_ENDPOINTS):
+        if stop.is_set():
+            return
+        try:
+            status, _, elapsed = http_json("GET", f"{base_url}{path}", timeout=30)
+        except OSError as e:
+            errors.append(str(e))
+            continue
+        if status != 200:
+            errors.append(f"{path}: HTTP {status}")
+        latencies[path].append(elapsed)
+
+
+def _sample_memory(pid: int, stop: threading.Event, samples: list):
+    while not stop.is_set():
+        samples.append(process_tree_rss_mb(pid))
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark with a fake OpenAI API and SMTP sink")
+    parser.add_argument("--runs", type=int, default=20, help="Manual job runs to execute")
+    parser.add_argument("--concurrency", type=int, default=4, help="Runs executing at once")
+    parser.add_argument("--jobs", type=int, default=4, help="Jobs the runs are spread over")
+    parser.add_argument("--pollers", type=int, default=4, help="Concurrent API pollers during the runs")
+    parser.add_argument("--openai-latency", type=float, default=0.5, help="Fake OpenAI response delay (seconds)")
+    parser.add_argument("--payload-kb", type=int, default=20, help="Fake OpenAI response size (KB)")
+    parser.add_argument("--web-search", action="store_true", help="Use the Responses API (default: Chat Completions)")
+    parser.add_argument("--scheduler-mode", choices=("background", "asyncio"), default="background")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    openai = FakeOpenAI(latency=args.openai_latency, payload_bytes=args.payload_kb * 1024)
+    smtp = SMTPSink()
+    env = {
+        "OPENAI_BASE_URL": openai.start(),
+        "OPENAI_API_KEY": "bench",
+        "WEB_SEARCH": "true" if args.web_search else "false",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp.start()),
+        "SMTP_USE_TLS": "false",
+        "EMAIL_USER": "bench@example.com",
+        "EMAIL_PASSWORD": "bench",
+        "SCHEDULER_MODE": args.scheduler_mode,
+    }
+
+    try:
+        with running_backend(env) as (base_url, pid, _):
+            job_ids = create_jobs(base_url, args.jobs, email_recipients=["reader@example.com"])
+            idle_rss_mb = process_tree_rss_mb(pid)
+
+            stop = threading.Event()
+            api_latencies = {path: [] for path in POLLED_ENDPOINTS}
+            poll_errors = []
+            memory_samples = []
+            background = [
+                threading.Thread(target=_poll, args=(base_url, stop, api_latencies, poll_errors), daemon=True)
+                for _ in range(args.pollers)
+            ]
+            background.append(threading.Thread(target=_sample_memory, args=(pid, stop, memory_samples), daemon=True))
+            for thread in background:
+                thread.start()
+
+            def run(index: int) -> tuple[str, float]:
+                status, job_run, elapsed = http_json("POST", f"{base_url}/api/jobs/{job_ids[index % len(job_ids)]}/run")
+                return (job_run or {}).get("status", f"HTTP {status}") if status == 200 else f"HTTP {status}", elapsed
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                outcomes = list(pool.map(run, range(args.runs)))
+            elapsed = time.perf_counter() - start
+
+            stop.set()
+            for thread in background:
+                thread.join()
+    finally:
+        openai.stop()
+        smtp.stop()
+
+    statuses = {}
+    for status, _ in outcomes:
+        statuses[status] = statuses.get(status, 0) + 1
+    peak_rss_mb = max(memory_samples, default=idle_rss_mb)
+
+    results = {
+        "config": vars(args),
+        "jobs_per_minute": round(statuses.get("success", 0) / elapsed * 60, 1),
+        "elapsed_seconds": round(elapsed, 2),
+        "run_statuses": statuses,
+        "run_completion_latency": summary([seconds for _, seconds in outcomes]),
+        "api_under_load": {path: summary(samples) for path, samples in api_latencies.items()},
+        "api_errors": len(poll_errors),
+        "memory": {
+            "idle_rss_mb": idle_rss_mb,
+            "peak_rss_mb": peak_rss_mb,
+            "per_concurrent_run_mb": round((peak_rss_mb - idle_rss_mb) / args.concurrency, 1),
+        },
+        "openai_requests": openai.requests,
+        "emails_delivered": smtp.messages,
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark DB size and run view latency for stored vs on-demand HTML output.
+
+Usage:
+  python benchmarks/bench_html_storage.py [--runs 200] [--views 200] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+SAMPLE_FILE = next((ROOT_DIR / "data").glob("*.md"), None)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary(samples: list[float]) -> dict:
+    return {
+        "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stored vs on-demand HTML output")
+    parser.add_argument("--runs", type=int, default=200, help="Number of job runs to insert")
+    parser.add_argument("--views", type=int, default=200, help="Number of run views to time")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-html-")
+    os.environ["DATABASE_PATH"] = str(Path(tmp_dir) / "bench.db")
+    sys.path.insert(0, str(ROOT_DIR / "backend"))
+    sys.path.insert(0, str(ROOT_DIR))
+
+    from sqlalchemy import text
+    from database import SessionLocal, engine, init_db, Job, JobRun, DB_PATH
+    from migrations import drop_stored_html
+    from utils.markdown_utils import markdown_to_html, render_html_cached
+
+    sample = SAMPLE_FILE.read_text(encoding="utf-8") if SAMPLE_FILE else "# Report\n\n- item\n" * 500
+
+    init_db()
+    db = SessionLocal()
+    job = Job(name="bench", prompt_filename="bench.md", prompt_content="bench", cron_expression="0 9 * * *")
+    db.add(job)
+    db.commit()
+    for i in range(args.runs):
+        # Vary content slightly so each run renders to distinct HTML
+        content = f"{sample}\n\nRun {i}\n"
+        db.add(JobRun(job_id=job.id, status="success", output_content=content,
+                      html_output_content=markdown_to_html(content)))
+    db.commit()
+    run_ids = [r.id for r in db.query(JobRun.id).all()]
+    db.close()
+
+    def db_size() -> int:
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+        return os.path.getsize(DB_PATH)
+
+    def time_views(render: bool) -> list[float]:
+        samples = []
+        session = SessionLocal()
+        try:
+            for i in range(args.views):
+                run_id = run_ids[i % len(run_ids)]
+                start = time.perf_counter()
+                run = session.query(JobRun).filter(JobRun.id == run_id).first()
+                html = run.html_output_content
+                if render and not html:
+                    html = render_html_cached(run.output_content)
+                samples.append(time.perf_counter() - start)
+                session.expire_all()
+        finally:
+            session.close()
+        return samples
+
+    results = {"runs": args.runs, "views": args.views, "sample_bytes": len(sample.encode("utf-8"))}
+
+    results["stored"] = {"db_bytes": db_size(), **_summary(time_views(render=False))}
+
+    drop_stored_html(vacuum=False)
+    render_html_cached.cache_clear()
+    lazy_size = db_size()
+    results["on_demand_cold"] = {"db_bytes": lazy_size, **_summary(time_views(render=True))}
+    # Second pass over the same runs is served from the render cache where it fits
+    results["on_demand_warm"] = {"db_bytes": lazy_size, **_summary(time_views(render=True))}
+    results["render_cache"] = render_html_cached.cache_info()._asdict()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
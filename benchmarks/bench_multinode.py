@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Multi-node scheduling check: several backend processes sharing one database.
+
+Starts N backends on one machine against the same SQLite file, creates jobs that
+fire every minute and verifies each firing runs exactly once, on the elected leader.
+Halfway through, the leader is killed (SIGKILL, so its lease is never released) and
+the report gives the time until another node took over and whether any firing was
+duplicated or lost across the handover.
+
+Exits non-zero when the check fails.
+
+Usage:
+  python benchmarks/bench_multinode.py [--nodes 3] [--jobs 3] [--minutes 3]
+      [--lease-seconds 6] [--no-failover] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from harness import FakeOpenAI, http_json, running_backend
+
+
+def _statuses(nodes: list[dict]) -> list[dict]:
+    """/api/status of every live node"""
+    statuses = []
+    for node in nodes:
+        if node["alive"]:
+            status, body, _ = http_json("GET", f"{node['url']}/api/status", timeout=10)
+            statuses.append({"node": node["name"], **(body if status == 200 else {"error": status})})
+    return statuses
+
+
+def _leaders(nodes: list[dict]) -> list[dict]:
+    names = {status["node"] for status in _statuses(nodes) if status.get("scheduler_leader")}
+    return [node for node in nodes if node["name"] in names]
+
+
+def _wait_for_second(second: int):
+    """Sleep until the given second of the next minute (firings happen at :00)"""
+    now = datetime.now(timezone.utc)
+    target = now.replace(second=second, microsecond=0)
+    if target <= now:
+        target += timedelta(minutes=1)
+    time.sleep((target - now).total_seconds())
+
+
+def _count_statuses(runs: list[dict]) -> dict:
+    counts = {}
+    for run in runs:
+        counts[run["status"]] = counts.get(run["status"], 0) + 1
+    return counts
+
+
+def _minute_boundaries(start: datetime, end: datetime) -> int:
+    """Whole minutes passed in (start, end]"""
+    return int(end.timestamp() // 60 - start.timestamp() // 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that one node fires each schedule across several replicas")
+    parser.add_argument("--nodes", type=int, default=3, help="Backend processes sharing the database")
+    parser.add_argument("--jobs", type=int, default=3, help="Jobs firing every minute")
+    parser.add_argument("--minutes", type=int, default=3, help="Minutes of firings to observe")
+    parser.add_argument("--lease-seconds", type=int, default=6, help="SCHEDULER_LEASE_SECONDS of the nodes")
+    parser.add_argument("--no-failover", action="store_true", help="Don't kill the leader halfway through")
+    parser.add_argument("--scheduler-mode", choices=("background", "asyncio"), default="background")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    openai = FakeOpenAI(latency=0.2, payload_bytes=2 * 1024)
+    shared_dir = Path(tempfile.mkdtemp(prefix="bench-multinode-"))
+    env = {
+        "OPENAI_BASE_URL": openai.start(),
+        "OPENAI_API_KEY": "bench",
+        "WEB_SEARCH": "false",
+        "EMAIL_USER": "",
+        "SCHEDULER_MODE": args.scheduler_mode,
+        "SCHEDULER_LEASE_SECONDS": str(args.lease_seconds),
+        "DATABASE_PATH": str(shared_dir / "shared.db"),
+        "ARTIFACT_STORE_DIR": str(shared_dir / "artifacts"),
+    }
+
+    failover = None
+    leader_samples = []
+    try:
+        with ExitStack() as stack:
+            nodes = []
+            for i in range(args.nodes):
+                node_env = {**env, "SCHEDULER_NODE_ID": f"node-{i + 1}"}
+                url, pid, _ = stack.enter_context(running_backend(node_env))
+                nodes.append({"name": f"node-{i + 1}", "url": url, "pid": pid, "alive": True})
+
+            # Create the jobs just after a firing so the first one is a whole minute away
+            _wait_for_second(5)
+            job_ids = []
+            for i in range(args.jobs):
+                status, job, _ = http_json("POST", f"{nodes[i % len(nodes)]['url']}/api/jobs", {
+                    "name": f"Multi-node job {i + 1}",
+                    "cron_expression": "* * * * *",
+                    "prompt_content": "Summarize today's benchmark news.",
+                    "jitter_seconds": 0,
+                })
+                if status != 201:
+                    raise RuntimeError(f"Failed to create job: {status} {job}")
+                job_ids.append(job["id"])
+            created_at = datetime.now(timezone.utc)
+
+            for minute in range(args.minutes):
+                leader_samples.append([node["name"] for node in _leaders(nodes)])
+                if not args.no_failover and minute == args.minutes // 2:
+                    # Kill the leader mid-minute, between firings
+                    _wait_for_second(30)
+                    leader = _leaders(nodes)[0]
+                    os.kill(leader["pid"], signal.SIGKILL)
+                    leader["alive"] = False
+                    killed_at = time.monotonic()
+                    while not _leaders(nodes):
+                        time.sleep(0.2)
+                    failover = {
+                        "killed": leader["name"],
+                        "new_leader": _leaders(nodes)[0]["name"],
+                        "seconds": round(time.monotonic() - killed_at, 1),
+                    }
+                    print(f"Killed {failover['killed']}, {failover['new_leader']} took over after "
+                          f"{failover['seconds']}s", flush=True)
+                _wait_for_second(20)
+
+            # Every firing up to now has started; count runs per job from a live node
+            ended_at = datetime.now(timezone.utc)
+            live = next(node for node in nodes if node["alive"])
+            _, runs, _ = http_json("GET", f"{live['url']}/api/job-runs?limit=10000")
+            statuses = _statuses(nodes)
+    finally:
+        openai.stop()
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    expected = _minute_boundaries(created_at, ended_at)
+    runs_per_job = {job_id: sum(1 for run in runs if run["job_id"] == job_id) for job_id in job_ids}
+    single_leader = all(len(sample) == 1 for sample in leader_samples) and sum(
+        1 for status in statuses if status.get("scheduler_leader")) == 1
+    passed = single_leader and all(count == expected for count in runs_per_job.values())
+
+    results = {
+        "config": vars(args),
+        "expected_runs_per_job": expected,
+        "runs_per_job": runs_per_job,
+        "run_statuses": _count_statuses(runs),
+        "leaders_per_minute": leader_samples,
+        "failover": failover,
+        "nodes": statuses,
+        "passed": passed,
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Worker mode benchmark: queued runs executed by several local worker processes.
+
+Starts the backend with EXECUTION_MODE=worker and, for each worker count, submits a
+batch of manual runs and measures how long the workers take to drain the queue.
+A final crash round SIGKILLs one worker mid-run and checks that its script processes
+die with it, that the reaper re-queues its runs once their lease expires and that every
+run still succeeds.
+
+Usage:
+  python benchmarks/bench_workers.py [--workers 1,2,4] [--runs 16] [--concurrency 2]
+      [--openai-latency 1.0] [--lease-seconds 6] [--no-crash] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from harness import FakeOpenAI, create_jobs, http_json, running_backend, running_workers
+
+FINISHED = ("success", "failed")
+
+
+def _submit(base_url: str, job_ids: list[int], runs: int) -> list[int]:
+    run_ids = []
+    for i in range(runs):
+        status, job_run, _ = http_json("POST", f"{base_url}/api/jobs/{job_ids[i % len(job_ids)]}/run")
+        if status != 200 or job_run["status"] != "queued":
+            raise RuntimeError(f"Run was not queued: {status} {job_run}")
+        run_ids.append(job_run["id"])
+    return run_ids
+
+
+def _run_statuses(base_url: str, run_ids: list[int]) -> dict:
+    _, runs, _ = http_json("GET", f"{base_url}/api/job-runs?limit=10000")
+    return {run["id"]: run["status"] for run in runs if run["id"] in set(run_ids)}
+
+
+def _wait_finished(base_url: str, run_ids: list[int], timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        statuses = _run_statuses(base_url, run_ids)
+        if all(status in FINISHED for status in statuses.values()) or time.monotonic() > deadline:
+            return statuses
+        time.sleep(0.25)
+
+
+def _scripts_started_by(parent_pid: int) -> int:
+    """Live run_ai_script.py processes started by the given process (from its JOB_PARENT_PID)"""
+    marker = f"JOB_PARENT_PID={parent_pid}".encode()
+    count = 0
+    for proc in Path("/proc").iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            cmdline = (proc / "cmdline").read_bytes()
+            environ = (proc / "environ").read_bytes()
+            state = next(line for line in (proc / "status").read_text().splitlines() if line.startswith("State:"))
+        except (OSError, StopIteration):
+            continue
+        if b"run_ai_script.py" in cmdline and marker in environ.split(b"\0") and "zombie" not in state:
+            count += 1
+    return count
+
+
+def _count(statuses: dict) -> dict:
+    counts = {}
+    for status in statuses.values():
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark queued runs across local worker processes")
+    parser.add_argument("--workers", type=str, default="1,2,4", help="Comma-separated worker process counts")
+    parser.add_argument("--runs", type=int, default=16, help="Runs submitted per worker count")
+    parser.add_argument("--concurrency", type=int, default=2, help="Runs each worker executes at once")
+    parser.add_argument("--openai-latency", type=float, default=1.0, help="Fake OpenAI response delay (seconds)")
+    parser.add_argument("--lease-seconds", type=int, default=6, help="RUN_LEASE_SECONDS of the workers")
+    parser.add_argument("--no-crash", action="store_true", help="Skip the worker crash round")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+    worker_counts = [int(count) for count in args.workers.split(",")]
+
+    openai = FakeOpenAI(latency=args.openai_latency, payload_bytes=4 * 1024)
+    env = {
+        "OPENAI_BASE_URL": openai.start(),
+        "OPENAI_API_KEY": "bench",
+        "WEB_SEARCH": "false",
+        "EMAIL_USER": "",
+        "EXECUTION_MODE": "worker",
+        "RUN_LEASE_SECONDS": str(args.lease_seconds),
+        "RUN_REAPER_INTERVAL_SECONDS": "2",
+        "WORKER_POLL_SECONDS": "0.2",
+    }
+
+    levels = []
+    crash = None
+    try:
+        with running_backend(env) as (base_url, _, tmp_dir):
+            job_ids = create_jobs(base_url, 4)
+
+            for workers in worker_counts:
+                with running_workers(tmp_dir, workers, args.concurrency, env):
+                    start = time.perf_counter()
+                    run_ids = _submit(base_url, job_ids, args.runs)
+                    statuses = _wait_finished(base_url, run_ids, timeout=600)
+                    elapsed = time.perf_counter() - start
+                levels.append({
+                    "workers": workers,
+                    "slots": workers * args.concurrency,
+                    "elapsed_seconds": round(elapsed, 2),
+                    "runs_per_minute": round(len(run_ids) / elapsed * 60, 1),
+                    "run_statuses": _count(statuses),
+                })
+                print(f"{workers} worker(s): {levels[-1]['runs_per_minute']} runs/min", flush=True)
+
+            if not args.no_crash:
+                with running_workers(tmp_dir, 2, args.concurrency, env) as processes:
+                    run_ids = _submit(base_url, job_ids, args.runs)
+                    # Kill a worker while it is executing runs
+                    while "running" not in _run_statuses(base_url, run_ids).values():
+                        time.sleep(0.1)
+                    time.sleep(args.openai_latency / 2)
+                    killed_at = time.perf_counter()
+                    os.kill(processes[0].pid, signal.SIGKILL)
+                    time.sleep(1)
+                    orphaned_scripts = _scripts_started_by(processes[0].pid)
+                    statuses = _wait_finished(base_url, run_ids, timeout=600)
+                    recovery_seconds = time.perf_counter() - killed_at
+
+                with sqlite3.connect(tmp_dir / "bench.db") as conn:
+                    placeholders = ",".join("?" * len(run_ids))
+                    reclaimed = conn.execute(
+                        f"SELECT COUNT(*) FROM job_runs WHERE id IN ({placeholders}) AND attempts > 1", run_ids
+                    ).fetchone()[0]
+                crash = {
+                    "run_statuses": _count(statuses),
+                    "runs_reclaimed": reclaimed,
+                    "orphaned_scripts": orphaned_scripts,
+                    "seconds_until_drained": round(recovery_seconds, 2),
+                }
+    finally:
+        openai.stop()
+
+    passed = all(level["run_statuses"] == {"success": args.runs} for level in levels) and (
+        crash is None or (
+            crash["run_statuses"] == {"success": args.runs}
+            and crash["runs_reclaimed"] > 0
+            and crash["orphaned_scripts"] == 0
+        )
+    )
+    results = {"config": vars(args), "levels": levels, "crash": crash, "passed": passed}
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
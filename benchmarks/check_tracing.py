@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tracing check: the span tree of one manual run, from the API request to the script's work.
+
+Installs the memory span exporter, starts the app in process against a temp database,
+a fake OpenAI API and an SMTP sink, and triggers a run with POST /api/jobs/{id}/run.
+The real run_ai_script.py executes the job; once its spans have been merged back from
+JOB_TRACE_SPANS_FILE, the span names and parent links of the whole run are checked:
+run_job_manual -> execute_job -> script_process -> run_ai_script.main -> openai.* /
+save_results_to_db / send_email. Needs opentelemetry-sdk; exits non-zero on failure.
+
+Usage:
+  python benchmarks/check_tracing.py [--scheduler-mode background|asyncio]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import FakeOpenAI, SMTPSink
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+
+# Span name -> name of its parent, from the endpoint's span (under the HTTP span when
+# FastAPI is instrumented) through the scheduler to the script
+ROOT_SPAN = "run_job_manual"
+EXPECTED_PARENTS = {
+    "execute_job": "run_job_manual",
+    "create_run": "execute_job",
+    "script_process": "execute_job",
+    "complete_run": "execute_job",
+    "run_ai_script.main": "script_process",
+    "load_prompt": "run_ai_script.main",
+    "call_openai": "run_ai_script.main",
+    "openai.chat_completions": "call_openai",
+    "save_results_to_db": "run_ai_script.main",
+    "db_save": "save_results_to_db",
+    "send_email": "run_ai_script.main",
+    "send_pushover": "run_ai_script.main",
+}
+# Spans recorded by the script process rather than the API process
+SCRIPT_SPANS = ("run_ai_script.main", "load_prompt", "call_openai", "openai.chat_completions",
+                "save_results_to_db", "db_save", "send_email", "send_pushover")
+
+
+def _problems(spans: list[dict], run: dict, emails: int) -> list[str]:
+    problems = []
+    if run.get("status") != "success":
+        problems.append(f"run finished as {run.get('status')}")
+    if emails == 0:
+        problems.append("no email reached the SMTP sink")
+
+    by_name = {}
+    for recorded in spans:
+        by_name.setdefault(recorded["name"], []).append(recorded)
+    for name in (ROOT_SPAN, *EXPECTED_PARENTS):
+        if name not in by_name:
+            problems.append(f"no '{name}' span")
+    # Parents must be unambiguous; leaves such as send_email repeat per recipient
+    for parent in set(EXPECTED_PARENTS.values()):
+        if len(by_name.get(parent, [])) > 1:
+            problems.append(f"expected one '{parent}' span, got {len(by_name[parent])}")
+    if problems:
+        return problems
+
+    trace_ids = {recorded["trace_id"] for name in (ROOT_SPAN, *EXPECTED_PARENTS) for recorded in by_name[name]}
+    if len(trace_ids) != 1:
+        problems.append(f"spans belong to {len(trace_ids)} traces")
+    for name, parent in EXPECTED_PARENTS.items():
+        parent_id = by_name[parent][0]["span_id"]
+        if any(recorded["parent_id"] != parent_id for recorded in by_name[name]):
+            problems.append(f"'{name}' is not a child of '{parent}'")
+    api_service = by_name[ROOT_SPAN][0]["service"]
+    for name in SCRIPT_SPANS:
+        if by_name[name][0]["service"] == api_service:
+            problems.append(f"'{name}' was not recorded by the script process")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the span tree of a manual run")
+    parser.add_argument("--scheduler-mode", choices=("background", "asyncio"), default="background")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="check-tracing-"))
+    openai = FakeOpenAI(latency=0.1, payload_bytes=2048)
+    smtp = SMTPSink()
+    # Read when the backend modules are imported, and inherited by the script process
+    os.environ.update({
+        "TRACING_EXPORTER": "memory",
+        "DATABASE_PATH": str(tmp_dir / "check.db"),
+        "LOG_DIR": str(tmp_dir / "logs"),
+        "ARTIFACT_STORE_DIR": str(tmp_dir / "artifacts"),
+        "EXECUTION_MODE": "local",
+        "SCHEDULER_MODE": args.scheduler_mode,
+        "OPENAI_BASE_URL": openai.start(),
+        "OPENAI_API_KEY": "check",
+        "WEB_SEARCH": "false",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp.start()),
+        "SMTP_USE_TLS": "false",
+        "EMAIL_USER": "check@example.com",
+        "EMAIL_PASSWORD": "check",
+        "PUSHOVER_USER_KEY": "",
+        "PUSHOVER_APP_TOKEN": "",
+    })
+    sys.path.insert(0, str(ROOT_DIR / "backend"))
+    try:
+        from fastapi.testclient import TestClient
+        import main as app_main
+        from utils.tracing_utils import MEMORY_EXPORTER, TracerProvider
+
+        if TracerProvider is None:
+            print("opentelemetry-sdk is not installed", file=sys.stderr)
+            sys.exit(2)
+
+        with TestClient(app_main.app) as client:
+            job = client.post("/api/jobs", json={
+                "name": "Tracing check",
+                "cron_expression": "0 0 1 1 *",
+                "prompt_content": "Summarize today's news.",
+                "email_recipients": ["reader@example.com"],
+                "enabled": False,
+            }).json()
+            MEMORY_EXPORTER.clear()
+            run = client.post(f"/api/jobs/{job['id']}/run").json()
+            spans = MEMORY_EXPORTER.finished_spans()
+
+        problems = _problems(spans, run, smtp.messages)
+        for recorded in sorted(spans, key=lambda s: s["start_time_ns"]):
+            print(f"{recorded['service']:<28} {recorded['name']:<24} {recorded['span_id']} <- {recorded['parent_id']}")
+        if problems:
+            print("FAILED: " + "; ".join(problems), file=sys.stderr)
+            sys.exit(1)
+        print("Span tree of the run is complete")
+    finally:
+        openai.stop()
+        smtp.stop()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
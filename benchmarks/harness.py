@@ -0,0 +1,311 @@
+"""
+Shared pieces of the end-to-end benchmarks: a fake OpenAI API, an SMTP sink,
+a backend launched against a temp database, and latency summaries.
+
+Everything runs locally, so benchmarks need no API keys or mail server.
+"""
+
+import json
+import os
+import shutil
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+
+MARKDOWN_PARAGRAPH = (
+    "## Findings\n\nThe quick brown fox jumps over the lazy dog. "
+    "See [the source](https://example.com/source) for details.\n\n- first point\n- second point\n\n"
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary(samples: list[float]) -> dict:
+    """Latency summary in milliseconds"""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeOpenAI:
+    """Local OpenAI Responses and Chat Completions endpoint with configurable latency and payload size"""
+
+    def __init__(self, latency: float = 0.5, payload_bytes: int = 20_000):
+        self.latency = latency
+        self.content = (MARKDOWN_PARAGRAPH * (payload_bytes // len(MARKDOWN_PARAGRAPH) + 1))[:payload_bytes]
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _response(self, path: str, model: str) -> dict:
+        usage_in, usage_out = 100, len(self.content) // 4
+        if path.endswith("/responses"):
+            return {
+                "id": "resp_bench", "object": "response", "created_at": int(time.time()), "model": model,
+                "status": "completed", "tool_choice": "auto", "tools": [], "parallel_tool_calls": True,
+                "output": [{
+                    "type": "message", "id": "msg_bench", "status": "completed", "role": "assistant",
+                    "content": [{"type": "output_text", "text": self.content, "annotations": []}],
+                }],
+                "usage": {
+                    "input_tokens": usage_in, "output_tokens": usage_out, "total_tokens": usage_in + usage_out,
+                    "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0},
+                },
+            }
+        return {
+            "id": "chatcmpl_bench", "object": "chat.completion", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": self.content}}],
+            "usage": {"prompt_tokens": usage_in, "completion_tokens": usage_out, "total_tokens": usage_in + usage_out},
+        }
+
+    def start(self) -> str:
+        """Start serving and return the base URL (for OPENAI_BASE_URL)"""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.latency)
+                body = json.dumps(fake._response(self.path, request.get("model", "bench"))).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class SMTPSink:
+    """Minimal SMTP server that accepts (and counts) every message without TLS"""
+
+    def __init__(self):
+        self.messages = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self) -> int:
+        """Start serving and return the port (for SMTP_PORT)"""
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str):
+                self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+            def handle(self):
+                self.reply("220 localhost bench sink")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode("ascii", errors="replace").strip().upper()
+                    if command.startswith("EHLO"):
+                        self.reply("250-localhost")
+                        self.reply("250 AUTH PLAIN LOGIN")
+                    elif command.startswith("AUTH"):
+                        self.reply("235 Authentication successful")
+                    elif command == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        while self.rfile.readline() not in (b".\r\n", b""):
+                            pass
+                        with sink._lock:
+                            sink.messages += 1
+                        self.reply("250 OK")
+                    elif command.startswith("QUIT"):
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def http_json(method: str, url: str, body: Optional[dict] = None, timeout: float = 600) -> tuple[int, object, float]:
+    """Make a JSON request, returning (status, parsed body, seconds)"""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    elapsed = time.perf_counter() - start
+    return status, json.loads(payload) if payload else None, elapsed
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """Resident memory of a process and all its descendants (Linux /proc)"""
+    children = {}
+    for stat_path in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat_path.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat_path.parent.name))
+
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1)
+
+
+def _backend_env(tmp_dir: Path, env: Optional[dict]) -> dict:
+    return {
+        **os.environ,
+        "DATABASE_PATH": str(tmp_dir / "bench.db"),
+        "LOG_DIR": str(tmp_dir / "logs"),
+        "ARTIFACT_STORE_DIR": str(tmp_dir / "artifacts"),
+        # Keep notifications from a developer's .env out of benchmark runs
+        "PUSHOVER_USER_KEY": "",
+        "PUSHOVER_APP_TOKEN": "",
+        **(env or {}),
+    }
+
+
+@contextmanager
+def running_backend(env: Optional[dict] = None, startup_timeout: float = 30):
+    """
+    Run the FastAPI app under uvicorn against a temp SQLite database.
+    Yields (base URL, server pid, temp dir); the backend log is <temp dir>/backend.out.
+    """
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bench-e2e-"))
+    port = free_port()
+    process_env = _backend_env(tmp_dir, env)
+    with open(tmp_dir / "backend.out", "wb") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=str(ROOT_DIR / "backend"),
+            env=process_env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Backend exited during startup, see {tmp_dir / 'backend.out'}")
+            try:
+                http_json("GET", f"{base_url}/api/status", timeout=1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Backend did not start in time")
+                time.sleep(0.2)
+        yield base_url, process.pid, tmp_dir
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+@contextmanager
+def running_workers(tmp_dir: Path, count: int, concurrency: int, env: Optional[dict] = None):
+    """
+    Run worker.py processes against the database of a running_backend temp dir.
+    Yields the Popen objects; worker output goes to <temp dir>/worker-<n>.out.
+    """
+    processes = []
+    try:
+        for i in range(count):
+            with open(tmp_dir / f"worker-{i + 1}.out", "wb") as log_file:
+                processes.append(subprocess.Popen(
+                    [sys.executable, "worker.py", "--concurrency", str(concurrency), "--worker-id", f"worker-{i + 1}"],
+                    cwd=str(ROOT_DIR / "backend"),
+                    env=_backend_env(tmp_dir, env),
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                ))
+        yield processes
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def create_jobs(base_url: str, count: int, email_recipients: Optional[list[str]] = None) -> list[int]:
+    """Create disabled jobs (so the scheduler never fires them) and return their ids"""
+    job_ids = []
+    for i in range(count):
+        status, job, _ = http_json("POST", f"{base_url}/api/jobs", {
+            "name": f"Benchmark job {i + 1}",
+            "cron_expression": "0 0 1 1 *",
+            "prompt_content": "Summarize today's benchmark news.",
+            "email_recipients": email_recipients,
+            "enabled": False,
+        })
+        if status != 201:
+            raise RuntimeError(f"Failed to create job: {status} {job}")
+        job_ids.append(job["id"])
+    return job_ids
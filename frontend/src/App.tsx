@@ -63,7 +63,7 @@ function App() {
       const checkCompletion = setInterval(async () => {
         try {
           const latestRuns = await getJobRuns(20);
-          const jobRun = latestRuns.find((r) => r.job_id === job.id && r.status !== 'running');
+          const jobRun = latestRuns.find((r) => r.job_id === job.id && r.status !== 'running' && r.status !== 'queued');
           if (jobRun) {
             setRunningJobs(prev => {
               const next = new Set(prev);
@@ -132,7 +132,7 @@ function App() {
           {status && (
             <div className="status-info">
               <span className={`scheduler-status ${status.scheduler_running ? 'running' : 'stopped'}`}>
-                Scheduler: {status.scheduler_running ? 'Running' : 'Stopped'}
+                Scheduler: {status.scheduler_running ? (status.scheduler_leader ? 'Running' : 'Standby') : 'Stopped'}
               </span>
               <span>Active Jobs: {status.active_jobs_count} / {status.total_jobs_count}</span>
             </div>
@@ -12,6 +12,7 @@ interface CronInputProps {
   value: string;
   onChange: (value: string) => void;
   error?: string;
+  timezone?: string;
 }
 
 const COMMON_PRESETS = [
@@ -24,9 +25,10 @@ const COMMON_PRESETS = [
   { label: 'Every Sunday at midnight', value: '0 0 * * 0' },
 ];
 
-export const CronInput: React.FC<CronInputProps> = ({ value, onChange, error }) => {
+export const CronInput: React.FC<CronInputProps> = ({ value, onChange, error, timezone }) => {
   const [description, setDescription] = useState<string>('');
   const [nextRuns, setNextRuns] = useState<string[]>([]);
+  const [runsTimezone, setRunsTimezone] = useState<string>('');
   const [loading, setLoading] = useState(false);
   const [parseError, setParseError] = useState<string>('');
 
@@ -43,10 +45,11 @@ export const CronInput: React.FC<CronInputProps> = ({ value, onChange, error })
     const timeoutId = setTimeout(() => {
       setLoading(true);
       setParseError('');
-      parseCron(value)
+      parseCron(value, timezone)
         .then((result: CronParseResult) => {
           setDescription(result.description);
           setNextRuns(result.next_runs);
+          setRunsTimezone(result.timezone);
         })
         .catch((err) => {
           const errorMessage = err instanceof Error ? err.message : 'Invalid cron expression';
@@ -60,7 +63,7 @@ export const CronInput: React.FC<CronInputProps> = ({ value, onChange, error })
     }, 500); // 500ms debounce
 
     return () => clearTimeout(timeoutId);
-  }, [value]);
+  }, [value, timezone]);
 
   const cronParts = useMemo(() => {
     const parts = value.trim().split(/\s+/);
@@ -128,7 +131,7 @@ export const CronInput: React.FC<CronInputProps> = ({ value, onChange, error })
           </div>
           {nextRuns.length > 0 && (
             <div className="next-runs">
-              <strong>Next runs:</strong>
+              <strong>Next runs ({runsTimezone}):</strong>
               <ul>
                 {nextRuns.map((run, idx) => (
                   <li key={idx}>{run}</li>
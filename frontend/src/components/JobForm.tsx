@@ -3,7 +3,7 @@
  */
 
 import React, { useState, useCallback } from 'react';
-import { Job, JobCreate, JobUpdate } from '../services/api';
+import { Job, JobCreate, JobUpdate, ProfileMode } from '../services/api';
 import { CronInput } from './CronInput';
 import { validateJobName, validatePromptContent, validateCronExpression } from '../utils/validation';
 import { ErrorMessage } from './ErrorMessage';
@@ -21,6 +21,9 @@ const JobFormComponent: React.FC<JobFormProps> = ({ job, onSubmit, onCancel }) =
   const [name, setName] = useState(job?.name || '');
   const [promptContent, setPromptContent] = useState(job?.prompt_content || '');
   const [cronExpression, setCronExpression] = useState(job?.cron_expression || '0 9 * * *');
+  const [timezone, setTimezone] = useState(job?.timezone || '');
+  const [profileMode, setProfileMode] = useState<string>(job?.profile_mode || '');
+  const [timeoutSeconds, setTimeoutSeconds] = useState<string>(job?.timeout_seconds?.toString() || '');
   const [enabled, setEnabled] = useState(job?.enabled ?? true);
   const [emailRecipients, setEmailRecipients] = useState<string[]>(() => {
     const recipients = job?.email_recipients || [];
@@ -133,6 +136,9 @@ const JobFormComponent: React.FC<JobFormProps> = ({ job, onSubmit, onCancel }) =
           name: name !== job.name ? name : undefined,
           prompt_content: promptContent !== job.prompt_content ? promptContent : undefined,
           cron_expression: cronExpression !== job.cron_expression ? cronExpression : undefined,
+          timezone: timezone !== (job.timezone || '') ? timezone.trim() || null : undefined,
+          profile_mode: profileMode !== (job.profile_mode || '') ? (profileMode as ProfileMode) || null : undefined,
+          timeout_seconds: timeoutSeconds !== (job.timeout_seconds?.toString() || '') ? parseInt(timeoutSeconds, 10) || null : undefined,
           enabled: enabled !== job.enabled ? enabled : undefined,
           email_recipients: recipientsChanged ? recipientsToSave : undefined,
         });
@@ -141,6 +147,9 @@ const JobFormComponent: React.FC<JobFormProps> = ({ job, onSubmit, onCancel }) =
           name: name.trim(),
           prompt_content: promptContent.trim(),
           cron_expression: cronExpression.trim(),
+          timezone: timezone.trim() || null,
+          profile_mode: (profileMode as ProfileMode) || null,
+          timeout_seconds: parseInt(timeoutSeconds, 10) || null,
           enabled,
           email_recipients: recipientsToSave,
         });
@@ -194,6 +203,45 @@ const JobFormComponent: React.FC<JobFormProps> = ({ job, onSubmit, onCancel }) =
           value={cronExpression}
           onChange={setCronExpression}
           error={error}
+          timezone={timezone.trim() || undefined}
+        />
+      </div>
+
+      <div className="form-group">
+        <label>
+          Timezone
+        </label>
+        <input
+          type="text"
+          value={timezone}
+          onChange={(e) => setTimezone(e.target.value)}
+          placeholder="e.g., America/New_York (blank uses the server default)"
+        />
+      </div>
+
+      <div className="form-group">
+        <label>
+          Profiling
+        </label>
+        <select value={profileMode} onChange={(e) => setProfileMode(e.target.value)}>
+          <option value="">Off</option>
+          <option value="timers">Stage timers</option>
+          <option value="cprofile">Stage timers + cProfile</option>
+          <option value="pyinstrument">Stage timers + pyinstrument</option>
+        </select>
+      </div>
+
+      <div className="form-group">
+        <label>
+          Timeout (seconds)
+        </label>
+        <input
+          type="number"
+          min={1}
+          max={86400}
+          value={timeoutSeconds}
+          onChange={(e) => setTimeoutSeconds(e.target.value)}
+          placeholder="Blank uses the server default (JOB_TIMEOUT_SECONDS)"
         />
       </div>
 
@@ -51,6 +51,7 @@ export const JobList: React.FC<JobListProps> = ({
               <td data-label="Name">{job.name}</td>
               <td data-label="Schedule">
                 <code>{job.cron_expression}</code>
+                {job.timezone && <span className="job-timezone"> {job.timezone}</span>}
               </td>
               <td data-label="Status">
                 {isRunning ? (
@@ -19,7 +19,8 @@ export const JobRunsTable: React.FC<JobRunsTableProps> = ({ runs, onView }) => {
 
   const getDuration = (run: JobRun) => {
     if (!run.completed_at) {
-      return 'Running...';
+      if (run.status === 'queued') return 'Queued';
+      return run.cancel_requested ? 'Cancelling...' : 'Running...';
     }
     const start = new Date(run.started_at);
     const end = new Date(run.completed_at);
@@ -4,7 +4,7 @@
 
 import React, { useState, useEffect } from 'react';
 import ReactMarkdown from 'react-markdown';
-import { JobRun, getJobRun } from '../services/api';
+import { JobRun, cancelJobRun, getJobRun, getJobRunArtifactUrl } from '../services/api';
 import { format } from 'date-fns';
 import { LoadingSpinner } from './LoadingSpinner';
 import { ErrorMessage } from './ErrorMessage';
@@ -18,6 +18,7 @@ export const RunDetailModal: React.FC<RunDetailModalProps> = ({ runId, onClose }
   const [run, setRun] = useState<JobRun | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [cancelError, setCancelError] = useState<string | null>(null);
   // Default to HTML view if HTML content is available, otherwise markdown
   const [viewMode, setViewMode] = useState<'html' | 'markdown'>(() => {
     // Will be set properly after run loads
@@ -93,6 +94,24 @@ export const RunDetailModal: React.FC<RunDetailModalProps> = ({ runId, onClose }
     return <span className={className}>{status.toUpperCase()}</span>;
   };
 
+  const handleCancel = async () => {
+    try {
+      setCancelError(null);
+      const updated = await cancelJobRun(run.id);
+      setRun({
+        ...run,
+        status: updated.status,
+        completed_at: updated.completed_at,
+        error_message: updated.error_message,
+        cancel_requested: updated.cancel_requested,
+      });
+    } catch (err) {
+      setCancelError(err instanceof Error ? err.message : 'Failed to cancel run');
+    }
+  };
+
+  const cancellable = run.status === 'queued' || run.status === 'running';
+
   return (
     <div className="modal-overlay" onClick={onClose}>
       <div className="modal-content" onClick={(e) => e.stopPropagation()}>
@@ -105,7 +124,17 @@ export const RunDetailModal: React.FC<RunDetailModalProps> = ({ runId, onClose }
           <div className="run-info">
             <div className="info-row">
               <strong>Status:</strong> {getStatusBadge(run.status)}
+              {cancellable && (
+                <button className="btn-cancel-run" onClick={handleCancel} disabled={run.cancel_requested}>
+                  {run.cancel_requested ? 'Cancelling...' : 'Cancel run'}
+                </button>
+              )}
             </div>
+            {cancelError && (
+              <div className="info-row error">
+                <strong>Cancel failed:</strong> {cancelError}
+              </div>
+            )}
             <div className="info-row">
               <strong>Started:</strong> {format(new Date(run.started_at), 'MMM d, yyyy HH:mm:ss')}
             </div>
@@ -119,6 +148,14 @@ export const RunDetailModal: React.FC<RunDetailModalProps> = ({ runId, onClose }
                 <strong>Error:</strong> {run.error_message}
               </div>
             )}
+            {run.has_profile && (
+              <div className="info-row">
+                <strong>Profile:</strong>{' '}
+                <a href={getJobRunArtifactUrl(run.id, 'profile')} target="_blank" rel="noopener noreferrer" download>
+                  Download profile
+                </a>
+              </div>
+            )}
           </div>
 
           <div className="tabs">
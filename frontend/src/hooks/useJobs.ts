@@ -12,6 +12,8 @@ export const useJobs = () => {
   const [error, setError] = useState<string | null>(null);
   const handleError = useErrorHandler();
   const isInitialLoadRef = useRef(true);
+  // Idempotency key per job of a run request that hasn't succeeded yet, so double clicks and retries start one run
+  const runKeysRef = useRef(new Map<number, string>());
 
   const loadJobs = useCallback(async () => {
     try {
@@ -69,8 +71,14 @@ export const useJobs = () => {
   }, [handleError]);
 
   const run = useCallback(async (id: number) => {
+    let key = runKeysRef.current.get(id);
+    if (!key) {
+      key = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+      runKeysRef.current.set(id, key);
+    }
     try {
-      await runJob(id);
+      await runJob(id, key);
+      runKeysRef.current.delete(id);
     } catch (err) {
       handleError(err);
       throw err;
@@ -44,6 +44,8 @@ api.interceptors.response.use(
   }
 );
 
+export type ProfileMode = 'timers' | 'cprofile' | 'pyinstrument';
+
 export interface Job {
   id: number;
   name: string;
@@ -54,6 +56,13 @@ export interface Job {
   email_recipients?: string[];
   created_at: string;
   updated_at: string;
+  retention_keep_runs?: number | null;
+  retention_log_days?: number | null;
+  retention_delete_days?: number | null;
+  jitter_seconds?: number | null;
+  timezone?: string | null;
+  profile_mode?: ProfileMode | null;
+  timeout_seconds?: number | null;
 }
 
 export interface JobCreate {
@@ -62,6 +71,13 @@ export interface JobCreate {
   cron_expression: string;
   enabled?: boolean;
   email_recipients?: string[];
+  retention_keep_runs?: number | null;
+  retention_log_days?: number | null;
+  retention_delete_days?: number | null;
+  jitter_seconds?: number | null;
+  timezone?: string | null;
+  profile_mode?: ProfileMode | null;
+  timeout_seconds?: number | null;
 }
 
 export interface JobUpdate {
@@ -70,31 +86,89 @@ export interface JobUpdate {
   cron_expression?: string;
   enabled?: boolean;
   email_recipients?: string[];
+  retention_keep_runs?: number | null;
+  retention_log_days?: number | null;
+  retention_delete_days?: number | null;
+  jitter_seconds?: number | null;
+  timezone?: string | null;
+  profile_mode?: ProfileMode | null;
+  timeout_seconds?: number | null;
 }
 
 export interface JobRun {
   id: number;
   job_id: number;
   job_name: string;
-  status: 'running' | 'success' | 'failed';
+  status: 'queued' | 'running' | 'success' | 'failed' | 'cancelled';
   output_content?: string;  // Markdown
-  html_output_content?: string;  // HTML formatted
+  html_output_content?: string;  // HTML formatted (run details only)
   log_content?: string;
   started_at: string;
   completed_at?: string;
   error_message?: string;
+  has_profile?: boolean;
+  cancel_requested?: boolean;
+  stages?: RunStage[];  // Run details only
+}
+
+export interface RunStage {
+  stage: string;
+  seconds: number;
+}
+
+export interface StageStats {
+  stage: string;
+  count: number;
+  p50_ms: number;
+  p90_ms: number;
+  p99_ms: number;
+  mean_ms: number;
+  max_ms: number;
+}
+
+export interface JobStageStats {
+  job_id: number;
+  runs: number;
+  stages: StageStats[];
 }
 
 export interface CronParseResult {
   cron_expression: string;
   description: string;
   next_runs: string[];
+  timezone: string;
+}
+
+export interface ForecastFiring {
+  job_id: number;
+  job_name: string;
+  run_at: string;
+  jitter_seconds: number;
+}
+
+export interface ForecastHotspot {
+  run_at: string;
+  job_count: number;
+  job_ids: number[];
+}
+
+export interface ScheduleForecast {
+  start: string;
+  end: string;
+  firings: ForecastFiring[];
+  hotspots: ForecastHotspot[];
+  peak_concurrency: number;
+  truncated: boolean;
 }
 
 export interface Status {
   scheduler_running: boolean;
   active_jobs_count: number;
   total_jobs_count: number;
+  running_jobs_count: number;
+  peak_concurrency: number;
+  scheduler_leader: boolean;  // False on standby replicas sharing the database
+  scheduler_node?: string;
 }
 
 // Jobs API
@@ -122,19 +196,33 @@ export const deleteJob = async (id: number): Promise<void> => {
   await api.delete(`/jobs/${id}`);
 };
 
-export const runJob = async (id: number): Promise<JobRun> => {
-  const response = await api.post<JobRun>(`/jobs/${id}/run`);
+export const runJob = async (id: number, idempotencyKey?: string): Promise<JobRun> => {
+  const response = await api.post<JobRun>(`/jobs/${id}/run`, undefined, {
+    headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
+  });
+  return response.data;
+};
+
+export const getJobStageStats = async (id: number, runs: number = 100): Promise<JobStageStats> => {
+  const response = await api.get<JobStageStats>(`/jobs/${id}/stages?runs=${runs}`);
   return response.data;
 };
 
 // Cron API
-export const parseCron = async (cronExpression: string): Promise<CronParseResult> => {
+export const parseCron = async (cronExpression: string, timezone?: string): Promise<CronParseResult> => {
   const response = await api.post<CronParseResult>('/cron/parse', {
     cron_expression: cronExpression,
+    timezone,
   });
   return response.data;
 };
 
+// Schedule API
+export const getScheduleForecast = async (hours: number = 24): Promise<ScheduleForecast> => {
+  const response = await api.get<ScheduleForecast>(`/schedule/forecast?hours=${hours}`);
+  return response.data;
+};
+
 // Job Runs API
 export const getJobRuns = async (limit: number = 50): Promise<JobRun[]> => {
   const response = await api.get<JobRun[]>(`/job-runs?limit=${limit}`);
@@ -146,6 +234,14 @@ export const getJobRun = async (id: number): Promise<JobRun> => {
   return response.data;
 };
 
+export const cancelJobRun = async (id: number): Promise<JobRun> => {
+  const response = await api.post<JobRun>(`/job-runs/${id}/cancel`);
+  return response.data;
+};
+
+export const getJobRunArtifactUrl = (id: number, kind: 'output' | 'html' | 'log' | 'profile'): string =>
+  `${API_BASE_URL}/job-runs/${id}/artifacts/${kind}`;
+
 // Status API
 export const getStatus = async (): Promise<Status> => {
   const response = await api.get<Status>('/status');
@@ -7,13 +7,18 @@ export const validateCronExpression = (cron: string): { valid: boolean; error?:
     return { valid: false, error: 'Cron expression is required' };
   }
 
+  // Macros such as @daily are checked by the server
+  if (cron.trim().startsWith('@')) {
+    return { valid: true };
+  }
+
   const parts = cron.trim().split(/\s+/);
   if (parts.length !== 5) {
     return { valid: false, error: 'Cron expression must have exactly 5 fields' };
   }
 
-  // Basic validation - check if fields contain valid characters
-  const cronPattern = /^[\d*/\-, ]+$/;
+  // Basic validation - check if fields contain valid characters (digits, names, L and #)
+  const cronPattern = /^[\da-zA-Z*/\-,?#]+$/;
   for (const part of parts) {
     if (!cronPattern.test(part)) {
       return { valid: false, error: `Invalid characters in cron expression: ${part}` };
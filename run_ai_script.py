@@ -9,19 +9,32 @@ import os
 import sys
 import argparse
 import json
+import signal
 from datetime import datetime
 from pathlib import Path
+
+# Die with the scheduler or worker that started this run (so a re-queued run isn't executed twice),
+# armed before the slow imports below
+from utils.process_utils import exit_with_parent
+exit_with_parent()
+
 from dotenv import load_dotenv
 
 # Import utility modules
-from utils.logging_utils import setup_logging
+from utils.logging_utils import setup_logging, LOG_DIR
 from utils.email_utils import send_email
 from utils.pushover_utils import send_pushover_notification
 from utils.openai_utils import get_openai_client, call_openai
+from utils.metrics_utils import write_metrics_file
+from utils.tracing_utils import attach_env_trace_context, configure_tracing, set_span_attributes, set_span_error, span
+from utils.profiling_utils import RunProfiler, record_process_start, stage, stage_timings
 
 # Database imports
 sys.path.insert(0, str(Path(__file__).parent / "backend"))
-from database import SessionLocal, Job, JobRun
+from database import SessionLocal, Job, JobRun, STORE_HTML_OUTPUT
+from run_stages import insert_run_stages
+from run_queue import RunLease
+from artifact_store import run_text_values
 from utils.markdown_utils import markdown_to_html
 
 # Get the directory where this script is located
@@ -30,8 +43,16 @@ SCRIPT_DIR = Path(__file__).parent.absolute()
 # Load environment variables from .env file (in script directory)
 load_dotenv(SCRIPT_DIR / ".env")
 
-# Configuration - all paths relative to script directory
-LOG_DIR = SCRIPT_DIR / "logs"
+
+class RunStopped(BaseException):
+    """The run was taken from this script (cancelled, timed out or its lease lost); not an Exception, so OpenAI client retries don't catch it."""
+
+
+def _stop_run(signum, frame):
+    """SIGTERM handler: abort whatever is in flight, including a pending OpenAI request."""
+    # A second SIGTERM during cleanup terminates the process
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    raise RunStopped("stopped by the scheduler (cancelled, timed out or its lease lost)")
 
 
 def load_prompt_from_db(job_id: int, logger) -> tuple[str, str, list[str]]:
@@ -64,35 +85,34 @@ def load_prompt_from_db(job_id: int, logger) -> tuple[str, str, list[str]]:
         db.close()
 
 
-def save_results_to_db(job_id: int, content: str, logger) -> None:
-    """Save results to the database in the job_run record."""
+def _update_job_run(db, lease: RunLease, values: dict) -> bool:
+    """Update the job_run record, returning whether this script still holds it."""
+    return db.query(JobRun).filter(*lease.conditions()).update(values, synchronize_session=False) == 1
+
+
+def save_results_to_db(lease: RunLease, content: str, logger) -> None:
+    """Save results to the database in the job_run record, raising RunStopped if the run is no longer ours."""
     db = SessionLocal()
     try:
-        # Find the most recent running job run for this job
-        job_run = db.query(JobRun).filter(
-            JobRun.job_id == job_id,
-            JobRun.status == "running",
-            JobRun.completed_at.is_(None)
-        ).order_by(JobRun.started_at.desc()).first()
-        
-        if not job_run:
-            logger.warning("No running job run found to save results to")
-            return
-        
-        # Convert markdown to HTML
+        # Convert markdown to HTML (skipped when HTML is rendered on demand)
         html_content = None
-        try:
-            html_content = markdown_to_html(content)
-            logger.info(f"Converted markdown to HTML ({len(html_content)} characters)")
-        except Exception as e:
-            logger.warning(f"Failed to convert markdown to HTML: {e}")
+        if STORE_HTML_OUTPUT:
+            try:
+                with stage("render_html"):
+                    html_content = markdown_to_html(content)
+                logger.info(f"Converted markdown to HTML ({len(html_content)} characters)")
+            except Exception as e:
+                logger.warning(f"Failed to convert markdown to HTML: {e}")
         
         # Update the job run with output
-        job_run.output_content = content
-        job_run.html_output_content = html_content
-        db.commit()
+        with stage("db_save"):
+            values = {**run_text_values("output", content), **run_text_values("html", html_content)}
+            if not _update_job_run(db, lease, values):
+                # Another attempt (or the reaper) owns the run now: its results and emails are not ours to send
+                raise RunStopped(f"{lease.run_id} was taken over before its results were saved")
+            db.commit()
         
-        logger.info(f"Results saved successfully to database (job_run_id: {job_run.id})")
+        logger.info(f"Results saved successfully to database (job_run_id: {lease.run_id})")
     except Exception as e:
         logger.error(f"Error saving results to database: {e}", exc_info=True)
         db.rollback()
@@ -100,6 +120,38 @@ def save_results_to_db(job_id: int, content: str, logger) -> None:
         db.close()
 
 
+def save_stages_to_db(lease: RunLease, job_id: int, logger) -> None:
+    """Store the stage timings of this run on the job_run record."""
+    db = SessionLocal()
+    try:
+        if not lease.hold(db):
+            logger.warning(f"Job run {lease.run_id} is no longer held by this script, stage timings not saved")
+            return
+        insert_run_stages(db, lease.run_id, job_id, stage_timings())
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error saving stage timings to database: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def save_profile_to_db(lease: RunLease, report: str, logger) -> None:
+    """Store the profile report on the job_run record."""
+    db = SessionLocal()
+    try:
+        if not _update_job_run(db, lease, run_text_values("profile", report)):
+            logger.warning(f"Job run {lease.run_id} is no longer held by this script, profile not saved")
+            return
+        db.commit()
+        logger.info(f"Profile saved to database (job_run_id: {lease.run_id})")
+    except Exception as e:
+        logger.error(f"Error saving profile to database: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
 def parse_arguments():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -108,6 +160,9 @@ def parse_arguments():
         epilog="""
 Examples:
   %(prog)s --job-id 1                        # Run job with ID 1 from database
+  %(prog)s --job-id 1 --run-id 42            # Run it and record the results on job run 42
+  %(prog)s --job-id 1 --run-id 42 --lease-holder host:1:ab12 --attempt 2
+                                             # Record them only while that holder runs attempt 2 of it
         """
     )
     parser.add_argument(
@@ -116,14 +171,36 @@ Examples:
         required=True,
         help="Job ID from database to execute"
     )
+    parser.add_argument(
+        "--run-id",
+        type=int,
+        default=None,
+        help="JobRun ID to record the results on (passed by the scheduler; without it results are not saved)"
+    )
+    parser.add_argument(
+        "--lease-holder",
+        type=str,
+        default=None,
+        help="Process holding the run's lease; writes to the run stop once it no longer does (passed by the scheduler)"
+    )
+    parser.add_argument(
+        "--attempt",
+        type=int,
+        default=0,
+        help="Attempt of the run this script executes, checked with --lease-holder"
+    )
     return parser.parse_args()
 
 
 def main():
     """Main execution function."""
     # Parse command-line arguments
+    record_process_start()
     args = parse_arguments()
     job_id = args.job_id
+    run_id = args.run_id
+    # Writes to the run are fenced on the holder and attempt the scheduler started it under
+    lease = RunLease(run_id, args.lease_holder, args.attempt) if run_id is not None else None
     
     # Load job and prompt from database
     db = SessionLocal()
@@ -135,41 +212,61 @@ def main():
         
         job_name = job.name
         prompt_name = job.prompt_filename.replace('.md', '')
+        profile_mode = job.profile_mode
     finally:
         db.close()
     
-    # Setup logging
-    logger = setup_logging(LOG_DIR, prompt_name)
+    # Setup logging (records carry the job id and the run id passed by the scheduler)
+    logger = setup_logging(LOG_DIR, job_id, run_id)
+    set_span_attributes({"job.id": job_id, "job.run_id": run_id, "job.name": job_name})
+    
+    # The scheduler sends SIGTERM to cancel the run or when it exceeds the job's timeout
+    signal.signal(signal.SIGTERM, _stop_run)
     
     logger.info("=" * 60)
     logger.info(f"{job_name} Script")
     logger.info(f"Job ID: {job_id}")
     logger.info("=" * 60)
     
+    # Opt-in per-job profiling (stage timers are always recorded)
+    profiler = RunProfiler(profile_mode, logger) if profile_mode else None
+    if profiler:
+        logger.info(f"Profiling enabled ({profiler.mode})")
+        profiler.start()
+    
     error_details = None
     success = False
+    stopped = False
     
     try:
         # Load prompt and email recipients from database
-        prompt, job_name, email_recipients = load_prompt_from_db(job_id, logger)
+        with stage("load_prompt"):
+            prompt, job_name, email_recipients = load_prompt_from_db(job_id, logger)
         
         # Initialize OpenAI client
-        client = get_openai_client(logger)
+        with stage("openai_client"):
+            client = get_openai_client(logger)
         
         # Call OpenAI API
         # Get model and web search settings from environment
         openai_model = os.getenv("OPENAI_MODEL", "gpt-5.2")
         enable_web_search = os.getenv("WEB_SEARCH", "true").lower() == "true"
-        results = call_openai(client, prompt, logger, model=openai_model, enable_web_search=enable_web_search)
+        with stage("call_openai", {"gen_ai.request.model": openai_model, "web_search": enable_web_search}):
+            results = call_openai(client, prompt, logger, model=openai_model, enable_web_search=enable_web_search)
         
         # Save results to database
-        save_results_to_db(job_id, results, logger)
+        if lease is not None:
+            with span("save_results_to_db"):
+                save_results_to_db(lease, results, logger)
+        else:
+            logger.info("No --run-id given. Skipping saving results to the database.")
         
         # Send email to all recipients (if any are configured)
         if email_recipients:
             for recipient in email_recipients:
                 try:
-                    send_email(results, recipient, prompt_name, logger)
+                    with stage("send_email"):
+                        send_email(results, recipient, prompt_name, logger)
                     logger.info(f"Email sent successfully to: {recipient}")
                 except Exception as e:
                     logger.error(f"Failed to send email to {recipient}: {e}", exc_info=True)
@@ -186,6 +283,12 @@ def main():
         if email_recipients:
             message += f"\nEmail sent to: {', '.join(email_recipients)}"
         
+    except RunStopped as e:
+        # The scheduler (or the attempt that replaced this one) records why on the run
+        stopped = True
+        error_details = f"Run {e}"
+        logger.warning(error_details)
+        
     except SystemExit as e:
         # SystemExit from sys.exit() calls - extract error details
         error_details = "Script exited with an error. Check logs for details."
@@ -199,13 +302,30 @@ def main():
         message = f"Job failed with an unexpected error.\n\nError: {error_details}\n\nPlease check the log file for detailed error information."
     
     finally:
-        # Always send Pushover notification
-        send_pushover_notification(success, job_name, message, logger)
+        # Send Pushover notification (not for stopped runs, which must exit within the stop grace period)
+        if not stopped:
+            with stage("send_pushover"):
+                send_pushover_notification(success, job_name, message, logger)
+        
+        if profiler:
+            profiler.stop()
+        if lease is not None:
+            save_stages_to_db(lease, job_id, logger)
+            if profiler:
+                save_profile_to_db(lease, profiler.report(), logger)
+        
+        # Hand this run's metrics to the scheduler
+        write_metrics_file()
         
         # If there was an error, exit with error code
         if not success:
+            set_span_error(error_details or "Script failed")
             sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    # Join the trace of the scheduler run that started this process
+    configure_tracing("runner")
+    attach_env_trace_context()
+    with span("run_ai_script.main"):
+        main()
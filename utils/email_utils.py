@@ -8,7 +8,8 @@ import logging
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from .markdown_utils import markdown_to_html
+from .markdown_utils import render_html_cached
+from .metrics_utils import NOTIFICATION_SECONDS
 
 
 def send_email(content: str, recipient: str, prompt_name: str, logger: logging.Logger, subject: str = None):
@@ -20,6 +21,8 @@ def send_email(content: str, recipient: str, prompt_name: str, logger: logging.L
     # Get email configuration from environment variables
     smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     smtp_port = int(os.getenv("SMTP_PORT", "587"))
+    # STARTTLS can be turned off for local relays and test sinks
+    smtp_use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
     email_user = os.getenv("EMAIL_USER")
     email_password = os.getenv("EMAIL_PASSWORD")
     
@@ -30,8 +33,8 @@ def send_email(content: str, recipient: str, prompt_name: str, logger: logging.L
         return
     
     try:
-        # Convert markdown content to HTML for email
-        html_content = markdown_to_html(content)
+        # Convert markdown content to HTML for email (shared across recipients)
+        html_content = render_html_cached(content)
         logger.info(f"Converted markdown to HTML ({len(html_content)} characters, includes inline styles)")
         
         # Create message
@@ -52,10 +55,13 @@ def send_email(content: str, recipient: str, prompt_name: str, logger: logging.L
         
         # Send email
         logger.info(f"Sending HTML formatted email to {recipient} (with inline styles for email client compatibility)...")
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(email_user, email_password)
-            server.send_message(msg)
+        with NOTIFICATION_SECONDS.time(channel="email", outcome="error") as labels:
+            with smtplib.SMTP(smtp_server, smtp_port) as server:
+                if smtp_use_tls:
+                    server.starttls()
+                server.login(email_user, email_password)
+                server.send_message(msg)
+            labels["outcome"] = "success"
         
         logger.info(f"Email sent successfully to {recipient}")
     except Exception as e:
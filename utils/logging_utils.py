@@ -1,34 +1,183 @@
 """
-Logging utilities for AI Research Script
+Logging utilities for AI Research Script and the backend
+
+Log files are JSON lines stamped with the job_id/run_id of the run being processed,
+so backend and script records for the same run can be correlated. Handlers run
+behind a QueueHandler/QueueListener pair, so logging calls never wait on file or
+console I/O.
 """
 
-import sys
+import atexit
+import contextvars
+import json
 import logging
-from datetime import datetime
+import logging.handlers
+import os
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
+
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Console format of the backend ("json" or "text"); log files are always JSON
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_DIR = Path(os.getenv("LOG_DIR", str(Path(__file__).parent.parent.absolute() / "logs")))
+# Rotate log files at this size (0 disables rotation), keeping this many old files
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+# Correlation ids of the job run being processed in the current context
+job_id_var: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("job_id", default=None)
+run_id_var: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("run_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else was passed with extra= and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def bind_log_context(job_id: Optional[int] = None, run_id: Optional[int] = None) -> None:
+    """Set the job/run ids stamped on records logged from the current context"""
+    if job_id is not None:
+        job_id_var.set(job_id)
+    if run_id is not None:
+        run_id_var.set(run_id)
+
+
+@contextmanager
+def log_context(job_id: Optional[int] = None, run_id: Optional[int] = None):
+    """Stamp records logged inside the block with job/run ids"""
+    tokens = []
+    if job_id is not None:
+        tokens.append((job_id_var, job_id_var.set(job_id)))
+    if run_id is not None:
+        tokens.append((run_id_var, run_id_var.set(run_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current job/run ids onto each record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "job_id", None) is None:
+            record.job_id = job_id_var.get()
+        if getattr(record, "run_id", None) is None:
+            record.run_id = run_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
 
-def setup_logging(log_dir: Path, prompt_name: str) -> logging.Logger:
-    """Setup logging to a file with naming convention matching data files."""
-    # Create log directory if it doesn't exist
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate log filename with same convention as data files
-    ts = datetime.now().strftime(f"%Y-%m-%d {prompt_name} %H%M%S")
-    log_filename = f"{ts}.log"
-    log_filepath = log_dir / log_filename
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler(log_filepath, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)  # Also log to console
-        ]
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps extra fields and formats exceptions before handing records off"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _file_handler(log_file: Path) -> logging.Handler:
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    if LOG_MAX_BYTES > 0:
+        return logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return logging.FileHandler(log_file, encoding="utf-8")
+
+
+def configure_logging(log_file: Optional[Path] = None, console_format: str = LOG_FORMAT) -> None:
+    """
+    Send all logging through a queue to the console and, optionally, a rotating JSON log file.
+    Safe to call more than once; only the first call takes effect.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(
+        JsonFormatter() if console_format == "json" else logging.Formatter(TEXT_FORMAT, TEXT_DATE_FORMAT)
     )
-    
+    handlers = [console]
+    if log_file is not None:
+        file_handler = _file_handler(log_file)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    # Context is read in the logging thread, before the record is queued
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records on exit
+    atexit.register(_listener.stop)
+
+
+def run_log_file(log_dir: Path, job_id: int, run_id: Optional[int] = None) -> Path:
+    """JSON log file of one script run; runs of a job overlap, so each writes (and rotates) its own file"""
+    suffix = f"run-{run_id}" if run_id is not None else datetime.now().strftime("%Y%m%d-%H%M%S")
+    return log_dir / "jobs" / f"job-{job_id}-{suffix}.log"
+
+
+def remove_run_logs(log_dir: Path, job_id: int, run_id: Optional[int] = None) -> int:
+    """Delete the log files (with rotated backups) of a script run, or of every run of a job; returns how many"""
+    pattern = f"job-{job_id}-run-{run_id}.log*" if run_id is not None else f"job-{job_id}-*.log*"
+    removed = 0
+    for path in (log_dir / "jobs").glob(pattern):
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def setup_logging(log_dir: Path, job_id: int, run_id: Optional[int] = None) -> logging.Logger:
+    """Setup logging for a script run: text on the console (kept as the run log) and JSON in a per-run file."""
+    log_file = run_log_file(log_dir, job_id, run_id)
+    configure_logging(log_file, console_format="text")
+
+    bind_log_context(job_id=job_id, run_id=run_id)
+
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized. Log file: {log_filepath}")
+    logger.info(f"Logging initialized. Log file: {log_file}")
     return logger
@@ -2,10 +2,15 @@
 Markdown formatting utilities for Run AI Script
 """
 
+import os
 import markdown
 import re
+from functools import lru_cache
 from html import escape
 
+# Maximum number of rendered documents kept by render_html_cached
+HTML_RENDER_CACHE_SIZE = int(os.getenv("HTML_RENDER_CACHE_SIZE", "64"))
+
 
 def ensure_strict_markdown(content: str) -> str:
     """
@@ -106,3 +111,12 @@ def markdown_to_html(content: str) -> str:
 </html>"""
     
     return html_email
+
+
+@lru_cache(maxsize=HTML_RENDER_CACHE_SIZE)
+def render_html_cached(content: str) -> str:
+    """
+    Convert markdown content to HTML, reusing recent renders.
+    Used when HTML is produced on demand instead of being stored with the run.
+    """
+    return markdown_to_html(content)
@@ -0,0 +1,238 @@
+"""
+Prometheus metrics for the backend and AI Research Script
+
+A small in-process registry (counters, histograms and scrape-time gauges) rendered
+in the Prometheus text format. Recording a sample is a dict lookup and an add under
+a lock, so instrumentation stays cheap on hot paths.
+
+The script runs in a separate process, so it writes its samples to the JSON file
+named by JOB_METRICS_FILE and the scheduler merges them into the backend registry.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# Environment variable naming the file the script writes its metrics to
+METRICS_FILE_ENV = "JOB_METRICS_FILE"
+
+# Bucket upper bounds (seconds)
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            samples = list(self._samples.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}" for key, value in samples
+        ]
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._samples.items()]
+
+    def merge(self, samples: list) -> None:
+        with self._lock:
+            for key, value in samples:
+                key = tuple(key)
+                self._samples[key] = self._samples.get(key, 0) + value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = FAST_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                # Per-bucket counts (the last slot is +Inf), sum, count
+                sample = self._samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block (labels may be added inside via the yielded dict)"""
+        start = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            samples = [(key, list(counts), total, count) for key, (counts, total, count) in self._samples.items()]
+        lines = self.header()
+        for key, counts, total, count in samples:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._samples.items()]
+
+    def merge(self, samples: list) -> None:
+        with self._lock:
+            for key, (counts, total, count) in samples:
+                key = tuple(key)
+                sample = self._samples.get(key)
+                if sample is None:
+                    sample = self._samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                if len(counts) != len(sample[0]):
+                    continue  # Bucket layout changed between versions
+                sample[0] = [a + b for a, b in zip(sample[0], counts)]
+                sample[1] += total
+                sample[2] += count
+
+
+class GaugeFunction(_Metric):
+    """Value read from a function at scrape time"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, function: Callable[[], float]):
+        super().__init__(name, help_text)
+        self.function = function
+
+    def render(self) -> list[str]:
+        return self.header() + [f"{self.name} {_format_number(self.function())}"]
+
+
+class MetricsRegistry:
+    """Named collection of metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        # Re-registering (e.g. a module imported twice) returns the existing metric
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = FAST_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge_function(self, name: str, help_text: str, function: Callable[[], float]) -> GaugeFunction:
+        return self.register(GaugeFunction(name, help_text, function))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """Counter and histogram samples as JSON-serializable data"""
+        return {
+            name: metric.snapshot() for name, metric in list(self._metrics.items())
+            if hasattr(metric, "snapshot")
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        """Add samples recorded by another process"""
+        for name, samples in snapshot.items():
+            metric = self._metrics.get(name)
+            if metric is not None and hasattr(metric, "merge"):
+                metric.merge(samples)
+
+
+REGISTRY = MetricsRegistry()
+
+# Metrics recorded by the script (merged into the backend after each run)
+OPENAI_REQUEST_SECONDS = REGISTRY.histogram(
+    "openai_request_duration_seconds", "OpenAI API call latency", ("model", "api", "outcome"), SLOW_BUCKETS
+)
+OPENAI_TOKENS = REGISTRY.counter("openai_tokens_total", "OpenAI tokens used", ("model", "kind"))
+NOTIFICATION_SECONDS = REGISTRY.histogram(
+    "notification_duration_seconds", "Email and Pushover delivery latency", ("channel", "outcome"), FAST_BUCKETS + (30.0, 60.0)
+)
+DB_QUERY_SECONDS = REGISTRY.histogram("sqlite_query_duration_seconds", "SQLite statement latency", ("statement",))
+
+
+def write_metrics_file(path: Optional[str] = None) -> None:
+    """Write this process's samples to the file named by JOB_METRICS_FILE (no-op if unset)"""
+    path = path or os.getenv(METRICS_FILE_ENV)
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(REGISTRY.snapshot(), f)
+
+
+def merge_metrics_file(path: str) -> None:
+    """Merge samples written by a script process and remove the file"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            REGISTRY.merge(json.load(f))
+    except (FileNotFoundError, ValueError):
+        return
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -6,6 +6,8 @@ import os
 import sys
 import logging
 from openai import OpenAI
+from .metrics_utils import OPENAI_REQUEST_SECONDS, OPENAI_TOKENS
+from .tracing_utils import span
 
 
 def get_openai_client(logger: logging.Logger) -> OpenAI:
@@ -20,6 +22,31 @@ def get_openai_client(logger: logging.Logger) -> OpenAI:
     return OpenAI(api_key=api_key)
 
 
+def _record_usage(response, model: str, current_span=None):
+    """Count the tokens reported by a Responses or Chat Completions response"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "input_tokens", None) or getattr(usage, "prompt_tokens", None) or 0
+    output_tokens = getattr(usage, "output_tokens", None) or getattr(usage, "completion_tokens", None) or 0
+    OPENAI_TOKENS.inc(input_tokens, model=model, kind="input")
+    OPENAI_TOKENS.inc(output_tokens, model=model, kind="output")
+    if current_span is not None:
+        current_span.set_attribute("gen_ai.usage.input_tokens", input_tokens)
+        current_span.set_attribute("gen_ai.usage.output_tokens", output_tokens)
+
+
+def _timed_create(create, api: str, model: str, **kwargs):
+    """Make an OpenAI API call, recording its latency and token usage"""
+    with span(f"openai.{api}", {"gen_ai.request.model": model}) as current_span:
+        with OPENAI_REQUEST_SECONDS.time(model=model, api=api) as labels:
+            labels["outcome"] = "error"
+            response = create(model=model, **kwargs)
+            labels["outcome"] = "success"
+        _record_usage(response, model, current_span)
+    return response
+
+
 def call_openai(client: OpenAI, prompt: str, logger: logging.Logger, model: str = None, enable_web_search: bool = True) -> str:
     """Call OpenAI's Responses API with web browsing if enabled."""
     # Get model and web search settings from environment or use defaults
@@ -56,8 +83,10 @@ Your output will be saved as a Markdown file, so formatting quality is critical.
         # Use Responses API (same as ChatGPT UI) with web search tool if enabled
         if enable_web_search:
             logger.info("Using Responses API with web browsing enabled...")
-            response = client.responses.create(
-                model=model,
+            response = _timed_create(
+                client.responses.create,
+                "responses",
+                model,
                 input=enhanced_prompt,
                 tools=[{"type": "web_search"}],  # Enable web browsing (same as ChatGPT UI)
                 include=["web_search_call.action.sources"],  # Optional: return sources
@@ -69,8 +98,10 @@ Your output will be saved as a Markdown file, so formatting quality is critical.
         else:
             # Fallback to Chat Completions API if web browsing is disabled
             logger.info("Using Chat Completions API (web browsing disabled)...")
-            response = client.chat.completions.create(
-                model=model,
+            response = _timed_create(
+                client.chat.completions.create,
+                "chat_completions",
+                model,
                 messages=[
                     {
                         "role": "user",
@@ -88,8 +119,10 @@ Your output will be saved as a Markdown file, so formatting quality is critical.
             logger.warning("Falling back to Chat Completions API...")
             logger.warning("To enable web browsing, update: pip install --upgrade openai")
             # Fallback to chat completions
-            response = client.chat.completions.create(
-                model=model,
+            response = _timed_create(
+                client.chat.completions.create,
+                "chat_completions",
+                model,
                 messages=[
                     {
                         "role": "user",
@@ -127,8 +160,10 @@ Your output will be saved as a Markdown file, so formatting quality is critical.
             logger.warning("   - Falling back to Chat Completions API without browsing...")
             # Try fallback
             try:
-                response = client.chat.completions.create(
-                    model=model,
+                response = _timed_create(
+                    client.chat.completions.create,
+                    "chat_completions",
+                    model,
                     messages=[{"role": "user", "content": enhanced_prompt}],
                 )
                 result = response.choices[0].message.content
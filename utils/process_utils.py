@@ -0,0 +1,34 @@
+"""
+Process supervision for AI Research Script runs
+
+A script process must not outlive the scheduler or worker that started it: once that
+process dies, the run is re-queued or failed, and an orphaned script would still call
+the model, write to the run and send notifications.
+"""
+
+import ctypes
+import os
+import signal
+import sys
+
+# Environment variable with the pid of the process (API or worker) that started the script
+PARENT_PID_ENV = "JOB_PARENT_PID"
+# prctl() option that signals this process when its parent dies (linux/prctl.h)
+PR_SET_PDEATHSIG = 1
+
+
+def exit_with_parent() -> None:
+    """
+    Have the kernel SIGKILL this process when the process that started it dies (Linux only).
+    The signal follows the spawning thread, which waits for the script until it exits.
+    """
+    parent_pid = os.getenv(PARENT_PID_ENV)
+    if not parent_pid or not sys.platform.startswith("linux"):
+        return
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL) != 0:
+        print(f"Warning: could not tie the script to its parent: {os.strerror(ctypes.get_errno())}", file=sys.stderr)
+        return
+    # The parent may have died before the death signal was armed
+    if os.getppid() != int(parent_pid):
+        os._exit(1)
@@ -0,0 +1,102 @@
+"""
+Stage timing and opt-in profiling for AI Research Script runs
+
+Every stage of a run (process start, prompt load, model call, HTML render, DB save,
+notifications) is timed and traced, and the timings are stored with the run.
+
+A job's profile_mode adds a profile artifact to its runs: "timers" reports the stage
+breakdown, "cprofile" adds the functions with the most cumulative time, and
+"pyinstrument" adds a sampled call tree (cProfile is used when pyinstrument isn't
+installed).
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .tracing_utils import span
+
+PROFILE_MODES = ("timers", "cprofile", "pyinstrument")
+# Environment variable with the time (epoch seconds) the scheduler started the script process
+SPAWNED_AT_ENV = "JOB_SPAWNED_AT"
+# Functions listed in a cProfile report
+PROFILE_TOP_FUNCTIONS = 40
+
+# (stage name, seconds) in completion order
+_stages: list[tuple[str, float]] = []
+
+
+@contextmanager
+def stage(name: str, attributes: Optional[dict] = None):
+    """Time and trace a stage of the run"""
+    with span(name, attributes):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _stages.append((name, time.perf_counter() - start))
+
+
+def record_process_start() -> None:
+    """Time from the scheduler spawning this process to now (interpreter start-up and imports)"""
+    spawned_at = os.getenv(SPAWNED_AT_ENV)
+    if spawned_at:
+        _stages.insert(0, ("process_start", max(time.time() - float(spawned_at), 0.0)))
+
+
+def stage_timings() -> list[tuple[str, float]]:
+    """Stages timed so far in this process"""
+    return list(_stages)
+
+
+def format_stage_timings(stages: list[tuple[str, float]]) -> str:
+    lines = [f"{'Stage':<32}{'Seconds':>10}"]
+    lines.extend(f"{name:<32}{seconds:>10.3f}" for name, seconds in stages)
+    lines.append(f"{'Total':<32}{sum(seconds for _, seconds in stages):>10.3f}")
+    return "\n".join(lines)
+
+
+class RunProfiler:
+    """Profiler for one run in the given profile mode"""
+
+    def __init__(self, mode: str, logger: logging.Logger):
+        self.mode = mode
+        self._profiler = None
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+            except ImportError:
+                logger.warning("pyinstrument is not installed, profiling with cProfile instead")
+                self.mode = "cprofile"
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        elif self.mode == "pyinstrument":
+            self._profiler.start()
+
+    def stop(self) -> None:
+        if self.mode == "cprofile":
+            self._profiler.disable()
+        elif self.mode == "pyinstrument":
+            self._profiler.stop()
+
+    def report(self) -> str:
+        """Text report: the stage breakdown followed by the sampled profile, if any"""
+        sections = [f"Profile mode: {self.mode}", format_stage_timings(stage_timings())]
+        if self.mode == "cprofile":
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+            sections.append(stream.getvalue())
+        elif self.mode == "pyinstrument":
+            sections.append(self._profiler.output_text(unicode=False, color=False))
+        return "\n\n".join(sections)
@@ -5,6 +5,7 @@ Pushover notification utilities for AI Research Script
 import os
 import requests
 import logging
+from .metrics_utils import NOTIFICATION_SECONDS
 
 
 def send_pushover_notification(success: bool, job_name: str, message: str, logger: logging.Logger):
@@ -39,8 +40,10 @@ def send_pushover_notification(success: bool, job_name: str, message: str, logge
         }
         
         logger.info(f"Sending Pushover notification ({'success' if success else 'failure'})...")
-        response = requests.post("https://api.pushover.net/1/messages.json", data=payload, timeout=10)
-        response.raise_for_status()
+        with NOTIFICATION_SECONDS.time(channel="pushover", outcome="error") as labels:
+            response = requests.post("https://api.pushover.net/1/messages.json", data=payload, timeout=10)
+            response.raise_for_status()
+            labels["outcome"] = "success"
         
         logger.info("Pushover notification sent successfully")
     except requests.exceptions.RequestException as e:
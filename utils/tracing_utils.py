@@ -0,0 +1,205 @@
+"""
+OpenTelemetry tracing for the backend and AI Research Script
+
+Tracing is optional: spans are no-ops unless TRACING_EXPORTER is set and the
+opentelemetry-sdk package is installed. The scheduler passes the current trace
+context to the script process in the W3C TRACEPARENT/TRACESTATE environment
+variables, so the script's spans join the trace of the run that started them.
+
+The "memory" exporter keeps finished spans in process for tests. The script writes
+its spans to the file named by JOB_TRACE_SPANS_FILE and the scheduler merges them,
+so a whole run's span breakdown can be asserted without a collector.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    from opentelemetry import context, propagate, trace
+except ImportError:  # Tracing is optional
+    trace = None
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor, SpanExportResult
+    )
+except ImportError:
+    TracerProvider = None
+
+# Span exporter: "none", "otlp" (OTEL_EXPORTER_OTLP_* settings), "console" or "memory"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "cobs-ai-scripts")
+
+# Environment variable naming the file the script writes its spans to (memory exporter)
+TRACE_SPANS_FILE_ENV = "JOB_TRACE_SPANS_FILE"
+# W3C trace context carried to the script process
+TRACE_CONTEXT_ENV = ("TRACEPARENT", "TRACESTATE", "BAGGAGE")
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+
+
+def _span_to_dict(span) -> dict:
+    span_context = span.get_span_context()
+    return {
+        "name": span.name,
+        "service": span.resource.attributes.get("service.name"),
+        "trace_id": format(span_context.trace_id, "032x"),
+        "span_id": format(span_context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "start_time_ns": span.start_time,
+        "end_time_ns": span.end_time,
+        "duration_ms": (span.end_time - span.start_time) / 1e6,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class MemorySpanExporter:
+    """Span exporter keeping finished spans (as dicts) in memory"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = []
+
+    def export(self, spans):
+        with self._lock:
+            self._spans.extend(_span_to_dict(span) for span in spans)
+        return SpanExportResult.SUCCESS
+
+    def add(self, spans: list) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def finished_spans(self) -> list[dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+MEMORY_EXPORTER = MemorySpanExporter()
+
+
+def _span_processor():
+    if TRACING_EXPORTER == "memory":
+        return SimpleSpanProcessor(MEMORY_EXPORTER)
+    if TRACING_EXPORTER == "console":
+        return BatchSpanProcessor(ConsoleSpanExporter())
+    if TRACING_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("TRACING_EXPORTER=otlp requires opentelemetry-exporter-otlp; tracing disabled")
+            return None
+        return BatchSpanProcessor(OTLPSpanExporter())
+    logger.warning(f"Unknown TRACING_EXPORTER '{TRACING_EXPORTER}'; tracing disabled")
+    return None
+
+
+def configure_tracing(component: str) -> None:
+    """
+    Install the tracer provider for TRACING_EXPORTER, naming the service after the component.
+    Does nothing when tracing is off or the SDK isn't installed; only the first call takes effect.
+    """
+    global _configured
+    if _configured or TRACING_EXPORTER == "none":
+        return
+    _configured = True
+
+    if trace is None or TracerProvider is None:
+        logger.warning("TRACING_EXPORTER is set but opentelemetry-sdk is not installed; tracing disabled")
+        return
+    processor = _span_processor()
+    if processor is None:
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": f"{TRACING_SERVICE_NAME}-{component}"}))
+    provider.add_span_processor(processor)
+    trace.set_tracer_provider(provider)
+    # Flush batched spans on exit
+    atexit.register(provider.shutdown)
+    if TRACING_EXPORTER == "memory":
+        atexit.register(write_trace_spans_file)
+
+
+@contextmanager
+def span(name: str, attributes: Optional[dict] = None):
+    """Run the block in a child span of the current one (yields None without OpenTelemetry)"""
+    if trace is None:
+        yield None
+        return
+    attributes = {key: value for key, value in (attributes or {}).items() if value is not None}
+    with trace.get_tracer(TRACING_SERVICE_NAME).start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def set_span_attributes(attributes: dict) -> None:
+    """Add attributes to the current span"""
+    if trace is not None:
+        current = trace.get_current_span()
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
+
+
+def set_span_error(description: str) -> None:
+    """Mark the current span as failed"""
+    if trace is not None:
+        trace.get_current_span().set_status(trace.Status(trace.StatusCode.ERROR, description))
+
+
+def trace_env() -> dict:
+    """Trace context of the current span as environment variables for a child process"""
+    if trace is None:
+        return {}
+    carrier = {}
+    propagate.inject(carrier)
+    return {key.upper(): value for key, value in carrier.items()}
+
+
+def attach_env_trace_context() -> None:
+    """Continue the trace passed by the parent process in TRACEPARENT/TRACESTATE"""
+    if trace is None or "TRACEPARENT" not in os.environ:
+        return
+    carrier = {key.lower(): os.environ[key] for key in TRACE_CONTEXT_ENV if key in os.environ}
+    context.attach(propagate.extract(carrier))
+
+
+def write_trace_spans_file(path: Optional[str] = None) -> None:
+    """Write the memory exporter's spans to the file named by JOB_TRACE_SPANS_FILE (no-op if unset)"""
+    path = path or os.getenv(TRACE_SPANS_FILE_ENV)
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(MEMORY_EXPORTER.finished_spans(), f)
+
+
+def merge_trace_spans_file(path: str) -> None:
+    """Add spans written by a script process to the memory exporter and remove the file"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            MEMORY_EXPORTER.add(json.load(f))
+    except (FileNotFoundError, ValueError):
+        return
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass